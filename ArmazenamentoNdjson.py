@@ -0,0 +1,446 @@
+import os
+import sys
+import json
+import time
+import threading
+import itertools
+import hashlib
+
+# Arquivos de anúncios em JSON Lines (um anúncio por linha), usados pela raspagem e lidos pelo
+# Processamento. A raspagem só acrescenta linhas ao fim do arquivo, página a página, em vez de
+# regravar o JSON inteiro no fim da execução: uma queda na página 99 perde no máximo as páginas
+# ainda não sincronizadas. O mesmo anúncio pode aparecer em várias linhas (uma por execução em que
+# foi visto); `compactar` regrava o arquivo com uma linha por anúncio.
+EXTENSAO_NDJSON = '.jsonl'
+PAGINAS_POR_FSYNC = 5  # os dados vão para o sistema operacional a cada página; fsync a cada N páginas
+SEGUNDOS_POR_FSYNC = 30.0  # ... ou depois desse tempo desde o último fsync
+
+
+def caminho_ndjson(caminho_json):
+    """'olx_data/casas_compra.json' -> 'olx_data/casas_compra.jsonl'."""
+    return os.path.splitext(caminho_json)[0] + EXTENSAO_NDJSON
+
+
+def resolver_caminho(caminho):
+    """Para um caminho '.json', o '.jsonl' ao lado quando ele existir; senão o próprio caminho."""
+    if caminho.endswith('.json'):
+        ndjson = caminho_ndjson(caminho)
+        if os.path.exists(ndjson):
+            return ndjson
+    return caminho
+
+
+TAMANHO_BLOCO_LEITURA = 1 << 16
+_DECODIFICADOR = json.JSONDecoder()
+_SEPARADORES = ' \t\r\n,'
+
+
+def _iterar_valores(f, inicio, final):
+    """
+    Valores JSON lidos de `f` em blocos a partir de `inicio`, separados por espaços e vírgulas
+    (vírgulas repetidas são toleradas). Para em `final` (']' de uma lista) ou no fim do arquivo.
+    Só o valor em leitura e o resto do bloco ficam em memória.
+    """
+    buffer, pos, fim_arquivo = inicio, 0, False
+    while True:
+        while pos < len(buffer) and buffer[pos] in _SEPARADORES:
+            pos += 1
+        if pos == len(buffer):
+            if fim_arquivo:
+                return
+            buffer, pos = f.read(TAMANHO_BLOCO_LEITURA), 0
+            fim_arquivo = not buffer
+            continue
+        if final is not None and buffer[pos] == final:
+            return
+        try:
+            valor, fim = _DECODIFICADOR.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if fim_arquivo:
+                raise
+            # Valor cortado no fim do bloco: lê mais e tenta de novo
+            bloco = f.read(TAMANHO_BLOCO_LEITURA)
+            fim_arquivo = not bloco
+            buffer, pos = buffer[pos:] + bloco, 0
+            continue
+        if fim == len(buffer) and not fim_arquivo and not isinstance(valor, (dict, list)):
+            # Um número no fim do bloco pode continuar no próximo
+            bloco = f.read(TAMANHO_BLOCO_LEITURA)
+            fim_arquivo = not bloco
+            buffer, pos = buffer[pos:] + bloco, 0
+            continue
+        yield valor
+        buffer, pos = buffer[fim:], 0
+
+
+def _iterar_linhas(f, caminho):
+    invalidas = 0
+    for linha in f:
+        linha = linha.strip()
+        if not linha:
+            continue
+        try:
+            registro = json.loads(linha)
+        except json.JSONDecodeError:
+            invalidas += 1
+            continue
+        if isinstance(registro, dict):
+            yield registro
+    if invalidas:
+        print(f"AVISO: {invalidas} linhas inválidas ignoradas em '{caminho}'.", flush=True)
+
+
+def iterar_registros(caminho):
+    """
+    Percorre, um a um, os registros de um arquivo JSON Lines ou de um JSON com uma lista (formato
+    antigo dos scripts de raspagem e dos resultados do Processamento), sem carregar o arquivo
+    inteiro. No JSON Lines, linhas inválidas (por exemplo a última linha cortada por uma queda
+    durante a gravação) são ignoradas com um aviso. Também são aceitos um objeto único e objetos
+    soltos separados por vírgulas, com ou sem vírgulas repetidas. Lança FileNotFoundError, e
+    json.JSONDecodeError quando a lista está corrompida (depois de entregar os registros anteriores).
+    """
+    with open(caminho, 'r', encoding='utf-8') as f:
+        inicio = f.read(1)
+        while inicio and inicio.isspace():
+            inicio = f.read(1)
+        if not inicio:
+            return
+        if inicio == '[':
+            for valor in _iterar_valores(f, '', ']'):
+                if isinstance(valor, dict):
+                    yield valor
+            return
+        primeira_linha = inicio + f.readline()
+        try:
+            linha_valida = isinstance(json.loads(primeira_linha), dict)
+        except json.JSONDecodeError:
+            linha_valida = False
+        if linha_valida:
+            yield from _iterar_linhas(itertools.chain([primeira_linha], f), caminho)
+        else:
+            # Objeto indentado ou objetos concatenados ('},{'): leitura por valores
+            for valor in _iterar_valores(f, primeira_linha, None):
+                if isinstance(valor, dict):
+                    yield valor
+
+
+def e_ndjson(caminho):
+    return caminho.endswith(EXTENSAO_NDJSON)
+
+
+def iterar_linhas_desde(caminho, inicio=0, fim=None):
+    """
+    Registros de um JSON Lines do byte `inicio` até `fim`, como pares (registro, byte seguinte à
+    linha). Sem `fim`, só linhas completas (terminadas em '\n') são lidas: uma linha ainda sendo
+    gravada fica para a próxima leitura. `fim` vem de `fim_dos_registros_completos`. Linhas
+    inválidas são puladas com um aviso, como em `iterar_registros`.
+    """
+    invalidas = 0
+    with open(caminho, 'rb') as f:
+        f.seek(inicio)
+        posicao = inicio
+        for linha in f:
+            if fim is not None and posicao + len(linha) > fim:
+                break
+            if fim is None and not linha.endswith(b'\n'):
+                break
+            posicao += len(linha)
+            linha = linha.strip()
+            if not linha:
+                continue
+            try:
+                registro = json.loads(linha)
+            except json.JSONDecodeError:
+                invalidas += 1
+                continue
+            if isinstance(registro, dict):
+                yield registro, posicao
+    if invalidas:
+        print(f"AVISO: {invalidas} linhas inválidas ignoradas em '{caminho}'.", flush=True)
+
+
+def fim_dos_registros_completos(caminho, tamanho):
+    """
+    Byte final dos registros completos nos primeiros `tamanho` bytes de um JSON Lines: o seguinte
+    ao último '\n', ou `tamanho` se o que vem depois dele já é um objeto JSON inteiro (arquivo
+    sem '\n' no fim; o `GravadorNdjson` começa a próxima gravação numa linha nova).
+    """
+    with open(caminho, 'rb') as f:
+        posicao = tamanho
+        while posicao > 0:
+            inicio = max(0, posicao - TAMANHO_BLOCO_LEITURA)
+            f.seek(inicio)
+            indice = f.read(posicao - inicio).rfind(b'\n')
+            if indice >= 0:
+                posicao = inicio + indice + 1
+                break
+            posicao = inicio
+        f.seek(posicao)
+        resto = f.read(tamanho - posicao).strip()
+    if resto:
+        try:
+            if isinstance(json.loads(resto), dict):
+                return tamanho
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            pass
+    return posicao
+
+
+def sha256_prefixo(caminho, tamanho):
+    """SHA-256 (hexadecimal) dos primeiros `tamanho` bytes do arquivo."""
+    h = hashlib.sha256()
+    with open(caminho, 'rb') as f:
+        restante = tamanho
+        while restante > 0:
+            bloco = f.read(min(TAMANHO_BLOCO_LEITURA * 16, restante))
+            if not bloco:
+                break
+            h.update(bloco)
+            restante -= len(bloco)
+    return h.hexdigest()
+
+
+def _sincronizar_diretorio(diretorio):
+    # Garante que o rename sobreviva a uma queda (POSIX); no Windows diretórios não abrem
+    if sys.platform.startswith('win'):
+        return
+    fd = os.open(diretorio or '.', os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _substituir_atomicamente(caminho, escrever):
+    # Escreve num temporário do mesmo diretório, fsync e rename: quem lê `caminho` vê o arquivo
+    # antigo inteiro ou o novo inteiro, nunca um arquivo pela metade
+    diretorio = os.path.dirname(caminho)
+    if diretorio:
+        os.makedirs(diretorio, exist_ok=True)
+    temporario = f"{caminho}.tmp-{os.getpid()}"
+    try:
+        with open(temporario, 'w', encoding='utf-8') as f:
+            resultado = escrever(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporario, caminho)
+    finally:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+    _sincronizar_diretorio(diretorio)
+    return resultado
+
+
+def gravar_atomicamente(caminho, registros):
+    """Grava `registros` em JSON Lines num arquivo temporário e o renomeia sobre `caminho`."""
+    def escrever(f):
+        total = 0
+        for registro in registros:
+            f.write(json.dumps(registro, ensure_ascii=False))
+            f.write('\n')
+            total += 1
+        return total
+    return _substituir_atomicamente(caminho, escrever)
+
+
+def gravar_json_atomicamente(caminho, dados):
+    """Grava `dados` como um JSON comum, com a mesma troca atômica de `gravar_atomicamente`."""
+    _substituir_atomicamente(caminho, lambda f: json.dump(dados, f, ensure_ascii=False, indent=2))
+
+
+class GravadorNdjson:
+    """
+    Acrescenta registros a um arquivo JSON Lines. Cada `acrescentar` (uma página) termina com
+    flush; o fsync é agrupado a cada `paginas_por_fsync` chamadas ou `segundos_por_fsync`
+    segundos, e sempre no `fechar`. Seguro para várias threads.
+    """
+
+    def __init__(self, caminho, paginas_por_fsync=PAGINAS_POR_FSYNC, segundos_por_fsync=SEGUNDOS_POR_FSYNC):
+        self.caminho = caminho
+        self.paginas_por_fsync = paginas_por_fsync
+        self.segundos_por_fsync = segundos_por_fsync
+        self.linhas = 0
+        self.fsyncs = 0
+        self.tamanho_sincronizado = None  # bytes do arquivo garantidos pelo último fsync
+        self._arquivo = None
+        self._pendentes = 0
+        self._ultimo_fsync = time.monotonic()
+        self._trava = threading.Lock()
+
+    def _abrir(self):
+        if self._arquivo is None:
+            diretorio = os.path.dirname(self.caminho)
+            if diretorio:
+                os.makedirs(diretorio, exist_ok=True)
+            novo = not os.path.exists(self.caminho)
+            self._arquivo = open(self.caminho, 'a', encoding='utf-8')
+            if not novo and self._arquivo.tell() > 0:
+                # Uma queda pode ter deixado a última linha sem '\n': começa numa linha nova
+                with open(self.caminho, 'rb') as f:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b'\n':
+                        self._arquivo.write('\n')
+        return self._arquivo
+
+    def acrescentar(self, registros):
+        """Acrescenta os registros de uma página; True quando esta chamada fez o fsync."""
+        if not registros:
+            return False
+        linhas = ''.join(json.dumps(r, ensure_ascii=False) + '\n' for r in registros)
+        with self._trava:
+            arquivo = self._abrir()
+            arquivo.write(linhas)
+            arquivo.flush()
+            self.linhas += len(registros)
+            self._pendentes += 1
+            if (self._pendentes >= self.paginas_por_fsync
+                    or time.monotonic() - self._ultimo_fsync >= self.segundos_por_fsync):
+                self._fsync()
+                return True
+            return False
+
+    def sincronizar(self):
+        """fsync imediato; retorna o tamanho em bytes do arquivo já garantido em disco."""
+        with self._trava:
+            if self._arquivo is None:
+                return os.path.getsize(self.caminho) if os.path.exists(self.caminho) else 0
+            if self._pendentes or self.tamanho_sincronizado is None:
+                self._fsync()
+            return self.tamanho_sincronizado
+
+    def _fsync(self):
+        self._arquivo.flush()
+        os.fsync(self._arquivo.fileno())
+        self.tamanho_sincronizado = self._arquivo.tell()
+        self.fsyncs += 1
+        self._pendentes = 0
+        self._ultimo_fsync = time.monotonic()
+
+    def fechar(self):
+        with self._trava:
+            if self._arquivo is not None:
+                self._arquivo.flush()
+                if self._pendentes:
+                    self._fsync()
+                self._arquivo.close()
+                self._arquivo = None
+
+
+def compactar(caminho, identificador, origens=None):
+    """
+    Regrava `caminho` com uma linha por anúncio. Os registros de `origens` (por padrão só o próprio
+    `caminho`) são lidos em ordem; o de identificador repetido fica na posição da primeira
+    ocorrência, com o conteúdo da última e o `first_seen` mais antigo. Registros sem identificador
+    (None) são mantidos. Retorna (linhas lidas, linhas gravadas).
+    """
+    posicoes = {}
+    registros = []
+    lidos = 0
+    for origem in (origens or [caminho]):
+        if not os.path.exists(origem):
+            continue
+        for registro in iterar_registros(origem):
+            lidos += 1
+            chave = identificador(registro)
+            posicao = posicoes.get(chave) if chave is not None else None
+            if posicao is None:
+                if chave is not None:
+                    posicoes[chave] = len(registros)
+                registros.append(registro)
+                continue
+            antigo = registros[posicao]
+            if antigo.get('first_seen') and (not registro.get('first_seen') or antigo['first_seen'] < registro['first_seen']):
+                registro['first_seen'] = antigo['first_seen']
+            registros[posicao] = registro
+    gravados = gravar_atomicamente(caminho, registros)
+    return lidos, gravados
+
+
+def _pico_de_memoria(caminho, modo):
+    # Roda num subprocesso: pico de memória (MB) para percorrer `caminho` com json.load ou iterar_registros
+    import subprocess
+    codigo = (
+        "import json, resource, sys\n"
+        "from ArmazenamentoNdjson import iterar_registros\n"
+        f"caminho = {caminho!r}\n"
+        + ("total = len(json.load(open(caminho, encoding='utf-8')))\n" if modo == 'json.load' else
+           "total = sum(1 for _ in iterar_registros(caminho))\n")
+        + "print(total, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024)\n"
+    )
+    inicio = time.perf_counter()
+    saida = subprocess.run([sys.executable, '-c', codigo], capture_output=True, text=True, check=True,
+                           cwd=os.path.dirname(os.path.abspath(__file__))).stdout.split()
+    return int(saida[0]), float(saida[1]), time.perf_counter() - inicio
+
+
+def medir_memoria(total_anuncios=1_000_000):
+    """Pico de memória de json.load x leitura em fluxo num arquivo sintético de `total_anuncios`."""
+    import tempfile
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminhos = {'lista': os.path.join(diretorio, 'sintetico.json'), 'linhas': os.path.join(diretorio, 'sintetico.jsonl')}
+        with open(caminhos['lista'], 'w', encoding='utf-8') as lista, open(caminhos['linhas'], 'w', encoding='utf-8') as linhas:
+            lista.write('[\n')
+            for i in range(total_anuncios):
+                anuncio = {
+                    'titulo': f'Apartamento {i} com 3 quartos', 'link': f'https://www.exemplo.com.br/imovel/id-{1000000 + i}/',
+                    'preco': 350000.0 + i, 'area_m2': 70 + i % 80, 'quartos': 1 + i % 4,
+                    'endereco': f'Rua T-{i % 500}, {i % 1000} - Setor Bueno, Goiânia - GO',
+                    'first_seen': '2026-01-01T00:00:00', 'last_seen': '2026-01-02T00:00:00',
+                }
+                texto = json.dumps(anuncio, ensure_ascii=False)
+                lista.write(('  ' if i == 0 else ',\n  ') + texto)
+                linhas.write(texto + '\n')
+            lista.write('\n]\n')
+        for formato, caminho in caminhos.items():
+            tamanho = os.path.getsize(caminho) / 2 ** 20
+            for modo in (('json.load', 'iterar_registros') if formato == 'lista' else ('iterar_registros',)):
+                lidos, pico, duracao = _pico_de_memoria(caminho, modo)
+                print(f"{formato:6s} {tamanho:7.1f} MB  {modo:16s} {lidos} anúncios  pico {pico:8.1f} MB  {duracao:5.1f}s")
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['memoria']:
+        medir_memoria(int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000)
+        sys.exit()
+    # Verificação: gravação página a página, última linha cortada, compactação e leitura dos dois formatos
+    import tempfile
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, 'categoria.jsonl')
+        gravador = GravadorNdjson(caminho, paginas_por_fsync=2)
+        for pagina in range(1, 6):
+            gravador.acrescentar([{'link': f'id-{pagina}', 'first_seen': '2026-01-01', 'pagina': pagina},
+                                  {'link': f'id-{pagina + 1}', 'first_seen': '2026-01-02', 'pagina': pagina}])
+        assert gravador.fsyncs == 2, gravador.fsyncs
+        gravador.fechar()
+        assert gravador.fsyncs == 3 and gravador.linhas == 10
+        with open(caminho, 'a', encoding='utf-8') as f:
+            f.write('{"link": "id-cortado", "pag')  # queda no meio de uma linha
+        gravador = GravadorNdjson(caminho)
+        gravador.acrescentar([{'link': 'id-9', 'first_seen': '2026-01-03'}])
+        gravador.fechar()
+        assert [r['link'] for r in iterar_registros(caminho)][-2:] == ['id-6', 'id-9']
+        lidos, gravados = compactar(caminho, lambda r: r.get('link'))
+        registros = list(iterar_registros(caminho))
+        assert (lidos, gravados) == (11, 7), (lidos, gravados)
+        assert [r['link'] for r in registros] == ['id-1', 'id-2', 'id-3', 'id-4', 'id-5', 'id-6', 'id-9']
+        assert registros[1] == {'link': 'id-2', 'first_seen': '2026-01-01', 'pagina': 2}
+
+        # Leitura a partir de um offset: só registros completos, inclusive o último sem '\n'
+        tamanho = os.path.getsize(caminho)
+        with open(caminho, 'a', encoding='utf-8') as f:
+            f.write('{"link": "id-10"}\n{"link": "id-11"}')
+        fim = fim_dos_registros_completos(caminho, os.path.getsize(caminho))
+        assert fim == os.path.getsize(caminho)
+        assert [(r['link'], p) for r, p in iterar_linhas_desde(caminho, tamanho, fim)][-1] == ('id-11', fim)
+        with open(caminho, 'a', encoding='utf-8') as f:
+            f.write('\n{"link": "id-12", "pag')
+        assert fim_dos_registros_completos(caminho, os.path.getsize(caminho)) == fim + 1
+        assert sha256_prefixo(caminho, tamanho) == hashlib.sha256(open(caminho, 'rb').read(tamanho)).hexdigest()
+
+        legado = os.path.join(diretorio, 'legado.json')
+        with open(legado, 'w', encoding='utf-8') as f:
+            json.dump([{'link': 'a'}, {'link': 'b'}], f, indent=2)
+        assert resolver_caminho(legado) == legado and [r['link'] for r in iterar_registros(legado)] == ['a', 'b']
+        compactar(caminho_ndjson(legado), lambda r: r.get('link'), origens=[legado])
+        assert resolver_caminho(legado) == caminho_ndjson(legado)
+    print("Verificação OK.")
@@ -0,0 +1,246 @@
+import os
+import re
+import sys
+import json
+import sqlite3
+import unicodedata
+from LimpezaEndereco import chave_canonica_endereco
+
+# Base consolidada dos anúncios (SQLite em modo WAL), compartilhada pelo Processamento, que grava
+# os anúncios combinados de cada categoria, e pelo Mapa, que lê a categoria por índice em vez de
+# reler o JSON e grava de volta as coordenadas que resolveu. Cada anúncio guarda as colunas usadas
+# em consultas (tipo, finalidade, preço, área, quartos, bairro, geohash...) e o registro completo
+# em `dados`, para o Mapa reconstruir exatamente o item do resultados_<categoria>.json.
+ARQUIVO_BANCO_IMOVEIS = 'imoveis.sqlite3'
+PRECISAO_GEOHASH = 7  # células de ~150 m x 150 m
+_BASE32_GEOHASH = '0123456789bcdefghjkmnpqrstuvwxyz'
+_CIDADES_FORA_DO_BAIRRO = ['goiania', 'aparecida de goiania', 'goias', 'go', 'brasil', 'anapolis']
+
+ESQUEMA = (
+    'CREATE TABLE IF NOT EXISTS listings ('
+    ' id INTEGER PRIMARY KEY,'
+    ' categoria TEXT NOT NULL,'
+    ' source TEXT, link TEXT, tipo TEXT, finalidade TEXT,'
+    ' preco REAL, area REAL, quartos INTEGER,'
+    ' endereco TEXT, chave_endereco TEXT,'
+    ' lat REAL, lon REAL, geohash TEXT, bairro TEXT,'
+    ' first_seen TEXT, last_seen TEXT,'
+    ' dados TEXT NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS listings_categoria ON listings (categoria)',
+    'CREATE INDEX IF NOT EXISTS listings_tipo_finalidade ON listings (tipo, finalidade)',
+    'CREATE INDEX IF NOT EXISTS listings_bairro ON listings (bairro)',
+    'CREATE INDEX IF NOT EXISTS listings_geohash ON listings (geohash)',
+    'CREATE INDEX IF NOT EXISTS listings_chave_endereco ON listings (categoria, chave_endereco)',
+)
+
+
+def _normalizar(texto):
+    if not isinstance(texto, str): return ""
+    nfkd_form = unicodedata.normalize('NFD', texto)
+    return "".join([c for c in nfkd_form if not unicodedata.combining(c)]).lower().strip()
+
+
+def extrair_bairro(item):
+    """Bairro do anúncio a partir de 'bairro', 'localizacao', 'logradouro' ou 'endereco'."""
+    campos_tentar = ['bairro', 'localizacao', 'logradouro', 'endereco']
+    for campo in campos_tentar:
+        valor_campo = item.get(campo)
+        if valor_campo and isinstance(valor_campo, str):
+            partes = [p.strip() for p in valor_campo.split(',') if p.strip()]
+            if not partes: continue
+            for parte_cand in partes:
+                norm_parte = _normalizar(parte_cand)
+                if norm_parte and norm_parte not in _CIDADES_FORA_DO_BAIRRO and not parte_cand.isdigit() and len(parte_cand) > 2:
+                    return parte_cand.title()
+            if len(partes) == 1 and _normalizar(partes[0]) not in _CIDADES_FORA_DO_BAIRRO: return partes[0].title()
+            if len(partes) > 1:
+                 if _normalizar(partes[-1]) in _CIDADES_FORA_DO_BAIRRO and _normalizar(partes[-2]) not in _CIDADES_FORA_DO_BAIRRO:
+                     return partes[-2].title()
+                 if _normalizar(partes[0]) not in _CIDADES_FORA_DO_BAIRRO:
+                     return partes[0].title()
+    return "Sem Bairro Definido"
+
+
+def geohash(lat, lon, precisao=PRECISAO_GEOHASH):
+    """Geohash de (lat, lon); anúncios próximos compartilham o prefixo."""
+    faixa_lat, faixa_lon = [-90.0, 90.0], [-180.0, 180.0]
+    caracteres, bits, valor, usar_lon = [], 0, 0, True
+    while len(caracteres) < precisao:
+        faixa, coordenada = (faixa_lon, lon) if usar_lon else (faixa_lat, lat)
+        meio = (faixa[0] + faixa[1]) / 2
+        valor <<= 1
+        if coordenada >= meio:
+            valor |= 1
+            faixa[0] = meio
+        else:
+            faixa[1] = meio
+        usar_lon = not usar_lon
+        bits += 1
+        if bits == 5:
+            caracteres.append(_BASE32_GEOHASH[valor])
+            bits, valor = 0, 0
+    return ''.join(caracteres)
+
+
+def _coordenadas(item):
+    geo = item.get('geolocalizacao')
+    if isinstance(geo, dict) and geo.get('latitude') is not None and geo.get('longitude') is not None:
+        try:
+            return float(geo['latitude']), float(geo['longitude'])
+        except (ValueError, TypeError):
+            pass
+    return None, None
+
+
+def _inteiro(valor):
+    # Mesma leitura de `quartos_para_comparacao` no Processamento: só os dígitos do texto
+    digitos = re.sub(r'\D', '', str(valor)) if valor is not None else ''
+    return int(digitos) if digitos else None
+
+
+def linha_do_item(categoria, item):
+    """Colunas de `listings` para um anúncio padronizado pelo Processamento."""
+    lat, lon = _coordenadas(item)
+    endereco = item.get('endereco') if isinstance(item.get('endereco'), str) else None
+    return (
+        categoria, item.get('fonte'), item.get('link'), item.get('tipo_imovel'), item.get('finalidade'),
+        item.get('preco'), item.get('area_m2'), _inteiro(item.get('quartos')),
+        endereco, chave_canonica_endereco(endereco) if endereco else None,
+        lat, lon, geohash(lat, lon) if lat is not None else None, extrair_bairro(item),
+        item.get('first_seen'), item.get('last_seen'),
+        json.dumps(item, ensure_ascii=False),
+    )
+
+
+class BancoImoveis:
+    def __init__(self, caminho=ARQUIVO_BANCO_IMOVEIS):
+        self.caminho = caminho
+        self._conexao = None
+        self._pid = None
+
+    def _conectar(self):
+        # Conexões SQLite não podem atravessar um fork: reabre se o processo mudou
+        if self._conexao is None or self._pid != os.getpid():
+            self._conexao = sqlite3.connect(self.caminho, timeout=60, isolation_level=None)
+            self._conexao.execute('PRAGMA journal_mode=WAL')
+            self._conexao.execute('PRAGMA synchronous=NORMAL')
+            for comando in ESQUEMA:
+                self._conexao.execute(comando)
+            self._pid = os.getpid()
+        return self._conexao
+
+    def substituir_categoria(self, categoria, itens):
+        """Troca, numa única transação, os anúncios de `categoria` pelos `itens` padronizados."""
+        conexao = self._conectar()
+        linhas = [linha_do_item(categoria, item) for item in itens]
+        with conexao:
+            conexao.execute('BEGIN IMMEDIATE')
+            conexao.execute('DELETE FROM listings WHERE categoria = ?', (categoria,))
+            conexao.executemany(
+                'INSERT INTO listings (categoria, source, link, tipo, finalidade, preco, area, quartos,'
+                ' endereco, chave_endereco, lat, lon, geohash, bairro, first_seen, last_seen, dados)'
+                ' VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', linhas
+            )
+        return len(linhas)
+
+    def total(self, categoria=None):
+        if categoria is None:
+            return self._conectar().execute('SELECT COUNT(*) FROM listings').fetchone()[0]
+        return self._conectar().execute('SELECT COUNT(*) FROM listings WHERE categoria = ?', (categoria,)).fetchone()[0]
+
+    def _filtros(self, categoria=None, tipo=None, finalidade=None, bairro=None, prefixo_geohash=None):
+        condicoes, parametros = [], []
+        if categoria is not None:
+            condicoes.append('categoria = ?'); parametros.append(categoria)
+        if tipo is not None:
+            condicoes.append('tipo = ?'); parametros.append(tipo)
+        if finalidade is not None:
+            condicoes.append('finalidade = ?'); parametros.append(finalidade)
+        if bairro is not None:
+            condicoes.append('bairro = ?'); parametros.append(bairro)
+        if prefixo_geohash:
+            # Intervalo em vez de LIKE para usar o índice ('{' vem logo depois de 'z')
+            condicoes.append('geohash >= ? AND geohash < ?'); parametros += [prefixo_geohash, prefixo_geohash + '{']
+        return (' WHERE ' + ' AND '.join(condicoes)) if condicoes else '', parametros
+
+    def consultar(self, **filtros):
+        """
+        Itera os anúncios (dicionários do Processamento) que atendem aos filtros `categoria`, `tipo`,
+        `finalidade`, `bairro` e `prefixo_geohash`, com as coordenadas gravadas pelo Mapa.
+        """
+        where, parametros = self._filtros(**filtros)
+        cursor = self._conectar().execute(f'SELECT lat, lon, dados FROM listings{where} ORDER BY id', parametros)
+        for lat, lon, dados in cursor:
+            item = json.loads(dados)
+            if lat is not None and lon is not None:
+                item['geolocalizacao'] = {"latitude": lat, "longitude": lon}
+            yield item
+
+    def plano(self, **filtros):
+        """Plano de execução do SQLite para `consultar(**filtros)` (para conferir o uso dos índices)."""
+        where, parametros = self._filtros(**filtros)
+        return [linha[-1] for linha in self._conectar().execute(
+            f'EXPLAIN QUERY PLAN SELECT lat, lon, dados FROM listings{where} ORDER BY id', parametros)]
+
+    def gravar_coordenadas(self, categoria, coordenadas_por_chave):
+        """Grava {chave canônica do endereço: (lat, lon)} nos anúncios da categoria ainda sem coordenadas."""
+        linhas = [(lat, lon, geohash(lat, lon), categoria, chave)
+                  for chave, (lat, lon) in coordenadas_por_chave.items() if lat is not None and lon is not None]
+        if not linhas:
+            return 0
+        conexao = self._conectar()
+        with conexao:
+            conexao.execute('BEGIN IMMEDIATE')
+            antes = conexao.total_changes
+            conexao.executemany(
+                'UPDATE listings SET lat = ?, lon = ?, geohash = ?'
+                ' WHERE categoria = ? AND chave_endereco = ? AND lat IS NULL', linhas
+            )
+            return conexao.total_changes - antes
+
+    def fechar(self):
+        if self._conexao is not None and self._pid == os.getpid():
+            self._conexao.close()
+        self._conexao = None
+
+
+if __name__ == '__main__':
+    # python BancoImoveis.py [tipo [finalidade [bairro]]] -> consulta na base do diretório atual;
+    # sem argumentos, verificação com uma base temporária
+    if sys.argv[1:]:
+        nomes = ['tipo', 'finalidade', 'bairro']
+        filtros = dict(zip(nomes, sys.argv[1:]))
+        banco = BancoImoveis()
+        encontrados = list(banco.consultar(**filtros))
+        for item in encontrados[:20]:
+            print(f"{item.get('tipo_imovel')} {item.get('finalidade')} R$ {item.get('preco')} "
+                  f"{item.get('area_m2')} m² - {item.get('endereco')}")
+        print(f"{len(encontrados)} anúncios ({'; '.join(banco.plano(**filtros))}).")
+        sys.exit()
+
+    import tempfile
+    assert geohash(57.64911, 10.40744, 11) == 'u4pruydqqvj'  # exemplo clássico do geohash
+    with tempfile.TemporaryDirectory() as diretorio:
+        banco = BancoImoveis(os.path.join(diretorio, 'imoveis.sqlite3'))
+        itens = [
+            {'tipo_imovel': 'Casa', 'finalidade': 'Venda', 'endereco': 'Rua T-55, Setor Bueno, Goiânia',
+             'preco': 450000.0, 'area_m2': 100.0, 'quartos': '3', 'link': 'https://x/1', 'fonte': 'olx',
+             'geolocalizacao': {'latitude': -16.7069, 'longitude': -49.2690}, 'first_seen': '2026-01-01T00:00:00'},
+            {'tipo_imovel': 'Casa', 'finalidade': 'Venda', 'endereco': 'Setor Oeste, Goiânia',
+             'preco': 500000.0, 'area_m2': 95.0, 'quartos': '2 quartos', 'link': 'https://x/2', 'fonte': 'zapimoveis',
+             'geolocalizacao': None},
+        ]
+        assert banco.substituir_categoria('casa_venda', itens) == 2
+        assert banco.substituir_categoria('casa_venda', itens) == 2 and banco.total() == 2  # substitui, não duplica
+        assert [i['link'] for i in banco.consultar(bairro='Setor Oeste')] == ['https://x/2']
+        assert [i['link'] for i in banco.consultar(prefixo_geohash=geohash(-16.7069, -49.2690)[:5])] == ['https://x/1']
+        chave = chave_canonica_endereco('Setor Oeste, Goiânia')
+        assert banco.gravar_coordenadas('casa_venda', {chave: (-16.68, -49.27)}) == 1
+        recuperados = list(banco.consultar(categoria='casa_venda'))
+        assert recuperados[0] == itens[0]
+        assert recuperados[1]['geolocalizacao'] == {'latitude': -16.68, 'longitude': -49.27}
+        for filtros in ({'tipo': 'Casa', 'finalidade': 'Venda'}, {'bairro': 'Setor Bueno'}, {'prefixo_geohash': '6vhb'}):
+            plano = ' '.join(banco.plano(**filtros))
+            assert 'USING INDEX' in plano, plano
+        banco.fechar()
+    print("Verificação OK.")
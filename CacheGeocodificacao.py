@@ -0,0 +1,130 @@
+import os
+import json
+import time
+import sqlite3
+from collections import OrderedDict, Counter
+from LimpezaEndereco import chave_canonica_endereco
+
+# Cache persistente de geocodificação (SQLite em modo WAL), compartilhado entre execuções, entre
+# os processos do Pool e entre as etapas Processamento e Mapa. As chaves são sempre geradas por
+# `chave_canonica_endereco`. Cada processo abre a sua própria conexão e mantém um LRU local
+# para evitar idas ao disco em endereços repetidos.
+ARQUIVO_CACHE_GEO = 'geocode_cache.sqlite3'
+ARQUIVO_CACHE_JSON_LEGADO = 'geocode_cache.json'
+TAMANHO_LRU_PADRAO = 4096
+TTL_NEGATIVO_PADRAO = 7 * 24 * 3600  # falhas (None, None) são refeitas depois de 7 dias
+
+
+class CacheGeocodificacao:
+    def __init__(self, caminho=ARQUIVO_CACHE_GEO, origem='processamento', tamanho_lru=TAMANHO_LRU_PADRAO, ttl_negativo=TTL_NEGATIVO_PADRAO):
+        self.caminho = caminho
+        self.origem = origem  # etapa que grava as entradas ('processamento' ou 'mapa')
+        self.tamanho_lru = tamanho_lru
+        self.ttl_negativo = ttl_negativo
+        self.lru = OrderedDict()
+        self.acertos = 0  # só entradas com coordenadas
+        self.acertos_negativos = 0  # entradas (None, None) ainda dentro do TTL
+        self.faltas = 0
+        self.acertos_por_origem = Counter()  # só acertos com coordenadas, por etapa que gravou
+        self._conexao = None
+        self._pid = None
+
+    def _conectar(self):
+        # Conexões SQLite não podem atravessar um fork: reabre se o processo mudou
+        if self._conexao is None or self._pid != os.getpid():
+            self._conexao = sqlite3.connect(self.caminho, timeout=30, isolation_level=None)
+            self._conexao.execute('PRAGMA journal_mode=WAL')
+            self._conexao.execute('PRAGMA synchronous=NORMAL')
+            self._conexao.execute(
+                'CREATE TABLE IF NOT EXISTS geocodificacao ('
+                ' chave TEXT PRIMARY KEY, lat REAL, lon REAL, atualizado_em REAL NOT NULL, origem TEXT)'
+            )
+            self._conexao.execute('CREATE TABLE IF NOT EXISTS metadados (nome TEXT PRIMARY KEY, valor TEXT)')
+            colunas = {linha[1] for linha in self._conexao.execute('PRAGMA table_info(geocodificacao)')}
+            if 'origem' not in colunas:
+                self._conexao.execute('ALTER TABLE geocodificacao ADD COLUMN origem TEXT')
+            self._pid = os.getpid()
+            self.lru.clear()
+        return self._conexao
+
+    def _lembrar(self, chave, valor):
+        self.lru[chave] = valor
+        self.lru.move_to_end(chave)
+        if len(self.lru) > self.tamanho_lru:
+            self.lru.popitem(last=False)
+
+    def _expirado(self, lat, atualizado_em):
+        return lat is None and time.time() - atualizado_em > self.ttl_negativo
+
+    def obter(self, chave):
+        """Retorna (encontrado, (lat, lon)). Resultados negativos vencidos contam como falta."""
+        valor = self.lru.get(chave)
+        if valor is None:
+            linha = self._conectar().execute(
+                'SELECT lat, lon, atualizado_em, origem FROM geocodificacao WHERE chave = ?', (chave,)
+            ).fetchone()
+            if linha is not None:
+                valor = linha
+        if valor is not None and not self._expirado(valor[0], valor[2]):
+            self._lembrar(chave, valor)
+            if valor[0] is not None:
+                self.acertos += 1
+                self.acertos_por_origem[valor[3]] += 1
+            else:
+                self.acertos_negativos += 1
+            return True, (valor[0], valor[1])
+        self.lru.pop(chave, None)
+        self.faltas += 1
+        return False, (None, None)
+
+    def gravar(self, chave, lat, lon):
+        valor = (lat, lon, time.time(), self.origem)
+        self._conectar().execute(
+            'INSERT OR REPLACE INTO geocodificacao (chave, lat, lon, atualizado_em, origem) VALUES (?, ?, ?, ?, ?)',
+            (chave,) + valor
+        )
+        self._lembrar(chave, valor)
+
+    def importar_cache_json(self, caminho_json=ARQUIVO_CACHE_JSON_LEGADO):
+        """Migração única do antigo geocode_cache.json do Mapa. Retorna quantas entradas foram importadas."""
+        conexao = self._conectar()
+        marcador = f"importado:{os.path.abspath(caminho_json)}"
+        if not os.path.exists(caminho_json) or self._migracao_feita(conexao, marcador):
+            return 0
+        with open(caminho_json, 'r', encoding='utf-8') as f:
+            cache_json = json.load(f)
+        atualizado_em = os.path.getmtime(caminho_json)
+        linhas = []
+        for endereco, coords in cache_json.items():
+            try:
+                lat, lon = float(coords['lat']), float(coords['lon'])
+            except (ValueError, TypeError, KeyError):
+                continue
+            chave = chave_canonica_endereco(endereco)
+            if chave:
+                linhas.append((chave, lat, lon, atualizado_em, 'mapa'))
+        with conexao:
+            # BEGIN IMMEDIATE serializa Processamento e Mapa migrando ao mesmo tempo: quem chegar
+            # depois vê o marcador já gravado e não importa de novo.
+            conexao.execute('BEGIN IMMEDIATE')
+            if self._migracao_feita(conexao, marcador):
+                return 0
+            antes = conexao.total_changes
+            conexao.executemany(
+                'INSERT OR IGNORE INTO geocodificacao (chave, lat, lon, atualizado_em, origem) VALUES (?, ?, ?, ?, ?)',
+                linhas
+            )
+            importadas = conexao.total_changes - antes
+            conexao.execute('INSERT OR IGNORE INTO metadados (nome, valor) VALUES (?, ?)', (marcador, str(len(linhas))))
+        return importadas
+
+    def _migracao_feita(self, conexao, marcador):
+        return conexao.execute('SELECT 1 FROM metadados WHERE nome = ?', (marcador,)).fetchone() is not None
+
+    def __len__(self):
+        return self._conectar().execute('SELECT COUNT(*) FROM geocodificacao').fetchone()[0]
+
+    def fechar(self):
+        if self._conexao is not None and self._pid == os.getpid():
+            self._conexao.close()
+        self._conexao = None
@@ -0,0 +1,212 @@
+import re
+import sys
+import time
+
+# Conversão de preço e área dos anúncios ("R$ 350.000,00", "80 m²", 350000.0, ...) para float.
+# `parse_price_to_float`/`parse_area_to_float` convertem um valor; `precos_para_float`/
+# `areas_para_float` convertem uma coluna inteira com as funções vetorizadas do pyarrow
+# (pip install pyarrow), com o mesmo resultado das versões de um valor: números viram uma coluna
+# numérica, textos passam pelas mesmas trocas feitas com operações de string do Arrow, e o que o
+# Arrow não reproduz exatamente (ex.: dígitos não ASCII, '1_000', 'inf') volta para a versão de um
+# valor. Sem o pyarrow as colunas são convertidas valor a valor.
+LIMITE_INTEIRO_EXATO = 2 ** 53  # inteiros maiores não cabem exatos no float64 do Arrow
+# `\s` do Python (espaços Unicode); no RE2 do Arrow `\s` é só ASCII
+_ESPACOS_RE2 = r'\t\n\x{0b}\f\r\x{1c}-\x{1f}\x{85}\p{Z}'
+_NUMERO_PRECO_RE2 = r'^[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?$'
+_NUMERO_AREA_RE2 = r'^(?:\d+\.?\d*|\.\d+)$'
+
+
+def parse_price_to_float(preco_val):
+    if preco_val is None: return None
+    s = str(preco_val)
+    s = re.sub(r'[R$\s]', '', s).strip()
+    if ',' in s and '.' in s:
+        if s.rfind(',') > s.rfind('.'):
+            s = s.replace('.', '').replace(',', '.')
+        else:
+            s = s.replace(',', '')
+    elif ',' in s:
+        s = s.replace(',', '.')
+    try:
+        val = float(s)
+        return val if val > 0 else None
+    except ValueError:
+        return None
+
+
+def parse_area_to_float(area_val):
+    if area_val is None: return None
+    s = str(area_val).lower()
+    s = s.replace('m²', '').replace('m2', '').strip()
+    s = re.sub(r'[^\d\.]', '', s.replace(',', '.')).strip()
+    if not s: return None
+    try:
+        val = float(s)
+        return val if val > 0 else None
+    except ValueError:
+        return None
+
+
+def modulos_pyarrow():
+    """(pyarrow, pyarrow.compute), ou (None, None) sem o pacote."""
+    try:
+        import pyarrow
+        import pyarrow.compute
+        return pyarrow, pyarrow.compute
+    except ImportError:
+        return None, None
+
+
+def vetorizacao_disponivel():
+    return modulos_pyarrow()[0] is not None
+
+
+def _e_numero(valor):
+    return isinstance(valor, (int, float)) and not isinstance(valor, bool)
+
+
+def _numero_exato_no_arrow(valor):
+    return isinstance(valor, float) or -LIMITE_INTEIRO_EXATO <= valor <= LIMITE_INTEIRO_EXATO
+
+
+def _area_numerica_como_texto(valor):
+    # str(valor) sem expoente ('1e-05', '1e+16'), nan ou inf: o texto tem os mesmos dígitos do número
+    if isinstance(valor, int):
+        return -LIMITE_INTEIRO_EXATO <= valor <= LIMITE_INTEIRO_EXATO
+    return valor == 0 or 1e-4 <= abs(valor) < 1e16
+
+
+def _converter(valores, e_vetorizavel, numeros, textos, escalar):
+    """
+    Separa a coluna em números e textos convertidos pelo Arrow e o resto (convertido por
+    `escalar`), e junta os resultados na ordem original.
+    """
+    pa, pc = modulos_pyarrow()
+    if pa is None:
+        return [escalar(valor) for valor in valores]
+    resultado = [None] * len(valores)
+    indices_numeros, indices_textos = [], []
+    for indice, valor in enumerate(valores):
+        if _e_numero(valor) and e_vetorizavel(valor):
+            indices_numeros.append(indice)
+        elif isinstance(valor, str):
+            indices_textos.append(indice)
+        elif valor is not None:
+            resultado[indice] = escalar(valor)
+    if indices_numeros:
+        convertidos = numeros(pa, pc, pa.array([valores[i] for i in indices_numeros], type=pa.float64()))
+        for indice, valor in zip(indices_numeros, convertidos.to_pylist()):
+            resultado[indice] = valor
+    if indices_textos:
+        convertidos, validos = textos(pa, pc, pa.array([valores[i] for i in indices_textos], type=pa.string()))
+        for indice, valor, valido in zip(indices_textos, convertidos.to_pylist(), validos.to_pylist()):
+            resultado[indice] = valor if valido else escalar(valores[indice])
+    return resultado
+
+
+def _positivos(pc, numeros):
+    return pc.if_else(pc.fill_null(pc.greater(numeros, 0), False), numeros, None)
+
+
+def _precos_numericos(pa, pc, numeros):
+    return _positivos(pc, numeros)
+
+
+def _precos_textos(pa, pc, textos):
+    s = pc.replace_substring_regex(textos, '[R$' + _ESPACOS_RE2 + ']', '')
+    invertido = pc.utf8_reverse(s)
+    posicao_virgula, posicao_ponto = pc.find_substring(invertido, ','), pc.find_substring(invertido, '.')
+    tem_virgula, tem_ponto = pc.greater_equal(posicao_virgula, 0), pc.greater_equal(posicao_ponto, 0)
+    # No texto invertido, a vírgula mais à direita aparece antes do último ponto
+    virgula_decimal = pc.and_(pc.and_(tem_virgula, tem_ponto), pc.less(posicao_virgula, posicao_ponto))
+    s = pc.case_when(
+        pc.make_struct(virgula_decimal, pc.and_(tem_virgula, tem_ponto), tem_virgula),
+        pc.replace_substring(pc.replace_substring(s, '.', ''), ',', '.'),
+        pc.replace_substring(s, ',', ''),
+        pc.replace_substring(s, ',', '.'),
+        s,
+    )
+    validos = pc.match_substring_regex(s, _NUMERO_PRECO_RE2)
+    numeros = pc.cast(pc.if_else(validos, s, None), pa.float64())
+    return _positivos(pc, numeros), validos
+
+
+def _areas_numericas(pa, pc, numeros):
+    # O texto de um número negativo perde o '-' na limpeza
+    return _positivos(pc, pc.abs(numeros))
+
+
+def _areas_textos(pa, pc, textos):
+    s = pc.replace_substring(pc.replace_substring(pc.utf8_lower(textos), 'm²', ''), 'm2', '')
+    s = pc.replace_substring_regex(pc.replace_substring(s, ',', '.'), r'[^\p{Nd}.]', '')
+    validos = pc.or_(pc.equal(s, ''), pc.match_substring_regex(s, _NUMERO_AREA_RE2))
+    numeros = pc.cast(pc.if_else(pc.match_substring_regex(s, _NUMERO_AREA_RE2), s, None), pa.float64())
+    return _positivos(pc, numeros), validos
+
+
+def precos_para_float(valores):
+    """`parse_price_to_float` de cada valor da lista, de uma vez."""
+    return _converter(valores, _numero_exato_no_arrow, _precos_numericos, _precos_textos, parse_price_to_float)
+
+
+def areas_para_float(valores):
+    """`parse_area_to_float` de cada valor da lista, de uma vez."""
+    return _converter(valores, _area_numerica_como_texto, _areas_numericas, _areas_textos, parse_area_to_float)
+
+
+CASOS_CONVERSAO = [
+    None, 0, -3, 350000, 350000.0, 1e-05, 1e20, 2 ** 60, float('nan'), float('inf'), True, -0.0, 80.5, -80.5,
+    '', ' ', 'R$ 350.000,00', 'R$\xa0350.000', '350,000.50', '1.234.567', '1,5', '12,3,4', 'abc', 'nan', 'inf',
+    '1_000', '١٢٣', '80 m²', '80 M2', '80m2', '1.000 m²', '90,5m²', '2-3', '1e5', '+5', '.5', '5.', '-10',
+    'Sob consulta', '\u2003150\u2009000', '\u3000350', '12\u200b3', [1], {'valor': 1},
+]
+
+
+def _valores_gravados(diretorios):
+    import os
+    from ArmazenamentoNdjson import iterar_registros
+    precos, areas = [], []
+    for diretorio in diretorios:
+        for nome in sorted(os.listdir(diretorio)) if os.path.isdir(diretorio) else []:
+            if nome.endswith(('.json', '.jsonl')):
+                for registro in iterar_registros(os.path.join(diretorio, nome)):
+                    for campo in ('preco', 'venda', 'locacao'):
+                        if campo in registro:
+                            precos.append(registro[campo])
+                    for campo in ('area_m2', 'area'):
+                        if campo in registro:
+                            areas.append(registro[campo])
+    return precos, areas
+
+
+def _mesmos(a, b):
+    return len(a) == len(b) and all(x == y or (x != x and y != y) for x, y in zip(a, b))
+
+
+if __name__ == '__main__':
+    if not vetorizacao_disponivel():
+        sys.exit("pyarrow não instalado (pip install pyarrow): só a conversão valor a valor está disponível.")
+    assert _mesmos(precos_para_float(CASOS_CONVERSAO), [parse_price_to_float(v) for v in CASOS_CONVERSAO])
+    assert _mesmos(areas_para_float(CASOS_CONVERSAO), [parse_area_to_float(v) for v in CASOS_CONVERSAO])
+    diretorios = sys.argv[1:] or ['olx_data', 'zapimoveis_data', 'vivareal_data', 'investt_data', 'facilitaimoveis_data']
+    precos, areas = _valores_gravados(diretorios)
+    for nome, valores, coluna, escalar in (('preço', precos, precos_para_float, parse_price_to_float),
+                                          ('área', areas, areas_para_float, parse_area_to_float)):
+        inicio = time.perf_counter()
+        esperado = [escalar(valor) for valor in valores]
+        tempo_escalar = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        obtido = coluna(valores)
+        tempo_coluna = time.perf_counter() - inicio
+        assert _mesmos(obtido, esperado), nome
+        textos = [str(valor) for valor in valores]
+        inicio = time.perf_counter()
+        esperado = [escalar(valor) for valor in textos]
+        tempo_escalar_texto = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        assert _mesmos(coluna(textos), esperado), nome
+        tempo_coluna_texto = time.perf_counter() - inicio
+        print(f"{nome}: {len(valores)} valores iguais à conversão valor a valor; valor a valor {tempo_escalar * 1000:.1f} ms, "
+              f"coluna {tempo_coluna * 1000:.1f} ms; como texto {tempo_escalar_texto * 1000:.1f} ms -> "
+              f"{tempo_coluna_texto * 1000:.1f} ms.")
+    print("Verificação OK.")
@@ -0,0 +1,160 @@
+import os
+import re
+import sys
+import time
+from datetime import datetime
+from ArmazenamentoNdjson import iterar_registros
+
+# Exportação dos resultados consolidados (resultado/resultados_<categoria>.json) para formatos
+# colunares, para a análise de preços não precisar decodificar JSON:
+#   resultado/parquet/categoria=<categoria>/dados.parquet  -> conjunto Parquet particionado por categoria
+#   resultado/imoveis.arrow                                -> todas as categorias num arquivo Arrow IPC,
+#                                                              lido por memory map sem cópia
+# Os números saem com tipo numérico (preco/area_m2/latitude/longitude float64, quartos/banheiros/vagas
+# int32 com nulos) e first_seen/last_seen como timestamp. Depende do pyarrow (pip install pyarrow),
+# importado só aqui para o restante do pipeline não exigir o pacote.
+DIRETORIO_RESULTADOS = 'resultado'
+DIRETORIO_PARQUET = 'parquet'
+ARQUIVO_ARROW = 'imoveis.arrow'
+PADRAO_ARQUIVO_RESULTADO = re.compile(r'^resultados_(.+)\.json$')
+PADRAO_INTEIRO_INICIAL = re.compile(r'^\s*(\d+)')
+
+
+def _esquema():
+    import pyarrow as pa
+    return pa.schema([
+        ('categoria', pa.string()),
+        ('tipo_imovel', pa.string()),
+        ('finalidade', pa.string()),
+        ('endereco', pa.string()),
+        ('preco', pa.float64()),
+        ('area_m2', pa.float64()),
+        ('quartos', pa.int32()),
+        ('banheiros', pa.int32()),
+        ('vagas', pa.int32()),
+        ('latitude', pa.float64()),
+        ('longitude', pa.float64()),
+        ('link', pa.string()),
+        ('fonte', pa.string()),
+        ('fontes_secundarias', pa.list_(pa.string())),
+        ('first_seen', pa.timestamp('s')),
+        ('last_seen', pa.timestamp('s')),
+    ])
+
+
+def _numero(valor):
+    try:
+        return float(valor) if valor is not None else None
+    except (ValueError, TypeError):
+        return None
+
+
+def _inteiro(valor):
+    """'3' -> 3; '' ou None -> None. Textos como '2 Quartos' ficam com o número inicial."""
+    if isinstance(valor, int):
+        return valor
+    m = PADRAO_INTEIRO_INICIAL.match(valor) if isinstance(valor, str) else None
+    return int(m.group(1)) if m else None
+
+
+def _instante(valor):
+    try:
+        return datetime.fromisoformat(valor) if isinstance(valor, str) and valor else None
+    except ValueError:
+        return None
+
+
+def tabela_da_categoria(categoria, itens):
+    """pyarrow.Table com os anúncios padronizados `itens` da categoria, nas colunas de `_esquema()`."""
+    import pyarrow as pa
+    esquema = _esquema()
+    colunas = {nome: [] for nome in esquema.names}
+    for item in itens:
+        geo = item.get('geolocalizacao') if isinstance(item.get('geolocalizacao'), dict) else {}
+        colunas['categoria'].append(categoria)
+        for nome in ('tipo_imovel', 'finalidade', 'endereco', 'link', 'fonte'):
+            colunas[nome].append(item.get(nome) if isinstance(item.get(nome), str) else None)
+        colunas['preco'].append(_numero(item.get('preco')))
+        colunas['area_m2'].append(_numero(item.get('area_m2')))
+        for nome in ('quartos', 'banheiros', 'vagas'):
+            colunas[nome].append(_inteiro(item.get(nome)))
+        colunas['latitude'].append(_numero(geo.get('latitude')))
+        colunas['longitude'].append(_numero(geo.get('longitude')))
+        colunas['fontes_secundarias'].append(item.get('fontes_secundarias') or None)
+        colunas['first_seen'].append(_instante(item.get('first_seen')))
+        colunas['last_seen'].append(_instante(item.get('last_seen')))
+    return pa.Table.from_pydict(colunas, schema=esquema)
+
+
+def arquivos_resultado(diretorio=DIRETORIO_RESULTADOS):
+    """{categoria: caminho} dos resultados_<categoria>.json do diretório."""
+    encontrados = {}
+    for nome in sorted(os.listdir(diretorio)) if os.path.isdir(diretorio) else []:
+        m = PADRAO_ARQUIVO_RESULTADO.match(nome)
+        if m:
+            encontrados[m.group(1)] = os.path.join(diretorio, nome)
+    return encontrados
+
+
+def exportar(diretorio=DIRETORIO_RESULTADOS):
+    """Grava o conjunto Parquet e o arquivo Arrow a partir dos resultados; retorna {categoria: anúncios}."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    tabelas, totais = [], {}
+    for categoria, caminho in arquivos_resultado(diretorio).items():
+        tabela = tabela_da_categoria(categoria, iterar_registros(caminho))
+        destino = os.path.join(diretorio, DIRETORIO_PARQUET, f'categoria={categoria}')
+        os.makedirs(destino, exist_ok=True)
+        # A categoria já está no nome do diretório (partição no estilo Hive)
+        pq.write_table(tabela.drop_columns(['categoria']), os.path.join(destino, 'dados.parquet'), compression='zstd')
+        tabelas.append(tabela)
+        totais[categoria] = tabela.num_rows
+    if tabelas:
+        caminho_arrow = os.path.join(diretorio, ARQUIVO_ARROW)
+        temporario = f'{caminho_arrow}.tmp-{os.getpid()}'
+        # Sem compressão: é o que permite ler as colunas direto do memory map
+        with pa.OSFile(temporario, 'wb') as arquivo, pa.ipc.new_file(arquivo, _esquema()) as escritor:
+            for tabela in tabelas:
+                escritor.write_table(tabela)
+        os.replace(temporario, caminho_arrow)
+    return totais
+
+
+def abrir_arrow(diretorio=DIRETORIO_RESULTADOS):
+    """Todas as categorias como pyarrow.Table mapeada em memória (sem decodificar nem copiar os dados)."""
+    import pyarrow as pa
+    return pa.ipc.open_file(pa.memory_map(os.path.join(diretorio, ARQUIVO_ARROW), 'r')).read_all()
+
+
+def abrir_parquet(diretorio=DIRETORIO_RESULTADOS, categoria=None):
+    """Conjunto Parquet como pyarrow.Table (a coluna `categoria` vem da partição)."""
+    import pyarrow.dataset as ds
+    conjunto = ds.dataset(os.path.join(diretorio, DIRETORIO_PARQUET), format='parquet', partitioning='hive')
+    return conjunto.to_table(filter=(ds.field('categoria') == categoria) if categoria else None)
+
+
+if __name__ == '__main__':
+    diretorio = sys.argv[1] if len(sys.argv) > 1 else DIRETORIO_RESULTADOS
+    inicio = time.perf_counter()
+    totais = exportar(diretorio)
+    print(f"Exportados {sum(totais.values())} anúncios de {len(totais)} categorias em {time.perf_counter() - inicio:.2f}s: {totais}")
+
+    # Conferência com o JSON e comparação dos tempos de leitura
+    import json
+    inicio = time.perf_counter()
+    por_json = {}
+    for categoria, caminho in arquivos_resultado(diretorio).items():
+        with open(caminho, 'r', encoding='utf-8') as f:
+            por_json[categoria] = json.load(f)
+    tempo_json = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    tabela = abrir_arrow(diretorio)
+    precos = tabela.column('preco')
+    tempo_arrow = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    parquet = abrir_parquet(diretorio)
+    tempo_parquet = time.perf_counter() - inicio
+    assert tabela.num_rows == parquet.num_rows == sum(len(itens) for itens in por_json.values())
+    assert precos.to_pylist() == [_numero(i.get('preco')) for itens in por_json.values() for i in itens]
+    print(f"Leitura: JSON {tempo_json * 1000:.1f} ms, Arrow (memory map) {tempo_arrow * 1000:.1f} ms, "
+          f"Parquet {tempo_parquet * 1000:.1f} ms.")
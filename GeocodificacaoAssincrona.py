@@ -0,0 +1,130 @@
+import time
+import random
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+# Etapa de geocodificação separada do processamento: recebe os endereços ainda sem cache, consulta
+# o serviço com concorrência limitada e um balde de fichas global (no lugar dos sleeps fixos) e
+# grava cada resultado no CacheGeocodificacao assim que ele chega.
+CONCORRENCIA_PADRAO = 4
+REQUISICOES_POR_SEGUNDO_PADRAO = 1.0
+RAJADA_PADRAO = 2
+TENTATIVAS_PADRAO = 3
+ESPERA_BASE_PADRAO = 2.0  # segundos; dobra a cada nova tentativa, com jitter
+INTERVALO_PROGRESSO = 50
+
+
+class BaldeDeFichas:
+    """Limite de taxa global: `taxa` fichas por segundo, acumulando no máximo `capacidade`."""
+
+    def __init__(self, taxa, capacidade):
+        self.taxa = taxa
+        self.capacidade = capacidade
+        self.fichas = capacidade
+        self.ultima_reposicao = time.monotonic()
+        self._trava = asyncio.Lock()
+
+    def _repor(self):
+        agora = time.monotonic()
+        self.fichas = min(self.capacidade, self.fichas + (agora - self.ultima_reposicao) * self.taxa)
+        self.ultima_reposicao = agora
+
+    async def adquirir(self):
+        async with self._trava:
+            self._repor()
+            while self.fichas < 1:
+                await asyncio.sleep((1 - self.fichas) / self.taxa)
+                self._repor()
+            self.fichas -= 1
+
+
+class EstatisticasGeocodificacao:
+    def __init__(self):
+        self.requisicoes = 0
+        self.sucessos = 0
+        self.nao_encontrados = 0
+        self.falhas = 0
+        self.retentativas = 0
+        self.coalescidos = 0  # pedidos repetidos que aproveitaram a consulta já em andamento
+
+    def __str__(self):
+        return (f"{self.requisicoes} requisições, {self.sucessos} sucessos, {self.nao_encontrados} não encontrados, "
+                f"{self.falhas} falhas após {self.retentativas} retentativas, {self.coalescidos} pedidos coalescidos")
+
+
+async def _resolver(chave, endereco, resolver, cache, balde, semaforo, executor, estatisticas,
+                    tentativas, espera_base, registrar_falhas, alerta_requisicoes, resultados, log):
+    loop = asyncio.get_running_loop()
+    lat, lon = None, None
+    async with semaforo:
+        for tentativa in range(1, tentativas + 1):
+            await balde.adquirir()
+            estatisticas.requisicoes += 1
+            if alerta_requisicoes and estatisticas.requisicoes % alerta_requisicoes == 0:
+                log(f"Alerta GEO: {estatisticas.requisicoes} requisições totais de geocodificação feitas. Monitore o uso.")
+            try:
+                lat, lon = await loop.run_in_executor(executor, resolver, endereco)
+                break
+            except Exception as e:
+                log(f"GEO_TRACE: Tentativa {tentativa}/{tentativas} falhou para '{endereco[:50]}...': {type(e).__name__} - {e}")
+                if tentativa == tentativas:
+                    # Falha transitória (timeout, bloqueio, Chrome ausente): não vai para o cache,
+                    # senão o endereço ficaria escondido pelo TTL negativo na próxima execução
+                    estatisticas.falhas += 1
+                    resultados[chave] = (None, None)
+                    return
+                estatisticas.retentativas += 1
+                await asyncio.sleep(espera_base * 2 ** (tentativa - 1) * random.uniform(0.5, 1.5))
+    if lat is not None and lon is not None:
+        estatisticas.sucessos += 1
+        cache.gravar(chave, lat, lon)
+    else:
+        estatisticas.nao_encontrados += 1
+        if registrar_falhas:
+            cache.gravar(chave, None, None)
+    resultados[chave] = (lat, lon)
+
+
+async def _executar(enderecos, resolver, cache, concorrencia, requisicoes_por_segundo, rajada, tentativas,
+                    espera_base, registrar_falhas, alerta_requisicoes, log):
+    balde = BaldeDeFichas(requisicoes_por_segundo, rajada)
+    semaforo = asyncio.Semaphore(concorrencia)
+    estatisticas = EstatisticasGeocodificacao()
+    resultados = {}
+    em_andamento = {}  # chave -> tarefa: cada chave gera uma única consulta
+    with ThreadPoolExecutor(max_workers=concorrencia) as executor:
+        for chave, endereco in enderecos:
+            if chave in em_andamento:
+                estatisticas.coalescidos += 1
+                continue
+            em_andamento[chave] = asyncio.create_task(
+                _resolver(chave, endereco, resolver, cache, balde, semaforo, executor, estatisticas,
+                          tentativas, espera_base, registrar_falhas, alerta_requisicoes, resultados, log))
+        tarefas = list(em_andamento.values())
+        for concluidas, tarefa in enumerate(asyncio.as_completed(tarefas), start=1):
+            await tarefa
+            if concluidas % INTERVALO_PROGRESSO == 0 or concluidas == len(tarefas):
+                log(f"GEO: {concluidas}/{len(tarefas)} endereços resolvidos ({estatisticas}).")
+    return resultados, estatisticas
+
+
+def geocodificar_em_lote(enderecos, resolver, cache, concorrencia=CONCORRENCIA_PADRAO,
+                         requisicoes_por_segundo=REQUISICOES_POR_SEGUNDO_PADRAO, rajada=RAJADA_PADRAO,
+                         tentativas=TENTATIVAS_PADRAO, espera_base=ESPERA_BASE_PADRAO, registrar_falhas=True,
+                         alerta_requisicoes=None, log=print):
+    """
+    Resolve `enderecos` ({chave do cache: endereço para consulta}, ou pares (chave, endereço) que
+    podem se repetir: cada chave é consultada uma vez só) com `resolver(endereco)`, uma
+    função bloqueante que roda em threads e retorna (lat, lon) ou (None, None) quando o endereço
+    não é encontrado; exceções contam como falha transitória e são repetidas com backoff.
+    Só o "não encontrado" é gravado como negativo (se `registrar_falhas`); falhas transitórias
+    esgotadas nunca vão para o cache. Com `alerta_requisicoes`, avisa a cada N requisições feitas.
+    Retorna ({chave: (lat, lon)}, EstatisticasGeocodificacao).
+    """
+    if isinstance(enderecos, dict):
+        enderecos = enderecos.items()
+    enderecos = list(enderecos)
+    if not enderecos:
+        return {}, EstatisticasGeocodificacao()
+    return asyncio.run(_executar(enderecos, resolver, cache, concorrencia, requisicoes_por_segundo, rajada,
+                                 tentativas, espera_base, registrar_falhas, alerta_requisicoes, log))
@@ -0,0 +1,236 @@
+import re
+import sys
+import time
+import unicodedata
+from functools import lru_cache
+
+CIDADES_GRANDE_GOIANIA = [
+    'goiania', 'aparecida de goiania', 'senador canedo', 'trindade',
+    'goianira', 'abadia de goias', 'aragoiania', 'bela vista de goias',
+    'bonfinopolis', 'brazabrantes', 'caldazinha', 'caturai', 'guapo',
+    'hidrolandia', 'inhumas', 'neropolis', 'nova veneza', 'santo antonio de goias',
+    'terezopolis de goias', 'anapolis'
+]
+
+# Frases de título que os portais colam no endereço ("Casa para comprar emSetor Bueno")
+PADRAO_FRASE_ANUNCIO = re.compile(
+    r'\b(?:casa|apartamento|lote/terreno|lote|terreno)\s+para\s+(?:comprar|alugar|vender)\s+em'
+)
+PADRAO_NAO_ALFANUMERICO = re.compile(r'[^a-z0-9]+')
+PADRAO_CIDADE = re.compile(r'\b(?:' + '|'.join(re.escape(c) for c in CIDADES_GRANDE_GOIANIA) + r')\b')
+SUFIXOS_GENERICOS = {'brasil', 'br', 'go', 'goias'}
+
+# Limpeza e normalização de endereços compartilhadas por Processamento e Mapa. Cada função é
+# memorizada por endereço (o mesmo endereço aparece em vários anúncios, fontes e comparações) e
+# usa padrões compilados uma vez: as frases de anúncio viram uma única alternância em vez de
+# quatro re.sub por frase.
+TAMANHO_MEMORIA_ENDERECOS = 1 << 16
+FRASES_LIXO_ENDERECO = [
+    "Casa para comprar em", "Apartamento para comprar em",
+    "Casa para alugar em", "Apartamento para alugar em",
+    "Terreno para comprar em", "Lote para comprar em",
+    "Terreno para vender em", "Lote para vender em"
+]
+_FRASES_LIXO = '(?:' + '|'.join(re.escape(frase) for frase in FRASES_LIXO_ENDERECO) + r')\s*,?\s*'
+PADRAO_FRASE_LIXO_INICIO = re.compile(rf'^\s*(?:{_FRASES_LIXO})+', re.IGNORECASE)
+PADRAO_FRASE_LIXO_MEIO = re.compile(rf',\s*(?:{_FRASES_LIXO})+', re.IGNORECASE)
+PADRAO_VIRGULA = re.compile(r'\s*,\s*')
+PADRAO_VIRGULAS_REPETIDAS = re.compile(r'(,\s*){2,}')
+PADRAO_ESPACOS = re.compile(r'\s+')
+PADRAO_ESPACOS_REPETIDOS = re.compile(r'\s\s+')
+PADRAO_PALAVRAS_IGNORADAS_ENDERECO = re.compile(
+    r'\b(apto|apartamento|casa|nº|numero|num|lote|terreno|edificio|condominio|residencia|bloco|torre)\b\s*[\w\d.-]*',
+    flags=re.IGNORECASE
+)
+
+# (endereço, chave esperada): endereços que precisam cair na mesma chave ou ficar separados
+CASOS_CHAVE_CANONICA = [
+    ("Setor Bueno, Goiânia, GO, Brasil", 'setor bueno goiania'),
+    ("Casa para comprar emSetor Bueno", 'setor bueno goiania'),
+    ("setor bueno", 'setor bueno goiania'),
+    ("Setor Central, Abadia de Goiás", 'setor central abadia de goias'),
+    ("Centro, Bela Vista de Goiás, GO", 'centro bela vista de goias'),
+    ("Centro, Santo Antônio de Goiás", 'centro santo antonio de goias'),
+    ("Centro, Terezópolis de Goiás, Brasil", 'centro terezopolis de goias'),
+    ("Rua 10, Goiânia", 'rua 10 goiania'),
+    ("Rua 10, Goiás", 'rua 10 goias'),
+    ("Rua 10, Goiás, Brasil", 'rua 10 goias'),
+    ("Rua 10, GO", 'rua 10 goiania'),
+    ("Jardim Tiradentes, Aparecida de Goiânia, GO", 'jardim tiradentes aparecida de goiania'),
+]
+
+
+@lru_cache(maxsize=TAMANHO_MEMORIA_ENDERECOS)
+def normalizar_texto(texto):
+    """Sem acentos (e sem outros caracteres fora do ASCII) e em minúsculas."""
+    if not texto: return ''
+    return unicodedata.normalize('NFKD', str(texto)).encode('ASCII', 'ignore').decode('utf-8').lower()
+
+
+@lru_cache(maxsize=TAMANHO_MEMORIA_ENDERECOS)
+def remover_acentos(texto):
+    """Sem os acentos, em minúsculas e sem espaços nas pontas (mantém 'ç' sem cedilha, 'º' etc.)."""
+    if not isinstance(texto, str): return ""
+    return "".join(c for c in unicodedata.normalize('NFD', texto) if not unicodedata.combining(c)).lower().strip()
+
+
+@lru_cache(maxsize=TAMANHO_MEMORIA_ENDERECOS)
+def _limpar_endereco(endereco):
+    endereco_limpo = PADRAO_FRASE_LIXO_INICIO.sub('', endereco).strip()
+    endereco_limpo = PADRAO_FRASE_LIXO_MEIO.sub(',', endereco_limpo)
+    endereco_limpo = PADRAO_VIRGULA.sub(', ', endereco_limpo)
+    endereco_limpo = PADRAO_VIRGULAS_REPETIDAS.sub(', ', endereco_limpo)
+    endereco_limpo = PADRAO_ESPACOS.sub(' ', endereco_limpo.strip(' ,')).strip()
+    if endereco_limpo.startswith(", "): endereco_limpo = endereco_limpo[2:]
+    elif endereco_limpo.startswith(","): endereco_limpo = endereco_limpo[1:]
+    return endereco_limpo
+
+
+def limpar_endereco_para_geocodificacao(endereco_str):
+    """Endereço sem as frases de anúncio ("Casa para comprar em...") e com vírgulas e espaços normalizados."""
+    if not isinstance(endereco_str, str) or not endereco_str.strip():
+        return endereco_str
+    return _limpar_endereco(endereco_str)
+
+
+@lru_cache(maxsize=TAMANHO_MEMORIA_ENDERECOS)
+def endereco_comparavel(endereco):
+    """Endereço normalizado e sem palavras-chave usado na comparação de duplicatas (None se curto demais)."""
+    end_norm = normalizar_texto(endereco)
+    if not end_norm or end_norm == 'none' or len(end_norm) <= 5:
+        return None
+    end_clean = PADRAO_PALAVRAS_IGNORADAS_ENDERECO.sub('', end_norm).strip()
+    end_clean = PADRAO_ESPACOS_REPETIDOS.sub(' ', end_clean.replace(',', ' ')).strip()
+    return end_clean if len(end_clean) > 5 else None
+
+
+@lru_cache(maxsize=TAMANHO_MEMORIA_ENDERECOS)
+def chave_canonica_endereco(endereco):
+    """
+    Chave única de cache para um endereço, usada por Processamento e Mapa.
+    Ignora acentos, caixa, pontuação, frases de anúncio e o sufixo "Goiânia, GO, Brasil" que as
+    duas etapas acrescentam antes de consultar o Google Maps.
+    """
+    if not isinstance(endereco, str): return ''
+    texto = unicodedata.normalize('NFKD', endereco).encode('ASCII', 'ignore').decode('utf-8').lower()
+    texto = PADRAO_FRASE_ANUNCIO.sub(' ', texto)
+    tokens = []
+    for token in PADRAO_NAO_ALFANUMERICO.sub(' ', texto).split():
+        if not tokens or tokens[-1] != token:
+            tokens.append(token)
+    # Estado/país no fim saem, mas "goias" só se ainda sobrar uma cidade: "Abadia de Goiás" perderia
+    # o "goias" e "Rua 10, Goiás" viraria a mesma chave de "Rua 10, Goiânia", com consultas diferentes.
+    while tokens and tokens[-1] in SUFIXOS_GENERICOS and \
+            (tokens[-1] != 'goias' or PADRAO_CIDADE.search(' '.join(tokens[:-1]))):
+        tokens.pop()
+    chave = ' '.join(tokens)
+    # Sem cidade, a consulta ao Google Maps recebe "Goiânia" (a não ser que já cite o estado)
+    if chave and not PADRAO_CIDADE.search(chave) and 'goias' not in tokens:
+        chave = f"{chave} goiania"
+    return chave
+
+def _limpar_endereco_referencia(endereco_str):
+    # Limpeza anterior (quatro re.sub montados por frase), mantida para o benchmark e a verificação
+    if not isinstance(endereco_str, str) or not endereco_str.strip():
+        return endereco_str
+    endereco_limpo = endereco_str
+    for frase_base in FRASES_LIXO_ENDERECO:
+        padrao_inicio_colado = rf"^\s*{re.escape(frase_base)}(?=[a-zA-Z0-9À-ÿ])"
+        endereco_limpo = re.sub(padrao_inicio_colado, "", endereco_limpo, flags=re.IGNORECASE).strip()
+        padrao_inicio_espaco = rf"^\s*{re.escape(frase_base)}\s*,?\s*"
+        endereco_limpo = re.sub(padrao_inicio_espaco, "", endereco_limpo, flags=re.IGNORECASE).strip()
+        padrao_meio_colado = rf",\s*{re.escape(frase_base)}(?=[a-zA-Z0-9À-ÿ])"
+        endereco_limpo = re.sub(padrao_meio_colado, ",", endereco_limpo, flags=re.IGNORECASE)
+        padrao_meio_espaco = rf",\s*{re.escape(frase_base)}\s*,?\s*"
+        endereco_limpo = re.sub(padrao_meio_espaco, ",", endereco_limpo, flags=re.IGNORECASE)
+    endereco_limpo = re.sub(r'\s*,\s*', ', ', endereco_limpo)
+    endereco_limpo = re.sub(r'(,\s*){2,}', ', ', endereco_limpo)
+    endereco_limpo = endereco_limpo.strip(' ,')
+    endereco_limpo = re.sub(r'\s+', ' ', endereco_limpo).strip()
+    if endereco_limpo.startswith(", "): endereco_limpo = endereco_limpo[2:]
+    elif endereco_limpo.startswith(","): endereco_limpo = endereco_limpo[1:]
+    return endereco_limpo
+
+
+def _comparavel_referencia(endereco):
+    end_norm = normalizar_texto.__wrapped__(endereco)
+    if not end_norm or end_norm == 'none' or len(end_norm) <= 5:
+        return None
+    end_clean = PADRAO_PALAVRAS_IGNORADAS_ENDERECO.sub('', end_norm).strip()
+    end_clean = re.sub(r'\s\s+', ' ', end_clean.replace(',', ' ')).strip()
+    return end_clean if len(end_clean) > 5 else None
+
+
+def _limpar_memorias():
+    for funcao in (normalizar_texto, remover_acentos, _limpar_endereco, endereco_comparavel, chave_canonica_endereco):
+        funcao.cache_clear()
+
+
+def enderecos_de_exemplo(diretorio='olx_data'):
+    """Endereços ('localizacao'/'endereco') dos anúncios gravados em `diretorio`, na ordem dos arquivos."""
+    import os
+    from ArmazenamentoNdjson import iterar_registros
+    enderecos = []
+    for nome in sorted(os.listdir(diretorio)):
+        if nome.endswith(('.json', '.jsonl')):
+            for registro in iterar_registros(os.path.join(diretorio, nome)):
+                endereco = registro.get('localizacao') or registro.get('endereco')
+                if isinstance(endereco, str):
+                    enderecos.append(endereco)
+    return enderecos
+
+
+def medir_limpeza(enderecos, repeticoes=5):
+    """
+    Custo por endereço da limpeza + chave do cache + forma de comparação, antes (padrões montados a
+    cada chamada) e depois (padrões compilados e memorização), na primeira passada e nas seguintes
+    (o Processamento volta aos mesmos endereços na comparação de duplicatas). 'compilado' é a
+    versão nova sem a memorização. Confere antes que as duas versões dão o mesmo resultado.
+    """
+    def antes(endereco):
+        limpo = _limpar_endereco_referencia(endereco)
+        return limpo, chave_canonica_endereco.__wrapped__(limpo), _comparavel_referencia(endereco)
+
+    def compilado(endereco):
+        limpo = _limpar_endereco.__wrapped__(endereco) if endereco.strip() else endereco
+        return limpo, chave_canonica_endereco.__wrapped__(limpo), endereco_comparavel.__wrapped__(endereco)
+
+    def depois(endereco):
+        limpo = limpar_endereco_para_geocodificacao(endereco)
+        return limpo, chave_canonica_endereco(limpo), endereco_comparavel(endereco)
+
+    for endereco in enderecos:
+        assert antes(endereco) == depois(endereco), endereco
+    resultados = {}
+    for nome, funcao in (('antes', antes), ('compilado', compilado), ('depois', depois)):
+        _limpar_memorias()
+        tempos = []
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            for endereco in enderecos:
+                funcao(endereco)
+            tempos.append((time.perf_counter() - inicio) / len(enderecos) * 1e6)
+        resultados[nome] = tempos
+    return resultados
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['benchmark']:
+        enderecos = enderecos_de_exemplo(sys.argv[2] if len(sys.argv) > 2 else 'olx_data')
+        if not enderecos:
+            sys.exit("Nenhum endereço encontrado.")
+        resultados = medir_limpeza(enderecos)
+        print(f"{len(enderecos)} endereços ({len(set(enderecos))} distintos), microssegundos por endereço:")
+        for nome, tempos in resultados.items():
+            print(f"  {nome:9} primeira passada {tempos[0]:7.2f}   passadas seguintes {min(tempos[1:]):7.2f}")
+        sys.exit()
+    casos_frase = ["Casa para comprar emSetor Bueno", "  casa PARA alugar em , Setor Oeste, Goiânia ",
+                   "Rua 1, Lote para vender emJardim América,, Goiânia", "Apartamento para comprar em",
+                   "Terreno para comprar em Lote para comprar em Centro", "Setor Bueno ,Goiânia ,  GO"]
+    for endereco in casos_frase:
+        assert limpar_endereco_para_geocodificacao(endereco) == _limpar_endereco_referencia(endereco), endereco
+        assert endereco_comparavel(endereco) == _comparavel_referencia(endereco), endereco
+    for endereco, esperado in CASOS_CHAVE_CANONICA:
+        obtido = chave_canonica_endereco(endereco)
+        assert obtido == esperado, f"{endereco!r}: esperado {esperado!r}, obtido {obtido!r}"
+    print(f"{len(CASOS_CHAVE_CANONICA)} casos de chave_canonica_endereco OK.")
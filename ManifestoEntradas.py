@@ -0,0 +1,95 @@
+import os
+import json
+from ArmazenamentoNdjson import e_ndjson, fim_dos_registros_completos, sha256_prefixo, gravar_json_atomicamente
+
+# Manifestos do processamento incremental (resultado/.incremental/<categoria>/). O de cada arquivo
+# de entrada guarda tamanho, mtime, quantos bytes já foram processados e o SHA-256 desses bytes,
+# além dos contadores do que foi lido. Na execução seguinte cada arquivo é classificado por `comparar`:
+#   'igual'        -> nada a ler (mesmo tamanho e mtime, ou mesmo conteúdo)
+#   'acrescentado' -> JSON Lines que só cresceu (o prefixo já processado tem o mesmo hash):
+#                     lê-se a partir de `bytes`
+#   'refazer'      -> arquivo novo, trocado ou regravado (ex.: compactação): lê-se tudo
+VERSAO_MANIFESTO = 1
+
+
+def impressao_arquivo(caminho):
+    """{'caminho', 'tamanho', 'mtime_ns'} do arquivo; tamanho e mtime None se ele não existir."""
+    try:
+        estado = os.stat(caminho)
+    except FileNotFoundError:
+        return {'caminho': caminho, 'tamanho': None, 'mtime_ns': None}
+    return {'caminho': caminho, 'tamanho': estado.st_size, 'mtime_ns': estado.st_mtime_ns}
+
+
+def comparar(entrada, caminho):
+    """
+    (situação, impressão atual) do arquivo em relação à `entrada` do manifesto (None se não
+    houver). A impressão já traz 'bytes' (até onde há registros completos) e 'sha256' desses bytes,
+    e 'inicio', o byte de onde a leitura deve começar.
+    """
+    atual = impressao_arquivo(caminho)
+    if atual['tamanho'] is None:
+        atual.update(bytes=0, sha256=None, inicio=0)
+        igual = entrada is not None and entrada.get('caminho') == caminho and entrada.get('tamanho') is None
+        return ('igual' if igual else 'refazer'), atual
+    fim = fim_dos_registros_completos(caminho, atual['tamanho']) if e_ndjson(caminho) else atual['tamanho']
+    atual['bytes'] = fim
+    if entrada is None or entrada.get('caminho') != caminho or entrada.get('tamanho') is None:
+        atual.update(sha256=sha256_prefixo(caminho, fim), inicio=0)
+        return 'refazer', atual
+    if (atual['tamanho'], atual['mtime_ns']) == (entrada['tamanho'], entrada['mtime_ns']) and fim == entrada['bytes']:
+        atual.update(sha256=entrada['sha256'], inicio=fim)
+        return 'igual', atual
+    atual['sha256'] = sha256_prefixo(caminho, fim)
+    if fim == entrada['bytes'] and atual['sha256'] == entrada['sha256']:
+        atual['inicio'] = fim
+        return 'igual', atual  # só o mtime mudou (cópia, touch) ou uma linha ainda pela metade
+    if e_ndjson(caminho) and fim > entrada['bytes'] and sha256_prefixo(caminho, entrada['bytes']) == entrada['sha256']:
+        atual['inicio'] = entrada['bytes']
+        return 'acrescentado', atual
+    atual['inicio'] = 0
+    return 'refazer', atual
+
+
+def carregar_manifesto(caminho, versao):
+    """Manifesto gravado em `caminho`, ou None se não existir, estiver ilegível ou for de outra versão."""
+    if not os.path.exists(caminho):
+        return None
+    try:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            manifesto = json.load(f)
+    except (ValueError, IOError) as e:
+        print(f"AVISO: Manifesto '{caminho}' ilegível ({e}); será refeito.", flush=True)
+        return None
+    if manifesto.get('formato') != VERSAO_MANIFESTO or manifesto.get('versao') != versao:
+        return None
+    return manifesto
+
+
+def gravar_manifesto(caminho, manifesto):
+    gravar_json_atomicamente(caminho, dict(manifesto, formato=VERSAO_MANIFESTO))
+
+
+if __name__ == '__main__':
+    # Verificação das situações: igual, acrescentado, igual só com mtime novo, refazer depois de regravado
+    import tempfile
+    from ArmazenamentoNdjson import GravadorNdjson, gravar_atomicamente
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, 'casas_compra.jsonl')
+        gravar_atomicamente(caminho, [{'link': f'id-{i}'} for i in range(3)])
+        situacao, entrada = comparar(None, caminho)
+        assert situacao == 'refazer' and entrada['inicio'] == 0
+        assert comparar(entrada, caminho)[0] == 'igual'
+        gravador = GravadorNdjson(caminho)
+        gravador.acrescentar([{'link': 'id-3'}])
+        gravador.fechar()
+        situacao, atual = comparar(entrada, caminho)
+        assert situacao == 'acrescentado' and atual['inicio'] == entrada['bytes'] < atual['bytes']
+        os.utime(caminho, ns=(0, 0))
+        assert comparar(atual, caminho)[0] == 'igual'
+        gravar_atomicamente(caminho, [{'link': f'id-{i}'} for i in range(5, 0, -1)])  # ex.: compactação
+        assert comparar(atual, caminho)[0] == 'refazer'
+        manifesto = os.path.join(diretorio, 'casas_compra.manifesto.json')
+        gravar_manifesto(manifesto, dict(atual, versao=1))
+        assert carregar_manifesto(manifesto, 1)['sha256'] == atual['sha256'] and carregar_manifesto(manifesto, 2) is None
+    print("Verificação OK.")
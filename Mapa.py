@@ -16,7 +16,13 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import re
-import unicodedata
+from CacheGeocodificacao import CacheGeocodificacao, ARQUIVO_CACHE_GEO
+from LimpezaEndereco import chave_canonica_endereco, remover_acentos
+from PoolNavegadores import PoolNavegadores
+from RecursosNavegador import aplicar_perfil
+from GeocodificacaoAssincrona import geocodificar_em_lote
+from ArmazenamentoNdjson import iterar_registros
+from BancoImoveis import BancoImoveis, ARQUIVO_BANCO_IMOVEIS, extrair_bairro
 
 logging.basicConfig(
     level=logging.INFO,
@@ -38,8 +44,9 @@ CIDADES_GRANDE_GOIANIA = [
     'terezopolis de goias', 'anapolis'
 ]
 CACHE_FILE = "geocode_cache.json"
-BATCH_SIZE = 10
-BATCH_PAUSE = 3
+# Etapa de geocodificação (GeocodificacaoAssincrona) no lugar das pausas fixas por lote
+GEO_CONCORRENCIA = 2
+GEO_REQUISICOES_POR_SEGUNDO = 0.5
 
 OUTPUT_DIR_NAME = "mapas_imoveis_gerados"
 JSON_FILES_TO_PROCESS = [
@@ -51,9 +58,7 @@ JSON_FILES_TO_PROCESS = [
 ]
 
 def normalize_string(text):
-    if not isinstance(text, str): return ""
-    nfkd_form = unicodedata.normalize('NFD', text)
-    return "".join([c for c in nfkd_form if not unicodedata.combining(c)]).lower().strip()
+    return remover_acentos(text)  # memorizada em LimpezaEndereco
 
 def esta_na_regiao(lat, lon, regiao):
     try:
@@ -64,7 +69,7 @@ def esta_na_regiao(lat, lon, regiao):
 
 def verifica_cidade_grande_goiania(endereco):
     endereco_normalizado = normalize_string(endereco)
-    return any(normalize_string(cidade) in endereco_normalizado for cidade in CIDADES_GRANDE_GOIANIA)
+    return any(cidade in endereco_normalizado for cidade in CIDADES_GRANDE_GOIANIA)  # já normalizadas
 
 def limpar_endereco_para_busca(address):
     if not isinstance(address, str): return ""
@@ -111,6 +116,7 @@ def inicializar_driver():
         service = Service(ChromeDriverManager().install())
         driver = webdriver.Chrome(service=service, options=chrome_options)
         logger.info("WebDriver inicializado com webdriver-manager.")
+        aplicar_perfil(driver, 'geocodificacao')
         return driver
     except Exception as e_manager:
         logger.warning(f"Falha ao usar webdriver-manager ({e_manager}). Tentando caminho manual...")
@@ -125,12 +131,13 @@ def inicializar_driver():
                  service = Service()
             driver = webdriver.Chrome(service=service, options=chrome_options)
             logger.info(f"WebDriver inicializado. Executable: {service.path}")
+            aplicar_perfil(driver, 'geocodificacao')
             return driver
         except Exception as e_manual:
             logger.error(f"Falha ao inicializar o WebDriver manualmente ou pelo PATH: {e_manual}")
             raise RuntimeError("Não foi possível inicializar o WebDriver.") from e_manual
 
-def selenium_geocode(address, driver):
+def selenium_geocode(address, driver, propagar_erros=False):
     if not address or not isinstance(address, str):
         logger.warning("Endereço inválido para geocodificação.")
         return None, None, address
@@ -144,10 +151,15 @@ def selenium_geocode(address, driver):
         search_box = WebDriverWait(driver, 15).until(
             EC.element_to_be_clickable((By.ID, "searchboxinput"))
         )
+        # A página inicial já tem um '@lat,lon' (viewport padrão ou restaurado da busca anterior)
+        viewport_inicial = re.search(r'@-?\d+\.\d+,-?\d+\.\d+', driver.current_url)
+        viewport_inicial = viewport_inicial.group(0) if viewport_inicial else None
         search_box.clear()
         search_box.send_keys(search_query)
         search_box.send_keys(Keys.ENTER)
-        WebDriverWait(driver, 10).until(EC.url_contains("@"))
+        WebDriverWait(driver, 10).until(
+            lambda d: (re.search(r'@-?\d+\.\d+,-?\d+\.\d+', d.current_url) or [None])[0] not in (None, viewport_inicial)
+        )
         current_url = driver.current_url
         logger.debug(f"URL após busca: {current_url}")
         match = re.search(r'@(-?\d+\.\d+),(-?\d+\.\d+),(\d+)', current_url)
@@ -160,54 +172,56 @@ def selenium_geocode(address, driver):
             return None, None, search_query
     except (TimeoutException, NoSuchElementException) as e:
         logger.error(f"Erro de Selenium (Timeout/Não encontrado) ao geocodificar '{search_query}': {e}")
+        if propagar_erros: raise
         return None, None, search_query
     except Exception as e:
         logger.error(f"Erro inesperado durante geocodificação de '{search_query}': {str(e)}")
+        if propagar_erros: raise
         return None, None, search_query
 
+def geocodificar_com_pool(address, pool_navegadores):
+    """Resolver para `geocodificar_em_lote`: usa uma sessão do pool e propaga falhas transitórias."""
+    driver = pool_navegadores.emprestar()
+    erro_sessao = False
+    try:
+        lat, lon, _ = selenium_geocode(address, driver, propagar_erros=True)
+        return lat, lon
+    except (TimeoutException, NoSuchElementException):
+        raise
+    except Exception:
+        erro_sessao = True
+        raise
+    finally:
+        pool_navegadores.devolver(driver, erro=erro_sessao)
+
 
 def carregar_cache():
-    if os.path.exists(CACHE_FILE):
-        try:
-            with open(CACHE_FILE, 'r', encoding='utf-8') as f: cache = json.load(f)
-            logger.info(f"Cache carregado de '{CACHE_FILE}' com {len(cache)} entradas.")
-            return cache
-        except Exception as e: logger.error(f"Erro ao carregar cache: {e}")
-    logger.info(f"Arquivo de cache '{CACHE_FILE}' não encontrado ou erro. Criando novo cache.")
-    return {}
+    cache = CacheGeocodificacao(ARQUIVO_CACHE_GEO, origem='mapa')
+    importadas = cache.importar_cache_json(CACHE_FILE)
+    if importadas:
+        logger.info(f"Migradas {importadas} entradas de '{CACHE_FILE}' para '{ARQUIVO_CACHE_GEO}'.")
+    logger.info(f"Cache de geocodificação '{ARQUIVO_CACHE_GEO}' aberto com {len(cache)} entradas.")
+    return cache
 
 def salvar_cache(cache):
-    if not isinstance(cache, dict):
-        logger.error("Tentativa de salvar cache que não é um dicionário.")
+    if not isinstance(cache, CacheGeocodificacao):
+        logger.error("Tentativa de salvar cache que não é um CacheGeocodificacao.")
         return
-    logger.debug(f"Salvando cache com {len(cache)} entradas.")
-    try:
-        with open(CACHE_FILE, 'w', encoding='utf-8') as f:
-            json.dump(cache, f, ensure_ascii=False, indent=2)
-        logger.info(f"Cache salvo em '{CACHE_FILE}' com {len(cache)} entradas.")
-    except Exception as e: logger.error(f"Erro ao salvar cache: {e}")
+    # As entradas já são gravadas uma a uma no SQLite; aqui só encerramos a conexão.
+    cache.fechar()
+    logger.info(f"Cache de geocodificação '{ARQUIVO_CACHE_GEO}' fechado.")
 
 def verificar_cache(endereco, cache):
-    if not endereco or not isinstance(endereco, str) or not cache: return False, None, None
-    endereco_normalizado = normalize_string(endereco)
-    endereco_limpo = limpar_endereco_para_busca(endereco)
-    for key in [endereco_normalizado, endereco_limpo, endereco]:
-        if key in cache:
-            coords = cache[key]
-            try:
-                lat, lon = float(coords['lat']), float(coords['lon'])
-                logger.info(f"Cache hit para '{key}': ({lat}, {lon})")
-                return True, lat, lon
-            except (ValueError, TypeError, KeyError): continue
+    if not endereco or not isinstance(endereco, str) or cache is None: return False, None, None
+    chave = chave_canonica_endereco(endereco)
+    if not chave: return False, None, None
+    encontrado, (lat, lon) = cache.obter(chave)
+    # Falhas gravadas pelo Processamento (None, None) não impedem uma nova tentativa aqui
+    if encontrado and lat is not None and lon is not None:
+        logger.info(f"Cache hit para '{chave}': ({lat}, {lon})")
+        return True, lat, lon
     return False, None, None
 
-def atualizar_cache(endereco, lat, lon, cache):
-    if not endereco or lat is None or lon is None or not isinstance(cache, dict): return
-    try: lat_float, lon_float = float(lat), float(lon)
-    except (ValueError, TypeError): return
-    endereco_normalizado = normalize_string(endereco)
-    cache[endereco_normalizado] = {"lat": lat_float, "lon": lon_float}
-
 def ajustar_nomes_campos(item_dict):
     if not isinstance(item_dict, dict): return {}
     item = item_dict.copy()
@@ -253,26 +267,6 @@ def formatar_valor(valor):
     except (ValueError, TypeError): return str(valor)
 
 
-def extrair_bairro(item):
-    campos_tentar = ['bairro', 'localizacao', 'logradouro', 'endereco']
-    cidades_remover = ['goiania', 'aparecida de goiania', 'goias', 'go', 'brasil', 'anapolis']
-    for campo in campos_tentar:
-        valor_campo = item.get(campo)
-        if valor_campo and isinstance(valor_campo, str):
-            partes = [p.strip() for p in valor_campo.split(',') if p.strip()]
-            if not partes: continue
-            for parte_cand in partes:
-                norm_parte = normalize_string(parte_cand)
-                if norm_parte and norm_parte not in cidades_remover and not parte_cand.isdigit() and len(parte_cand) > 2:
-                    return parte_cand.title()
-            if len(partes) == 1 and normalize_string(partes[0]) not in cidades_remover: return partes[0].title()
-            if len(partes) > 1:
-                 if normalize_string(partes[-1]) in cidades_remover and normalize_string(partes[-2]) not in cidades_remover:
-                     return partes[-2].title()
-                 if normalize_string(partes[0]) not in cidades_remover:
-                     return partes[0].title()
-    return "Sem Bairro Definido"
-
 def criar_legenda_html(faixas_preco_config):
     items_legenda = []
     for nome_faixa, info in faixas_preco_config.items():
@@ -589,7 +583,38 @@ def criar_barra_filtro_html_e_js(faixas_preco_config, todos_imoveis_data_json_st
     return full_html_content
 
 # --- Função Principal de Processamento por Arquivo ---
-def processar_json_e_criar_mapa(json_file_name, base_input_dir, output_dir, geocode_cache_global, driver_instance, regio_goiania_coords, faixas_preco_config):
+def resolver_coordenadas(dados, cache, pool_navegadores):
+    """
+    Coordenadas de todos os endereços sem coordenadas existentes, por chave canônica: primeiro o
+    cache, depois uma geocodificação em lote (concorrência e taxa limitadas) para as faltas.
+    Retorna {chave: (lat, lon, "Cache" | "Geocodificado")}.
+    """
+    coordenadas, pendentes = {}, {}
+    for item_original in dados:
+        item = ajustar_nomes_campos(item_original)
+        endereco = item.get('endereco')
+        if not endereco or not isinstance(endereco, str) or usar_coordenadas_existentes(item)[0]: continue
+        chave = chave_canonica_endereco(endereco)
+        if not chave or chave in coordenadas or chave in pendentes: continue
+        cache_hit, lat_c, lon_c = verificar_cache(endereco, cache)
+        if cache_hit:
+            coordenadas[chave] = (lat_c, lon_c, "Cache")
+        else:
+            pendentes[chave] = endereco
+    if pendentes and pool_navegadores:
+        logger.info(f"Geocodificando {len(pendentes)} endereços fora do cache...")
+        resultados, estatisticas = geocodificar_em_lote(
+            pendentes, lambda endereco: geocodificar_com_pool(endereco, pool_navegadores), cache,
+            concorrencia=GEO_CONCORRENCIA, requisicoes_por_segundo=GEO_REQUISICOES_POR_SEGUNDO,
+            registrar_falhas=False, log=logger.info
+        )
+        logger.info(f"Geocodificação em lote: {estatisticas}.")
+        for chave, (lat, lon) in resultados.items():
+            if lat is not None and lon is not None:
+                coordenadas[chave] = (lat, lon, "Geocodificado")
+    return coordenadas
+
+def processar_json_e_criar_mapa(json_file_name, base_input_dir, output_dir, geocode_cache_global, pool_navegadores, regio_goiania_coords, faixas_preco_config, banco=None):
     logger.info(f"=== Iniciando processamento para: {json_file_name} ===")
     json_path = os.path.join(base_input_dir, json_file_name)
     map_name_base = os.path.splitext(json_file_name)[0]
@@ -598,58 +623,35 @@ def processar_json_e_criar_mapa(json_file_name, base_input_dir, output_dir, geoc
     failed_addresses_log_path = os.path.join(output_dir, f"falhas_geocodificacao_{map_name_base}.txt")
     not_mapped_log_path = os.path.join(output_dir, f"nao_mapeados_fora_regiao_{map_name_base}.txt")
 
-    # ... (resto do seu código de carregamento e correção de JSON) ...
-    if not os.path.exists(json_path):
-        logger.error(f"Arquivo JSON de entrada não encontrado: {json_path}. Pulando.")
-        return None
-
-    dados = None
-    file_content_debug = "" 
-    try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            file_content = f.read().strip()
-        
-        file_content_debug = file_content 
-        corrected_content = file_content
-        original_content_for_comparison = file_content 
-
-        is_single_object = corrected_content.startswith('{') and corrected_content.endswith('}')
-        
-        if not corrected_content.startswith('[') and not is_single_object and \
-           ('},{' in corrected_content or re.search(r'\}\s*,\s*,\s*\{', corrected_content)): 
-            corrected_content = f"[{corrected_content}]"
-            logger.warning(f"Conteúdo de '{json_path}' não parecia ser uma lista JSON formal nem um objeto único. Tentando envolver em colchetes.")
-
-        pattern_multiple_commas = r'(?<=[}\]])\s*,(?:\s*,)+\s*(?=[{\[])'
-        if re.search(pattern_multiple_commas, corrected_content):
-            corrected_content = re.sub(pattern_multiple_commas, ',', corrected_content)
-            logger.info(f"Tentativa de correção de múltiplas vírgulas entre elementos JSON em '{json_path}'.")
-        
-        if corrected_content != original_content_for_comparison:
-            logger.info(f"Conteúdo de '{json_path}' foi modificado pelas rotinas de correção antes do parseamento.")
-            file_content_debug = corrected_content 
+    # Com a base consolidada do Processamento, a categoria vem de uma consulta por índice (já com as
+    # coordenadas gravadas por execuções anteriores do Mapa); sem ela, do resultados_<categoria>.json.
+    categoria = map_name_base.replace("resultados_", "", 1)
+    total_itens = banco.total(categoria) if banco is not None else 0
+    if total_itens:
+        logger.info(f"Dados da base '{banco.caminho}' (categoria '{categoria}'). Total de {total_itens} itens.")
+        def dados():
+            return banco.consultar(categoria=categoria)
+    else:
+        banco = None
+        if not os.path.exists(json_path):
+            logger.error(f"Arquivo JSON de entrada não encontrado: {json_path}. Pulando.")
+            return None
 
-        dados = json.loads(corrected_content)
+        # Os itens são lidos do arquivo um a um (duas passadas: coordenadas e mapa), sem carregar o
+        # JSON inteiro. A leitura aceita também um objeto único e objetos soltos separados por vírgulas
+        # (inclusive repetidas), que antes eram corrigidos com expressões regulares sobre o texto todo.
+        def dados():
+            return iterar_registros(json_path)
 
-        if isinstance(dados, dict):
-            logger.warning(f"Conteúdo de {json_path} resultou em um único objeto JSON. Envolvendo em lista.")
-            dados = [dados]
-        elif not isinstance(dados, list):
-            logger.error(f"Conteúdo de {json_path} não é uma lista JSON nem um objeto JSON. Tipo: {type(dados)}. Pulando.")
+        try:
+            total_itens = sum(1 for _ in dados())
+            logger.info(f"Dados de '{json_path}'. Total de {total_itens} itens.")
+        except json.JSONDecodeError as e:
+            logger.error(f"Erro de decodificação JSON em '{json_path}': {e}")
+            return None
+        except Exception as e: 
+            logger.error(f"Erro inesperado ao carregar ou pré-processar JSON de '{json_path}': {e}")
             return None
-        
-        logger.info(f"Dados carregados de '{json_path}'. Total de {len(dados)} itens.")
-        
-    except json.JSONDecodeError as e:
-        logger.error(f"Erro de decodificação JSON em '{json_path}': {e}")
-        snippet_start = max(0, e.pos - 30)
-        snippet_end = min(len(file_content_debug), e.pos + 30)
-        problematic_snippet = file_content_debug[snippet_start:snippet_end]
-        logger.debug(f"Posição do erro: {e.pos}. Trecho problemático:\n>>>\n{problematic_snippet}\n<<<")
-        return None
-    except Exception as e: 
-        logger.error(f"Erro inesperado ao carregar ou pré-processar JSON de '{json_path}': {e}")
-        return None
 
     mapa_folium = criar_mapa_centralizado()
     grupos_bairro_map = {} # Para FeatureGroups e MarkerClusters por bairro
@@ -662,14 +664,14 @@ def processar_json_e_criar_mapa(json_file_name, base_input_dir, output_dir, geoc
     failed_items_fallback_list_map = []
     not_mapped_items_list_map = []
 
-    for i, item_original in enumerate(dados, start=1):
-        if i > 1 and (i - 1) % BATCH_SIZE == 0:
-            logger.info(f"Processados {i-1}/{len(dados)} para {map_name_base}. Pausando {BATCH_PAUSE}s...")
-            time.sleep(BATCH_PAUSE)
-            if (i - 1) % (BATCH_SIZE * 5) == 0: salvar_cache(geocode_cache_global)
+    coordenadas_por_chave = resolver_coordenadas(dados(), geocode_cache_global, pool_navegadores)
+    if banco is not None:
+        gravadas = banco.gravar_coordenadas(categoria, {chave: (lat, lon) for chave, (lat, lon, _) in coordenadas_por_chave.items()})
+        logger.info(f"Coordenadas gravadas na base para {gravadas} anúncios de '{categoria}'.")
 
+    for i, item_original in enumerate(dados(), start=1):
         item = ajustar_nomes_campos(item_original)
-        # logger.info(f"--- Processando item {i}/{len(dados)} (mapa: {map_name_base}) ---") # Log muito verboso
+        # logger.info(f"--- Processando item {i}/{total_itens} (mapa: {map_name_base}) ---") # Log muito verboso
         endereco = item.get('endereco')
 
         if not endereco or not isinstance(endereco, str):
@@ -686,19 +688,13 @@ def processar_json_e_criar_mapa(json_file_name, base_input_dir, output_dir, geoc
             lat, lon, source_coord = lat_ex, lon_ex, "Existente"
             existing_coords_map += 1
         else:
-            cache_hit, lat_c, lon_c = verificar_cache(endereco, geocode_cache_global)
-            if cache_hit:
+            lat_c, lon_c, origem_c = coordenadas_por_chave.get(chave_canonica_endereco(endereco), (None, None, None))
+            if origem_c == "Cache":
                 lat, lon, source_coord = lat_c, lon_c, "Cache"
                 cache_hit_map += 1
-            elif driver_instance:
-                # logger.info(f"Item {i}: Tentando geocodificação online...") # Log verboso
-                lat_geo, lon_geo, _ = selenium_geocode(endereco, driver_instance)
-                if lat_geo is not None and lon_geo is not None:
-                    lat, lon, source_coord = lat_geo, lon_geo, "Geocodificado"
-                    geocoded_map +=1
-                    atualizar_cache(endereco, lat, lon, geocode_cache_global)
-                # else: logger.warning(f"Item {i}: Falha na geocodificação online para '{endereco}'.")
-            # else: logger.warning(f"Item {i}: Driver não disponível e cache miss.")
+            elif origem_c == "Geocodificado":
+                lat, lon, source_coord = lat_c, lon_c, "Geocodificado"
+                geocoded_map +=1
         
         if lat is None or lon is None:
             lat_fallback, lon_fallback = coordenadas_centro_goiania()
@@ -841,7 +837,7 @@ def processar_json_e_criar_mapa(json_file_name, base_input_dir, output_dir, geoc
     # O total de mapeados agora será determinado pelo JS no carregamento inicial dos filtros
     total_mapeados_inicialmente = len(imoveis_para_js) 
     logger.info(f"--- Resumo para {map_name_base} ---")
-    logger.info(f"Total de itens JSON: {len(dados) if dados else 0}, Itens válidos para mapa (com coords): {total_mapeados_inicialmente}, Pulados (sem endereço): {skipped_map}")
+    logger.info(f"Total de itens JSON: {total_itens}, Itens válidos para mapa (com coords): {total_mapeados_inicialmente}, Pulados (sem endereço): {skipped_map}")
     logger.info(f"Coords: Exist: {existing_coords_map}, Cache: {cache_hit_map}, Geocod: {geocoded_map}, Fallback Efetivo: {default_coords_map}")
     logger.info(f"Não Mapeados (Fora Região ou falha geocod): {not_mapped_outside_map}")
     
@@ -893,14 +889,16 @@ if __name__ == '__main__':
     logger.info(f"Diretório de saída: '{os.path.abspath(OUTPUT_DIR_NAME)}'")
 
     geocode_cache_main = carregar_cache()
-    driver_main = None
+    pool_navegadores_main = PoolNavegadores(inicializar_driver, tamanho=GEO_CONCORRENCIA)
     try:
-        logger.info("Tentando inicializar WebDriver global...")
-        driver_main = inicializar_driver()
+        logger.info("Tentando inicializar WebDriver...")
+        pool_navegadores_main.devolver(pool_navegadores_main.emprestar())
     except RuntimeError as e:
-        logger.warning(f"WebDriver global não inicializado: {e}. Geocodificação online dependerá do cache.")
+        logger.warning(f"WebDriver não inicializado: {e}. Geocodificação online dependerá do cache.")
+        pool_navegadores_main = None
     except Exception as e_geral:
         logger.error(f"Erro inesperado ao inicializar WebDriver: {e_geral}")
+        pool_navegadores_main = None
     
     script_dir = os.path.dirname(os.path.abspath(__file__))
     base_input_dir_main = os.path.join(script_dir, "resultado") 
@@ -921,6 +919,7 @@ if __name__ == '__main__':
     }
 
     maps_generated_infos_list = []
+    banco_imoveis_main = BancoImoveis(ARQUIVO_BANCO_IMOVEIS)
 
     for json_file_item in JSON_FILES_TO_PROCESS:
         map_gen_info = processar_json_e_criar_mapa(
@@ -928,14 +927,15 @@ if __name__ == '__main__':
             base_input_dir_main,
             OUTPUT_DIR_NAME,
             geocode_cache_main,
-            driver_main,
+            pool_navegadores_main,
             REGIAO_GOIANIA,
-            FAIXAS_PRECO_GLOBAL_CONFIG 
+            FAIXAS_PRECO_GLOBAL_CONFIG,
+            banco_imoveis_main
         )
         if map_gen_info:
             maps_generated_infos_list.append(map_gen_info)
-        logger.info(f"Pausa de {BATCH_PAUSE // 2}s entre processamento de arquivos JSON...") 
-        time.sleep(BATCH_PAUSE // 2 if BATCH_PAUSE > 1 else 1)
+
+    banco_imoveis_main.fechar()
 
     if maps_generated_infos_list:
         index_html_main_path = os.path.join(OUTPUT_DIR_NAME, "index.html")
@@ -943,12 +943,14 @@ if __name__ == '__main__':
     else:
         logger.warning("Nenhum mapa foi gerado. Arquivo de índice não criado.")
 
-    if driver_main:
-        try:
-            driver_main.quit()
-            logger.info("WebDriver global fechado.")
-        except Exception as e: logger.error(f"Erro ao fechar WebDriver global: {e}")
+    if pool_navegadores_main:
+        pool_navegadores_main.encerrar()
+        logger.info(f"Pool de navegadores encerrado: {pool_navegadores_main.sessoes_criadas} sessões criadas.")
 
+    economizadas = geocode_cache_main.acertos_por_origem['processamento']
+    logger.info(f"Cache de geocodificação: {geocode_cache_main.acertos} acertos, {geocode_cache_main.faltas} faltas, "
+                f"{geocode_cache_main.acertos_negativos} falhas antigas ignoradas (consultadas de novo). "
+                f"{economizadas} geocodificações online evitadas com coordenadas gravadas pelo Processamento.")
     salvar_cache(geocode_cache_main)
     logger.info("--- FIM DA EXECUÇÃO DE TODOS OS ARQUIVOS ---")
     print(f"\nProcessamento concluído. Verifique a pasta '{OUTPUT_DIR_NAME}'.")
\ No newline at end of file
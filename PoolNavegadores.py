@@ -0,0 +1,157 @@
+import threading
+
+# Pool de sessões do WebDriver reaproveitadas entre geocodificações. Abrir um Chrome novo custa
+# mais do que a própria consulta ao Google Maps, então cada processo mantém sessões vivas e só
+# as recria depois de MAX_USOS_PADRAO consultas, de um erro do WebDriver ou de uma falha na
+# verificação de saúde.
+TAMANHO_POOL_PADRAO = 1
+MAX_USOS_PADRAO = 200
+
+
+class PoolNavegadores:
+    def __init__(self, fabrica_driver, tamanho=TAMANHO_POOL_PADRAO, max_usos=MAX_USOS_PADRAO):
+        self.fabrica_driver = fabrica_driver
+        self.tamanho = tamanho
+        self.max_usos = max_usos
+        self.livres = []
+        self.usos = {}  # id(driver) -> consultas feitas pela sessão
+        self.emprestados = 0
+        self.sessoes_criadas = 0
+        self.sessoes_recicladas = 0
+        self._condicao = threading.Condition()
+        self._encerrado = False
+
+    def _saudavel(self, driver):
+        try:
+            driver.current_url
+            return bool(driver.window_handles)
+        except Exception:
+            return False
+
+    def _fechar(self, driver):
+        with self._condicao:
+            self.usos.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def emprestar(self):
+        """Retorna uma sessão saudável, criando uma nova se houver vaga no pool."""
+        while True:
+            with self._condicao:
+                while not self.livres and self.emprestados >= self.tamanho and not self._encerrado:
+                    self._condicao.wait()
+                if self._encerrado:
+                    raise RuntimeError("Pool de navegadores já foi encerrado.")
+                # A vaga é reservada antes de soltar a trava; a verificação de saúde (chamadas ao
+                # WebDriver que podem travar) acontece fora dela.
+                self.emprestados += 1
+                driver = self.livres.pop() if self.livres else None
+            if driver is None:
+                break
+            if self._saudavel(driver):
+                return driver
+            self._fechar(driver)
+            with self._condicao:
+                self.emprestados -= 1
+                self.sessoes_recicladas += 1
+                self._condicao.notify()
+        try:
+            driver = self.fabrica_driver()
+        except Exception:
+            with self._condicao:
+                self.emprestados -= 1
+                self._condicao.notify()
+            raise
+        with self._condicao:
+            self.usos[id(driver)] = 0
+            self.sessoes_criadas += 1
+        return driver
+
+    def devolver(self, driver, erro=False):
+        """Devolve a sessão ao pool; com `erro=True` ou após `max_usos` consultas ela é descartada."""
+        with self._condicao:
+            self.emprestados -= 1
+            self.usos[id(driver)] = self.usos.get(id(driver), 0) + 1
+            descartar = erro or self._encerrado or self.usos[id(driver)] >= self.max_usos
+            if descartar:
+                self.sessoes_recicladas += 1
+                self.usos.pop(id(driver), None)
+            else:
+                self.livres.append(driver)
+            self._condicao.notify()
+        if descartar:
+            self._fechar(driver)
+
+    def reciclar_livres(self):
+        """Fecha as sessões ociosas (ex.: marcadas por um portal que bloqueou); as próximas são criadas de novo."""
+        with self._condicao:
+            livres, self.livres = self.livres, []
+            self.sessoes_recicladas += len(livres)
+        for driver in livres:
+            self._fechar(driver)
+
+    def encerrar(self):
+        with self._condicao:
+            self._encerrado = True
+            livres, self.livres = self.livres, []
+            self._condicao.notify_all()
+        for driver in livres:
+            self._fechar(driver)
+
+
+if __name__ == '__main__':
+    # Verificação sintética com um driver falso: abrir o navegador custa CUSTO_ABERTURA e cada
+    # consulta CUSTO_CONSULTA, como um Chrome headless típico (~2 s para abrir, ~0,4 s por página).
+    import time
+    CUSTO_ABERTURA, CUSTO_CONSULTA, CONSULTAS = 0.2, 0.04, 30
+
+    class DriverFalso:
+        def __init__(self):
+            time.sleep(CUSTO_ABERTURA)
+            self.fechado = False
+            self.current_url = 'about:blank'
+
+        @property
+        def window_handles(self):
+            return [] if self.fechado else ['janela']
+
+        def get(self, url):
+            time.sleep(CUSTO_CONSULTA)
+
+        def quit(self):
+            self.fechado = True
+
+    pool = PoolNavegadores(DriverFalso, tamanho=1, max_usos=10)
+    for i in range(CONSULTAS):
+        driver = pool.emprestar()
+        driver.get('https://www.google.com/maps')
+        pool.devolver(driver, erro=(i == 14))
+    assert pool.sessoes_criadas == 4, pool.sessoes_criadas  # recicla em 10, 15 (erro) e 25 consultas
+    assert pool.sessoes_recicladas == 3, pool.sessoes_recicladas
+    driver = pool.emprestar()
+    driver.quit()  # sessão morta: a verificação de saúde deve descartá-la
+    pool.devolver(driver)
+    driver_novo = pool.emprestar()
+    assert driver_novo is not driver and pool.sessoes_criadas == 5
+    pool.devolver(driver_novo)
+    pool.encerrar()
+    assert driver_novo.fechado and not pool.livres
+
+    inicio = time.perf_counter()
+    for _ in range(CONSULTAS):
+        driver = DriverFalso()
+        driver.get('https://www.google.com/maps')
+        driver.quit()
+    tempo_sem_pool = time.perf_counter() - inicio
+    pool = PoolNavegadores(DriverFalso, tamanho=1)
+    inicio = time.perf_counter()
+    for _ in range(CONSULTAS):
+        driver = pool.emprestar()
+        driver.get('https://www.google.com/maps')
+        pool.devolver(driver)
+    tempo_com_pool = time.perf_counter() - inicio
+    pool.encerrar()
+    print(f"{CONSULTAS} consultas: {tempo_sem_pool:.2f}s abrindo um navegador por consulta, "
+          f"{tempo_com_pool:.2f}s com o pool ({tempo_sem_pool / tempo_com_pool:.1f}x).")
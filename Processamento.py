@@ -1,8 +1,10 @@
 import os
+import sys
 import json
 import time
 import re
-import unicodedata
+import math
+import itertools
 import subprocess
 import urllib.parse
 from selenium import webdriver
@@ -11,8 +13,18 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, WebDriverException
-from multiprocessing import Pool, Manager, Value
+from selenium.common.exceptions import TimeoutException
+from multiprocessing import Pool
+from CacheGeocodificacao import CacheGeocodificacao, ARQUIVO_CACHE_GEO, ARQUIVO_CACHE_JSON_LEGADO
+from ConversaoValores import parse_price_to_float, parse_area_to_float, precos_para_float, areas_para_float, modulos_pyarrow
+from LimpezaEndereco import chave_canonica_endereco, limpar_endereco_para_geocodificacao, normalizar_texto, endereco_comparavel
+from PoolNavegadores import PoolNavegadores
+from RecursosNavegador import aplicar_perfil
+from GeocodificacaoAssincrona import geocodificar_em_lote, EstatisticasGeocodificacao
+from ArmazenamentoNdjson import iterar_registros, resolver_caminho, e_ndjson, iterar_linhas_desde, GravadorNdjson
+from ManifestoEntradas import comparar, impressao_arquivo, carregar_manifesto, gravar_manifesto
+from BancoImoveis import BancoImoveis, ARQUIVO_BANCO_IMOVEIS
+from ExportacaoColunar import exportar as exportar_colunar
 
 # Diretórios de entrada para cada fonte
 INPUT_DIRS = {
@@ -50,178 +62,126 @@ CATEGORY_FILE_PATTERNS = {
 OUTPUT_DIR = 'resultado'
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-# Globais do Worker
-worker_geocoding_cache = None
-worker_geocoding_request_count = None
-worker_counter_access_lock = None 
-worker_max_geocoding_requests_warning = 100
-
-def init_worker_globals(shared_cache, shared_counter, shared_counter_lock_arg, max_warning):
-    global worker_geocoding_cache, worker_geocoding_request_count, worker_counter_access_lock, worker_max_geocoding_requests_warning
-    worker_geocoding_cache = shared_cache
-    worker_geocoding_request_count = shared_counter
-    worker_counter_access_lock = shared_counter_lock_arg
-    worker_max_geocoding_requests_warning = max_warning
-
-def limpar_endereco_para_geocodificacao(endereco_str):
-    if not isinstance(endereco_str, str) or not endereco_str.strip():
-        return endereco_str
-    frases_lixo_base = [
-        "Casa para comprar em", "Apartamento para comprar em",
-        "Casa para alugar em", "Apartamento para alugar em",
-        "Terreno para comprar em", "Lote para comprar em",
-        "Terreno para vender em", "Lote para vender em"
-    ]
-    endereco_limpo = endereco_str
-    for frase_base in frases_lixo_base:
-        padrao_inicio_colado = rf"^\s*{re.escape(frase_base)}(?=[a-zA-Z0-9À-ÿ])"
-        endereco_limpo = re.sub(padrao_inicio_colado, "", endereco_limpo, flags=re.IGNORECASE).strip()
-        padrao_inicio_espaco = rf"^\s*{re.escape(frase_base)}\s*,?\s*"
-        endereco_limpo = re.sub(padrao_inicio_espaco, "", endereco_limpo, flags=re.IGNORECASE).strip()
-        padrao_meio_colado = rf",\s*{re.escape(frase_base)}(?=[a-zA-Z0-9À-ÿ])"
-        endereco_limpo = re.sub(padrao_meio_colado, ",", endereco_limpo, flags=re.IGNORECASE)
-        padrao_meio_espaco = rf",\s*{re.escape(frase_base)}\s*,?\s*"
-        endereco_limpo = re.sub(padrao_meio_espaco, ",", endereco_limpo, flags=re.IGNORECASE)
-    endereco_limpo = re.sub(r'\s*,\s*', ', ', endereco_limpo)
-    endereco_limpo = re.sub(r'(,\s*){2,}', ', ', endereco_limpo)
-    endereco_limpo = endereco_limpo.strip(' ,')
-    endereco_limpo = re.sub(r'\s+', ' ', endereco_limpo).strip()
-    if endereco_limpo.startswith(", "): endereco_limpo = endereco_limpo[2:]
-    elif endereco_limpo.startswith(","): endereco_limpo = endereco_limpo[1:]
-    return endereco_limpo
+# Processamento incremental: itens padronizados de cada arquivo de entrada ficam em
+# resultado/.incremental/<categoria>/<posição>_<fonte>.jsonl, com o manifesto do que já foi lido do
+# arquivo em <posição>_<fonte>.manifesto.json (ver ManifestoEntradas); manifesto.json registra de que
+# versão das entradas saiu o resultado da categoria. Uma nova execução só padroniza os registros novos ou alterados e refaz a
+# combinação a partir desses arquivos, com o mesmo resultado de um processamento completo
+# (python Processamento.py --completo). Mude VERSAO_PADRONIZACAO ao alterar a padronização ou os
+# filtros: os itens guardados com a versão anterior são refeitos.
+DIRETORIO_INCREMENTAL = '.incremental'
+VERSAO_PADRONIZACAO = 2
+ITENS_POR_LOTE_PADRONIZACAO = 2000  # itens lidos, padronizados e gravados de uma vez
+
+# Etapa de geocodificação (processo principal, antes dos workers)
+GEO_CONCORRENCIA = 4
+GEO_REQUISICOES_POR_SEGUNDO = 1.0
+GEO_TENTATIVAS = 3
+GEO_ALERTA_REQUISICOES = 50
+
+# Globais do Worker: coordenadas resolvidas pela etapa de geocodificação ({chave do cache: (lat, lon)})
+worker_coordenadas = {}
+
+def criar_driver_geocodificacao():
+    options = Options()
+    options.add_argument('--headless')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--log-level=3')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/113.0.0.0 Safari/537.36")
+    options.add_experimental_option('excludeSwitches', ['enable-logging'])
+    service = Service(log_output=os.devnull)
+    driver = webdriver.Chrome(options=options, service=service)
+    driver.set_page_load_timeout(30)
+    aplicar_perfil(driver, 'geocodificacao')  # só a URL final importa: sem blocos do mapa nem imagens
+    return driver
 
-def load_json_safe(filepath):
+def iterar_json_seguro(filepath):
+    """
+    Percorre os anúncios de `filepath` sem carregar o arquivo inteiro quando ele é JSON Lines. Um
+    caminho '.json' é lido do '.jsonl' ao lado quando a raspagem já gravou nesse formato.
+    """
+    caminho = resolver_caminho(filepath)
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            return data if isinstance(data, list) else []
+        yield from iterar_registros(caminho)
     except FileNotFoundError:
         print(f"AVISO: Arquivo não encontrado: '{filepath}'", flush=True)
-        return []
     except json.JSONDecodeError:
-        print(f"AVISO: Erro ao decodificar JSON em '{filepath}'. Arquivo pode estar corrompido.", flush=True)
-        return []
+        print(f"AVISO: Erro ao decodificar JSON em '{caminho}'. Arquivo pode estar corrompido.", flush=True)
     except Exception as e:
-        print(f"AVISO: Erro inesperado ao carregar '{filepath}': {e}", flush=True)
-        return []
+        print(f"AVISO: Erro inesperado ao carregar '{caminho}': {e}", flush=True)
+
+def load_json_safe(filepath):
+    return list(iterar_json_seguro(filepath))
 
-def normalizar_texto(texto):
-    if not texto: return ''
-    texto = str(texto)
-    texto = unicodedata.normalize('NFKD', texto)
-    return texto.encode('ASCII', 'ignore').decode('utf-8').lower()
+def preparar_endereco_geocodificacao(endereco):
+    """Retorna (endereço limpo para consulta, chave do cache) ou (None, None) se não houver endereço."""
+    if not isinstance(endereco, str) or not endereco.strip(): return None, None
+    endereco_limpo = limpar_endereco_para_geocodificacao(endereco)
+    if not endereco_limpo: return None, None
+    return endereco_limpo, chave_canonica_endereco(endereco_limpo)
 
-def geocodificar(endereco):
+PADRAO_COORDENADAS_URL = re.compile(r'@(-?\d+\.\d+),(-?\d+\.\d+)')
+
+def limpar_sessao_google_maps(driver):
     """
-    Geocodifica um endereço usando a nova lógica de scraping de URL do Google Maps.
+    Prepara uma sessão reaproveitada para uma nova busca: apaga cookies e storage do Google Maps
+    (onde fica o último viewport) e volta para about:blank. Retorna o trecho '@lat,lon' deixado
+    pela consulta anterior, ou None.
+    """
+    url_anterior = driver.current_url
+    viewport_anterior = PADRAO_COORDENADAS_URL.search(url_anterior)
+    if url_anterior.startswith('https://www.google.com/'):
+        driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+    driver.delete_all_cookies()
+    driver.get('about:blank')
+    return viewport_anterior[0] if viewport_anterior else None
+
+def consultar_google_maps(endereco, pool_navegadores):
+    """
+    Geocodifica um endereço limpo usando a lógica de scraping de URL do Google Maps.
+    Retorna (None, None) se as coordenadas não aparecerem na URL; erros do WebDriver são
+    propagados para que a etapa de geocodificação repita a consulta.
     """
-    global worker_geocoding_cache, worker_geocoding_request_count, worker_max_geocoding_requests_warning
-    
-    endereco_original_para_log = None
-    if isinstance(endereco, str):
-        endereco_original_para_log = endereco[:150]
-        endereco_limpo = limpar_endereco_para_geocodificacao(endereco)
-        if endereco_limpo != endereco and endereco_limpo:
-             print(f"Geo: Endereço original: '{endereco_original_para_log[:70]}...', Limpo: '{endereco_limpo[:70]}...'")
-        endereco = endereco_limpo
-    
-    if not endereco: return None, None
-    
-    if endereco in worker_geocoding_cache:
-        print(f"GEO_TRACE: Cache hit for: '{endereco[:70]}...'")
-        return worker_geocoding_cache[endereco]
-
     txt = normalizar_texto(endereco)
     endereco_formatado = f"{endereco}, Goiânia, GO, Brasil" if 'goiania' not in txt and 'goias' not in txt else endereco
-    
-    with worker_counter_access_lock:
-        worker_geocoding_request_count.value += 1
-        current_req_count = worker_geocoding_request_count.value
-    
-    if current_req_count > 0 and current_req_count % worker_max_geocoding_requests_warning == 0:
-        print(f"Alerta GEO: {current_req_count} requisições totais de geocodificação feitas. Monitore o uso.")
-
-    options = Options()
-    options.add_argument('--headless')
-    options.add_argument('--disable-gpu')
-    options.add_argument('--log-level=3')
-    options.add_argument('--no-sandbox')
-    options.add_argument('--disable-dev-shm-usage')
-    options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/113.0.0.0 Safari/537.36")
-    options.add_experimental_option('excludeSwitches', ['enable-logging'])
-    
-    service = Service(log_output=os.devnull)
-    driver = None
-    
+    print(f"GEO_TRACE: Geocodificando com Google Maps: '{endereco_formatado[:70]}...'")
+    driver = pool_navegadores.emprestar()
+    erro_sessao = False
     try:
-        print(f"GEO_TRACE: Geocodificando com Google Maps: '{endereco_formatado[:70]}...'")
-        driver = webdriver.Chrome(options=options, service=service)
-        
-        # Lógica de geocodificação via Google Maps URL Scraping
+        viewport_anterior = limpar_sessao_google_maps(driver)
         encoded_address = urllib.parse.quote(endereco_formatado)
         search_url = f"https://www.google.com/maps/search/?api=1&query={encoded_address}"
-        
         driver.get(search_url)
-        # Aumenta o timeout e espera que a URL contenha as coordenadas
-        WebDriverWait(driver, 20).until(EC.url_contains("@"))
-        
-        current_url = driver.current_url
-        match = re.search(r'@(-?\d+\.\d+),(-?\d+\.\d+)', current_url)
-        
+        # Espera coordenadas desta busca, não o viewport restaurado da consulta anterior da sessão
+        WebDriverWait(driver, 20).until(
+            lambda d: (PADRAO_COORDENADAS_URL.search(d.current_url) or [None])[0] not in (None, viewport_anterior)
+        )
+        match = PADRAO_COORDENADAS_URL.search(driver.current_url)
         if match:
             lat, lon = float(match.group(1)), float(match.group(2))
-            worker_geocoding_cache[endereco] = (lat, lon)
             print(f"GEO_TRACE: Sucesso (Google Maps): '{endereco_formatado[:50]}...' -> ({lat}, {lon})")
             return lat, lon
-        else:
-             print(f"GEO_TRACE: Coordenadas não encontradas na URL final para '{endereco_formatado[:50]}...'.")
-
+        print(f"GEO_TRACE: Coordenadas não encontradas na URL final para '{endereco_formatado[:50]}...'.")
+        return None, None
     except TimeoutException:
-        print(f"GEO_TRACE: Timeout (Google Maps) para '{endereco_formatado[:50]}...'")
-    except WebDriverException as e:
-        print(f"GEO_TRACE: Erro WebDriver (Google Maps) para '{endereco_formatado[:50]}...': {type(e).__name__} - {e}")
-    except Exception as e:
-        print(f"GEO_TRACE: Erro inesperado ao geocodificar '{endereco_formatado[:50]}...': {type(e).__name__} - {e}")
+        raise
+    except Exception:
+        erro_sessao = True
+        raise
     finally:
-        if driver:
-            driver.quit()
-        # Delay para evitar sobrecarregar o serviço
-        time.sleep(1.5)
-    
-    worker_geocoding_cache[endereco] = (None, None)
-    return None, None
-
+        pool_navegadores.devolver(driver, erro=erro_sessao)
 
-def parse_price_to_float(preco_val):
-    if preco_val is None: return None
-    s = str(preco_val)
-    s = re.sub(r'[R$\s]', '', s).strip()
-    if ',' in s and '.' in s: 
-        if s.rfind(',') > s.rfind('.'): 
-            s = s.replace('.', '').replace(',', '.')
-        else: 
-            s = s.replace(',', '')
-    elif ',' in s: 
-        s = s.replace(',', '.')
-    try:
-        val = float(s)
-        return val if val > 0 else None
-    except ValueError:
-        return None
+def geocodificar(endereco):
+    """Coordenadas do endereço já resolvidas por `geocodificar_enderecos_pendentes` (sem acesso à rede)."""
+    endereco_limpo, chave_cache = preparar_endereco_geocodificacao(endereco)
+    if not chave_cache: return None, None
+    return worker_coordenadas.get(chave_cache, (None, None))
 
-def parse_area_to_float(area_val):
-    if area_val is None: return None
-    s = str(area_val).lower()
-    s = s.replace('m²', '').replace('m2', '').strip()
-    s = re.sub(r'[^\d\.]', '', s.replace(',', '.')).strip()
-    if not s: return None
-    try:
-        val = float(s)
-        return val if val > 0 else None
-    except ValueError:
-        return None
 
-def extract_standardized_data(item, source):
+def extrair_campos_brutos(item, source):
+    """(tipo_imovel, preco, finalidade, area_m2, quartos, banheiros, vagas, endereco, link) como vêm da fonte."""
     tipo_imovel, preco, finalidade, area_m2, quartos, banheiros, vagas, endereco, link = [None] * 9
     
     titulo_str = str(item.get('titulo', ''))
@@ -279,22 +239,28 @@ def extract_standardized_data(item, source):
         area_m2 = item.get('area_m2')
         quartos = item.get('quartos'); banheiros = item.get('banheiros')
         vagas = item.get('vagas'); endereco = item.get('endereco'); link = item.get('link')
-    
-    preco_float = parse_price_to_float(preco)
-    area_m2_float = parse_area_to_float(area_m2)
-    
-    lat, lon = geocodificar(endereco) if endereco and isinstance(endereco, str) and endereco.strip() else (None, None)
-    geolocalizacao = {"latitude": lat, "longitude": lon} if lat is not None and lon is not None else None
-    
+    return tipo_imovel, preco, finalidade, area_m2, quartos, banheiros, vagas, endereco, link
+
+def montar_item_padronizado(campos, preco_float, area_m2_float, geolocalizacao, item, source):
+    tipo_imovel, _, finalidade, _, quartos, banheiros, vagas, endereco, link = campos
     return {
         "tipo_imovel": tipo_imovel, "finalidade": finalidade, "endereco": endereco, 
         "preco": preco_float, "area_m2": area_m2_float, 
         "quartos": str(quartos) if quartos is not None else None, 
         "banheiros": str(banheiros) if banheiros is not None else None,
         "vagas": str(vagas) if vagas is not None else None, 
-        "link": link, "geolocalizacao": geolocalizacao, "fonte": source
+        "link": link, "geolocalizacao": geolocalizacao, "fonte": source,
+        "first_seen": item.get('first_seen'), "last_seen": item.get('last_seen')
     }
 
+def extract_standardized_data(item, source):
+    campos = extrair_campos_brutos(item, source)
+    endereco = campos[7]
+    lat, lon = geocodificar(endereco) if endereco and isinstance(endereco, str) and endereco.strip() else (None, None)
+    geolocalizacao = {"latitude": lat, "longitude": lon} if lat is not None and lon is not None else None
+    return montar_item_padronizado(campos, parse_price_to_float(campos[1]), parse_area_to_float(campos[3]),
+                                   geolocalizacao, item, source)
+
 def e_preco_similar(preco1, preco2, tolerancia=0.05):
     if preco1 is None or preco2 is None: return False
     p1, p2 = preco1, preco2
@@ -309,52 +275,82 @@ def e_area_similar(area1, area2, tolerancia=0.05):
     if a1 == 0 or a2 == 0: return False
     return abs(a1 - a2) / max(a1, a2) <= tolerancia
 
-def e_mesmo_local(item1, item2, distancia_maxima_graus=0.001): 
-    geo1, geo2 = item1.get('geolocalizacao'), item2.get('geolocalizacao')
-    if geo1 and geo2 and geo1.get('latitude') is not None and geo1.get('longitude') is not None \
-       and geo2.get('latitude') is not None and geo2.get('longitude') is not None:
+def coordenadas_para_comparacao(item):
+    geo = item.get('geolocalizacao')
+    if geo and geo.get('latitude') is not None and geo.get('longitude') is not None:
         try:
-            lat1, lon1 = float(geo1['latitude']), float(geo1['longitude'])
-            lat2, lon2 = float(geo2['latitude']), float(geo2['longitude'])
-            if abs(lat1 - lat2) <= distancia_maxima_graus and abs(lon1 - lon2) <= distancia_maxima_graus:
-                return True
+            return float(geo['latitude']), float(geo['longitude'])
         except (ValueError, TypeError): pass
-    
-    end1_norm = normalizar_texto(str(item1.get('endereco') or ''))
-    end2_norm = normalizar_texto(str(item2.get('endereco') or ''))
-    
-    if end1_norm and end2_norm and end1_norm != 'none' and end2_norm != 'none' and len(end1_norm) > 5 and len(end2_norm) > 5 :
-        end1_clean = re.sub(r'\b(apto|apartamento|casa|nº|numero|num|lote|terreno|edificio|condominio|residencia|bloco|torre)\b\s*[\w\d.-]*', '', end1_norm, flags=re.IGNORECASE).strip()
-        end2_clean = re.sub(r'\b(apto|apartamento|casa|nº|numero|num|lote|terreno|edificio|condominio|residencia|bloco|torre)\b\s*[\w\d.-]*', '', end2_norm, flags=re.IGNORECASE).strip()
-        end1_clean = re.sub(r'\s\s+', ' ', end1_clean.replace(',', ' ')).strip()
-        end2_clean = re.sub(r'\s\s+', ' ', end2_clean.replace(',', ' ')).strip()
-        if len(end1_clean) > 5 and len(end2_clean) > 5 :
-            return end1_clean in end2_clean or end2_clean in end1_clean
+    return None
+
+def endereco_para_comparacao(item):
+    """Endereço normalizado e sem palavras-chave usado na comparação por texto (None se curto demais)."""
+    return endereco_comparavel(str(item.get('endereco') or ''))
+
+def quartos_para_comparacao(quartos_str):
+    if quartos_str is None or not quartos_str.strip(): return None
+    try:
+        return int(re.sub(r'\D', '', quartos_str))
+    except ValueError:
+        return None
+
+class RegistroComparacao:
+    """
+    Campos de um anúncio padronizado usados na busca de duplicatas, calculados uma vez por anúncio
+    (endereço já normalizado, quartos como inteiro, coordenadas como floats) em vez de a cada par
+    comparado. `quartos` é None para terrenos, que não comparam quartos.
+    """
+    __slots__ = ('tipo_imovel', 'finalidade', 'endereco', 'quartos', 'coordenadas', 'preco', 'area_m2')
+
+    def __init__(self, tipo_imovel, finalidade, endereco, quartos, coordenadas, preco, area_m2):
+        self.tipo_imovel = tipo_imovel
+        self.finalidade = finalidade
+        self.endereco = endereco
+        self.quartos = quartos
+        self.coordenadas = coordenadas
+        self.preco = preco
+        self.area_m2 = area_m2
+
+def chave_comparacao(item):
+    """[endereço para comparação, quartos] do item: a parte cara do RegistroComparacao, guardada na padronização."""
+    quartos = quartos_para_comparacao(item.get('quartos')) if item.get('tipo_imovel') != 'Terreno' else None
+    return [endereco_para_comparacao(item), quartos]
+
+def registro_comparacao(item, chave=None):
+    endereco, quartos = chave if chave is not None else chave_comparacao(item)
+    return RegistroComparacao(item.get('tipo_imovel'), item.get('finalidade'), endereco, quartos,
+                              coordenadas_para_comparacao(item), item.get('preco'), item.get('area_m2'))
+
+def e_mesmo_local_registros(r1, r2, distancia_maxima_graus=0.001):
+    if r1.coordenadas and r2.coordenadas:
+        lat1, lon1 = r1.coordenadas
+        lat2, lon2 = r2.coordenadas
+        if abs(lat1 - lat2) <= distancia_maxima_graus and abs(lon1 - lon2) <= distancia_maxima_graus:
+            return True
+    if r1.endereco and r2.endereco:
+        return r1.endereco in r2.endereco or r2.endereco in r1.endereco
     return False
 
-def sao_imoveis_duplicados(item1, item2):
-    if item1.get('tipo_imovel') != item2.get('tipo_imovel') or \
-       item1.get('finalidade') != item2.get('finalidade'):
+def sao_registros_duplicados(r1, r2):
+    if r1.tipo_imovel != r2.tipo_imovel or r1.finalidade != r2.finalidade:
         return False
-    if not e_mesmo_local(item1, item2):
+    if not e_mesmo_local_registros(r1, r2):
         return False
-    if item1.get('tipo_imovel') != 'Terreno':
-        q1_str, q2_str = item1.get('quartos'), item2.get('quartos')
-        if q1_str is not None and q2_str is not None and q1_str.strip() and q2_str.strip():
-            try:
-                q1_int = int(re.sub(r'\D', '', q1_str))
-                q2_int = int(re.sub(r'\D', '', q2_str))
-                if q1_int != q2_int: return False
-            except ValueError: pass
-    preco_similar = e_preco_similar(item1.get('preco'), item2.get('preco'))
-    area_similar = e_area_similar(item1.get('area_m2'), item2.get('area_m2'))
-    preco_presente_ambos = item1.get('preco') is not None and item2.get('preco') is not None
-    area_presente_ambos = item1.get('area_m2') is not None and item2.get('area_m2') is not None
-    if preco_presente_ambos and area_presente_ambos: return preco_similar and area_similar
-    elif preco_presente_ambos: return preco_similar
-    elif area_presente_ambos: return area_similar
+    if r1.quartos is not None and r2.quartos is not None and r1.quartos != r2.quartos: return False
+    preco_presente_ambos = r1.preco is not None and r2.preco is not None
+    area_presente_ambos = r1.area_m2 is not None and r2.area_m2 is not None
+    if preco_presente_ambos and area_presente_ambos:
+        return e_preco_similar(r1.preco, r2.preco) and e_area_similar(r1.area_m2, r2.area_m2)
+    elif preco_presente_ambos: return e_preco_similar(r1.preco, r2.preco)
+    elif area_presente_ambos: return e_area_similar(r1.area_m2, r2.area_m2)
     else: return True
 
+def e_mesmo_local(item1, item2, distancia_maxima_graus=0.001):
+    return e_mesmo_local_registros(registro_comparacao(item1), registro_comparacao(item2), distancia_maxima_graus)
+
+def sao_imoveis_duplicados(item1, item2):
+    return sao_registros_duplicados(registro_comparacao(item1), registro_comparacao(item2))
+
 def tem_mais_informacoes(item_novo, item_existente):
     campos_gerais = ['preco', 'area_m2', 'endereco', 'link']
     campos_residenciais = ['quartos', 'banheiros', 'vagas']
@@ -380,75 +376,321 @@ def tem_mais_informacoes(item_novo, item_existente):
         return False 
     return count_novo > count_existente
 
-def processar_categoria_worker(categoria, arquivos_lista_nomes_param, input_dirs_param, output_dir_param):
+class IndiceDuplicatas:
+    """
+    Índice de blocagem para a busca de duplicatas em `combinados`.
+
+    Os candidatos são separados por (tipo_imovel, finalidade, quartos) e, dentro de cada bloco,
+    indexados por célula de uma grade lat/lon e por n-gramas do endereço normalizado. Assim cada
+    item novo só é comparado com quem pode satisfazer `e_mesmo_local` (coordenadas próximas ou um
+    endereço contido no outro), em vez de percorrer a lista inteira.
+    """
+    TAMANHO_NGRAMA = 6  # endereços com 5 caracteres ou menos nunca são comparados por texto
+
+    def __init__(self, distancia_maxima_graus=0.001):
+        # Célula com o dobro da tolerância: as 8 vizinhas cobrem qualquer par dentro da distância,
+        # mesmo com arredondamento de ponto flutuante.
+        self.tamanho_celula = distancia_maxima_graus * 2
+        self.blocos = {}
+        self.chaves_por_indice = {}
+
+    def _chave_bloco(self, registro):
+        return (registro.tipo_imovel, registro.finalidade, registro.quartos)
+
+    def _celula(self, coords):
+        return (math.floor(coords[0] / self.tamanho_celula), math.floor(coords[1] / self.tamanho_celula))
+
+    def _ngramas(self, texto):
+        n = self.TAMANHO_NGRAMA
+        return {texto[i:i + n] for i in range(len(texto) - n + 1)}
+
+    def _blocos_compativeis(self, chave):
+        tipo, finalidade, quartos = chave
+        if quartos is not None:
+            chaves = [(tipo, finalidade, quartos), (tipo, finalidade, None)]
+            return [self.blocos[c] for c in chaves if c in self.blocos]
+        # Sem quartos conhecidos o item é compatível com qualquer quantidade de quartos
+        return [b for c, b in self.blocos.items() if c[0] == tipo and c[1] == finalidade]
+
+    def adicionar(self, indice, registro):
+        chave = self._chave_bloco(registro)
+        bloco = self.blocos.setdefault(chave, {
+            'grade': {}, 'enderecos': {}, 'ngramas': {}, 'prefixos': set(), 'sufixos': set(),
+        })
+        celula = self._celula(registro.coordenadas) if registro.coordenadas else None
+        endereco = registro.endereco
+        if celula is not None:
+            bloco['grade'].setdefault(celula, set()).add(indice)
+        if endereco:
+            bloco['enderecos'].setdefault(endereco, set()).add(indice)
+            for ngrama in self._ngramas(endereco):
+                bloco['ngramas'].setdefault(ngrama, set()).add(indice)
+            bloco['prefixos'].add(endereco[:self.TAMANHO_NGRAMA])
+            bloco['sufixos'].add(endereco[-self.TAMANHO_NGRAMA:])
+        self.chaves_por_indice[indice] = (chave, celula, endereco)
+
+    def remover(self, indice):
+        chave, celula, endereco = self.chaves_por_indice.pop(indice)
+        bloco = self.blocos[chave]
+        if celula is not None:
+            bloco['grade'][celula].discard(indice)
+        if endereco:
+            bloco['enderecos'][endereco].discard(indice)
+            for ngrama in self._ngramas(endereco):
+                bloco['ngramas'][ngrama].discard(indice)
+            # prefixos/sufixos são só um pré-filtro; entradas antigas apenas geram buscas extras
+
+    def candidatos(self, registro):
+        """Índices (em ordem crescente) que podem ser duplicatas do RegistroComparacao `registro`."""
+        encontrados = set()
+        celula = self._celula(registro.coordenadas) if registro.coordenadas else None
+        endereco = registro.endereco
+        n = self.TAMANHO_NGRAMA
+        for bloco in self._blocos_compativeis(self._chave_bloco(registro)):
+            if celula is not None:
+                for d_lat in (-1, 0, 1):
+                    for d_lon in (-1, 0, 1):
+                        encontrados.update(bloco['grade'].get((celula[0] + d_lat, celula[1] + d_lon), ()))
+            if not endereco:
+                continue
+            # Endereço novo contido em um existente: todo n-grama do novo aparece no existente,
+            # então basta a lista do n-grama mais raro.
+            listas = [bloco['ngramas'].get(ngrama, ()) for ngrama in self._ngramas(endereco)]
+            encontrados.update(min(listas, key=len))
+            # Endereço existente contido no novo: testa as substrings do novo que começam e
+            # terminam com um prefixo/sufixo de algum endereço existente.
+            inicios = [i for i in range(len(endereco) - n + 1) if endereco[i:i + n] in bloco['prefixos']]
+            if not inicios:
+                continue
+            fins = [j for j in range(n, len(endereco) + 1) if endereco[j - n:j] in bloco['sufixos']]
+            for i in inicios:
+                for j in fins:
+                    if j - i >= n:
+                        encontrados.update(bloco['enderecos'].get(endereco[i:j], ()))
+        return sorted(encontrados)
+
+def aplicar_categoria(item_padronizado, categoria):
+    if 'venda' in categoria or 'compra' in categoria: item_padronizado['finalidade'] = 'Venda'
+    elif 'aluguel' in categoria or 'locacao' in categoria: item_padronizado['finalidade'] = 'Aluguel'
+    if 'casa' in categoria: item_padronizado['tipo_imovel'] = 'Casa'
+    elif 'apartamento' in categoria: item_padronizado['tipo_imovel'] = 'Apartamento'
+    elif 'terreno' in categoria: item_padronizado['tipo_imovel'] = 'Terreno'
+
+def passa_filtro_preco_area(item_padronizado):
+    if item_padronizado['tipo_imovel'] == 'Terreno' and item_padronizado['finalidade'] == 'Venda':
+        preco_terreno_float = item_padronizado.get('preco')
+        if preco_terreno_float is not None and preco_terreno_float > 150000: return False
+    if item_padronizado['tipo_imovel'] == 'Casa':
+        area_casa_float = item_padronizado.get('area_m2')
+        if area_casa_float is not None and not (90 <= area_casa_float <= 110): return False
+    return True
+
+def mascara_filtro_preco_area(tipos, finalidades, precos, areas):
+    """`passa_filtro_preco_area` de cada linha, calculado por coluna com o pyarrow quando disponível."""
+    terreno_venda = [tipo == 'Terreno' and finalidade == 'Venda' for tipo, finalidade in zip(tipos, finalidades)]
+    casa = [tipo == 'Casa' for tipo in tipos]
+    pa, pc = modulos_pyarrow()
+    if pa is None:
+        return [passa_filtro_preco_area({'tipo_imovel': t, 'finalidade': f, 'preco': p, 'area_m2': a})
+                for t, f, p, a in zip(tipos, finalidades, precos, areas)]
+    preco, area = pa.array(precos, type=pa.float64()), pa.array(areas, type=pa.float64())
+    preco_alto = pc.and_(pa.array(terreno_venda), pc.fill_null(pc.greater(preco, 150000), False))
+    area_fora = pc.and_(pa.array(casa), pc.fill_null(pc.invert(pc.and_(pc.greater_equal(area, 90), pc.less_equal(area, 110))), False))
+    return pc.invert(pc.or_(preco_alto, area_fora)).to_pylist()
+
+def padronizar_lote(itens_originais, source, categoria):
+    """
+    `extract_standardized_data` + `aplicar_categoria` + filtros para um lote de itens da mesma fonte:
+    preço e área convertidos por coluna (ConversaoValores), filtros aplicados como máscara e só os
+    itens que passam montados como dicionário, sem coordenadas (geolocalizacao None).
+    Retorna (itens padronizados, descartados sem tipo/finalidade, filtrados por preço/área).
+    """
+    campos = [extrair_campos_brutos(item, source) for item in itens_originais]
+    precos = precos_para_float([c[1] for c in campos])
+    areas = areas_para_float([c[3] for c in campos])
+    da_categoria = {'tipo_imovel': None, 'finalidade': None}
+    aplicar_categoria(da_categoria, categoria)
+    tipos = [da_categoria['tipo_imovel'] or c[0] for c in campos]
+    finalidades = [da_categoria['finalidade'] or c[2] for c in campos]
+    passa = mascara_filtro_preco_area(tipos, finalidades, precos, areas)
+    itens, sem_tipo, filtrados = [], 0, 0
+    for indice, item_original in enumerate(itens_originais):
+        if not tipos[indice] or not finalidades[indice]:
+            sem_tipo += 1
+        elif not passa[indice]:
+            filtrados += 1
+        else:
+            item_padronizado = montar_item_padronizado(campos[indice], precos[indice], areas[indice], None, item_original, source)
+            aplicar_categoria(item_padronizado, categoria)
+            itens.append(item_padronizado)
+    return itens, sem_tipo, filtrados
+
+def diretorio_incremental(output_dir, categoria):
+    return os.path.join(output_dir, DIRETORIO_INCREMENTAL, categoria)
+
+def caminho_padronizados(diretorio, posicao, source):
+    return os.path.join(diretorio, f"{posicao}_{source}.jsonl")
+
+def arquivos_da_categoria(arquivos_lista_nomes_param, input_dirs_param):
+    """[(fonte, caminho)] dos arquivos de entrada da categoria, na ordem em que são combinados."""
+    return [(source, resolver_caminho(os.path.join(input_dirs_param[source], nome_arquivo_json)))
+            for source, nome_arquivo_json in zip(input_dirs_param.keys(), arquivos_lista_nomes_param)]
+
+def iterar_registros_novos(caminho, inicio, fim):
+    """Registros de `caminho` entre os bytes `inicio` e `fim` (JSON Lines) ou do arquivo inteiro (JSON)."""
+    if not e_ndjson(caminho):
+        yield from iterar_json_seguro(caminho)
+        return
+    try:
+        for registro, _ in iterar_linhas_desde(caminho, inicio, fim):
+            yield registro
+    except Exception as e:
+        print(f"AVISO: Erro inesperado ao carregar '{caminho}': {e}", flush=True)
+
+def caminho_manifesto_arquivo(diretorio, posicao, source):
+    return os.path.join(diretorio, f"{posicao}_{source}.manifesto.json")
+
+def padronizar_arquivo(categoria, posicao, source, caminho, output_dir_param, completo=False):
+    """
+    Tarefa do pool (uma por categoria e arquivo de entrada): compara o arquivo com o seu manifesto e
+    padroniza e filtra só os registros novos, guardando-os com a chave do cache de geocodificação.
+    Com `completo` o arquivo é relido inteiro. Retorna (situação, itens novos lidos, entrada do manifesto).
+    """
+    diretorio = diretorio_incremental(output_dir_param, categoria)
+    arquivo_manifesto = caminho_manifesto_arquivo(diretorio, posicao, source)
+    cache = caminho_padronizados(diretorio, posicao, source)
+    entrada = None if completo else carregar_manifesto(arquivo_manifesto, VERSAO_PADRONIZACAO)
+    situacao, atual = comparar(entrada, caminho)
+    if situacao != 'refazer' and entrada.get('itens') and not os.path.exists(cache):
+        situacao, atual['inicio'] = 'refazer', 0
+    if situacao == 'igual':
+        if (atual['tamanho'], atual['mtime_ns']) != (entrada['tamanho'], entrada['mtime_ns']):
+            # Fica com o tamanho/mtime atuais (ex.: depois de uma cópia) para não recalcular o hash
+            entrada = dict(entrada, tamanho=atual['tamanho'], mtime_ns=atual['mtime_ns'])
+            gravar_manifesto(arquivo_manifesto, entrada)
+        return situacao, 0, entrada
+
+    os.makedirs(diretorio, exist_ok=True)
+    # O manifesto do arquivo sai antes de os itens serem regravados: se a execução cair no meio, a
+    # próxima refaz o arquivo do zero
+    if os.path.exists(arquivo_manifesto):
+        os.remove(arquivo_manifesto)
+    if situacao == 'refazer':
+        contadores = {'registros': 0, 'itens': 0, 'sem_tipo': 0, 'filtrados': 0}
+        if os.path.exists(cache):
+            os.remove(cache)
+    else:
+        contadores = {nome: entrada[nome] for nome in ('registros', 'itens', 'sem_tipo', 'filtrados')}
+    print(f"WORKER '{categoria}': Carregando arquivo '{caminho}' ({situacao}, a partir do byte {atual['inicio']})...", flush=True)
+    gravador, novos = GravadorNdjson(cache), 0
+    registros = iterar_registros_novos(caminho, atual['inicio'], atual['bytes'])
+    while True:
+        lote_original = list(itertools.islice(registros, ITENS_POR_LOTE_PADRONIZACAO))
+        if not lote_original:
+            break
+        novos += len(lote_original)
+        print(f"WORKER '{categoria}': Processando item {novos} de '{caminho}'...", flush=True)
+        itens, sem_tipo, filtrados = padronizar_lote(lote_original, source, categoria)
+        contadores['sem_tipo'] += sem_tipo
+        contadores['filtrados'] += filtrados
+        lote = []
+        for item_padronizado in itens:
+            # As coordenadas entram na combinação, a partir da chave: o cache de geocodificação muda entre execuções
+            endereco_limpo, chave = preparar_endereco_geocodificacao(item_padronizado['endereco'])
+            lote.append({'c': chave, 'e': endereco_limpo, 'k': chave_comparacao(item_padronizado), 'i': item_padronizado})
+        gravador.acrescentar(lote)
+        contadores['itens'] += len(lote)
+    gravador.fechar()
+    contadores['registros'] += novos
+    atual.pop('inicio')
+    entrada = dict(atual, fonte=source, versao=VERSAO_PADRONIZACAO, **contadores)
+    gravar_manifesto(arquivo_manifesto, entrada)
+    print(f"WORKER '{categoria}': {novos} itens novos lidos de '{caminho}' (Fonte: {source})", flush=True)
+    return situacao, novos, entrada
+
+def enderecos_padronizados(categoria, posicao, source, output_dir_param):
+    """{chave do cache: endereço limpo} dos itens padronizados de um arquivo de entrada."""
+    cache = caminho_padronizados(diretorio_incremental(output_dir_param, categoria), posicao, source)
+    enderecos = {}
+    for linha in iterar_registros(cache) if os.path.exists(cache) else ():
+        if linha['c'] and linha['c'] not in enderecos:
+            enderecos[linha['c']] = linha['e']
+    return enderecos
+
+def versao_das_entradas(entradas):
+    """O que identifica o conteúdo lido de cada arquivo de entrada, para saber se o resultado está atualizado."""
+    return [[entrada['caminho'], entrada['bytes'], entrada['sha256']] for entrada in entradas]
+
+def categoria_atualizada(categoria, entradas, output_dir_param):
+    """True se resultados_<categoria>.json foi combinado a partir exatamente destas entradas."""
+    manifesto = carregar_manifesto(os.path.join(diretorio_incremental(output_dir_param, categoria), 'manifesto.json'),
+                                   VERSAO_PADRONIZACAO)
+    return (manifesto is not None and manifesto['entradas'] == versao_das_entradas(entradas)
+            and manifesto['saida'] == impressao_arquivo(os.path.join(output_dir_param, f"resultados_{categoria}.json")))
+
+def processar_categoria_worker(categoria, entradas, output_dir_param, coordenadas_param):
+    """
+    Etapa de redução (uma tarefa por categoria): combina os itens padronizados dos arquivos de
+    entrada da categoria, na ordem de CATEGORY_FILE_PATTERNS, e remove as duplicatas.
+    """
+    global worker_coordenadas
     print(f"WORKER: Iniciando processamento para categoria '{categoria}'...", flush=True)
+    worker_coordenadas = coordenadas_param
     combinados = []
+    registros = []  # RegistroComparacao de cada item de `combinados`
+    indice_duplicatas = IndiceDuplicatas()
     registros_duplicados_tratados = 0
-    itens_filtrados_preco_area = 0
-    itens_sem_tipo_ou_finalidade_validos = 0
-    fontes_disponiveis = list(input_dirs_param.keys())
-
-    for idx_fonte, nome_arquivo_json in enumerate(arquivos_lista_nomes_param):
-        if idx_fonte < len(fontes_disponiveis):
-            source = fontes_disponiveis[idx_fonte]
-            input_dir = input_dirs_param[source]
-            arquivo_caminho = os.path.join(input_dir, nome_arquivo_json)
-            print(f"WORKER '{categoria}': Carregando arquivo '{arquivo_caminho}'...", flush=True)
-            lista_itens = load_json_safe(arquivo_caminho)
-            if not lista_itens:
-                print(f"WORKER '{categoria}': Nenhum item em '{nome_arquivo_json}' ou arquivo não pôde ser carregado.", flush=True)
-                continue
-            total_itens_no_arquivo = len(lista_itens)
-            print(f"WORKER '{categoria}': {total_itens_no_arquivo} itens carregados de '{nome_arquivo_json}' (Fonte: {source})", flush=True)
-            
-            for item_idx, item_original in enumerate(lista_itens):
-                if (item_idx + 1) % 20 == 0 or item_idx == total_itens_no_arquivo - 1:
-                    print(f"WORKER '{categoria}': Processando item {item_idx + 1}/{total_itens_no_arquivo} de '{nome_arquivo_json}'...", flush=True)
-                item_padronizado = extract_standardized_data(item_original, source)
-                if item_padronizado is None : continue
-                if 'venda' in categoria or 'compra' in categoria: item_padronizado['finalidade'] = 'Venda'
-                elif 'aluguel' in categoria or 'locacao' in categoria: item_padronizado['finalidade'] = 'Aluguel'
-                if 'casa' in categoria: item_padronizado['tipo_imovel'] = 'Casa'
-                elif 'apartamento' in categoria: item_padronizado['tipo_imovel'] = 'Apartamento'
-                elif 'terreno' in categoria: item_padronizado['tipo_imovel'] = 'Terreno'
-                if not item_padronizado['tipo_imovel'] or not item_padronizado['finalidade']:
-                    itens_sem_tipo_ou_finalidade_validos += 1
-                    continue
-                item_mantido_por_filtro = True
-                if item_padronizado['tipo_imovel'] == 'Terreno' and item_padronizado['finalidade'] == 'Venda':
-                    preco_terreno_float = item_padronizado.get('preco')
-                    if preco_terreno_float is not None and preco_terreno_float > 150000: item_mantido_por_filtro = False
-                if item_padronizado['tipo_imovel'] == 'Casa':
-                    area_casa_float = item_padronizado.get('area_m2')
-                    if area_casa_float is not None and not (90 <= area_casa_float <= 110): item_mantido_por_filtro = False
-                if not item_mantido_por_filtro:
-                    itens_filtrados_preco_area += 1
-                    continue
-                duplicado_encontrado_flag = False
-                for idx_existente, imovel_ja_combinado in enumerate(combinados):
-                    if sao_imoveis_duplicados(item_padronizado, imovel_ja_combinado):
-                        registros_duplicados_tratados += 1
-                        duplicado_encontrado_flag = True
-                        if tem_mais_informacoes(item_padronizado, imovel_ja_combinado):
-                            fontes_sec_antigas = imovel_ja_combinado.get('fontes_secundarias', [])
-                            fonte_principal_antiga = imovel_ja_combinado['fonte']
-                            combinados[idx_existente] = item_padronizado
-                            combinados[idx_existente]['fontes_secundarias'] = combinados[idx_existente].get('fontes_secundarias', [])
-                            if fonte_principal_antiga not in combinados[idx_existente]['fontes_secundarias'] and \
-                               fonte_principal_antiga != combinados[idx_existente]['fonte']:
-                                combinados[idx_existente]['fontes_secundarias'].append(fonte_principal_antiga)
-                            for fs_antiga in fontes_sec_antigas:
-                                if fs_antiga not in combinados[idx_existente]['fontes_secundarias'] and \
-                                   fs_antiga != combinados[idx_existente]['fonte']:
-                                    combinados[idx_existente]['fontes_secundarias'].append(fs_antiga)
-                        else:
-                            imovel_ja_combinado['fontes_secundarias'] = imovel_ja_combinado.get('fontes_secundarias', [])
-                            if item_padronizado['fonte'] not in imovel_ja_combinado['fontes_secundarias'] and \
-                               item_padronizado['fonte'] != imovel_ja_combinado['fonte']:
-                                imovel_ja_combinado['fontes_secundarias'].append(item_padronizado['fonte'])
-                        break 
-                if not duplicado_encontrado_flag:
-                    combinados.append(item_padronizado)
+    diretorio = diretorio_incremental(output_dir_param, categoria)
+    itens_filtrados_preco_area = sum(entrada['filtrados'] for entrada in entradas)
+    itens_sem_tipo_ou_finalidade_validos = sum(entrada['sem_tipo'] for entrada in entradas)
+    validos = {f"{posicao}_{entrada['fonte']}" for posicao, entrada in enumerate(entradas)} | {'manifesto'}
+    for nome in os.listdir(diretorio):
+        if nome.split('.')[0] not in validos:
+            os.remove(os.path.join(diretorio, nome))  # arquivo de entrada que saiu de CATEGORY_FILE_PATTERNS
+
+    for posicao, entrada in enumerate(entradas):
+        cache = caminho_padronizados(diretorio, posicao, entrada['fonte'])
+        if not entrada['itens'] or not os.path.exists(cache):
+            print(f"WORKER '{categoria}': Nenhum item em '{entrada['caminho']}' ou arquivo não pôde ser carregado.", flush=True)
+            continue
+        for linha in iterar_registros(cache):
+            item_padronizado = linha['i']
+            lat, lon = worker_coordenadas.get(linha['c'], (None, None)) if linha['c'] else (None, None)
+            if lat is not None and lon is not None:
+                item_padronizado['geolocalizacao'] = {"latitude": lat, "longitude": lon}
+            registro = registro_comparacao(item_padronizado, linha['k'])
+            duplicado_encontrado_flag = False
+            for idx_existente in indice_duplicatas.candidatos(registro):
+                imovel_ja_combinado = combinados[idx_existente]
+                if sao_registros_duplicados(registro, registros[idx_existente]):
+                    registros_duplicados_tratados += 1
+                    duplicado_encontrado_flag = True
+                    if tem_mais_informacoes(item_padronizado, imovel_ja_combinado):
+                        fontes_sec_antigas = imovel_ja_combinado.get('fontes_secundarias', [])
+                        fonte_principal_antiga = imovel_ja_combinado['fonte']
+                        combinados[idx_existente] = item_padronizado
+                        registros[idx_existente] = registro
+                        indice_duplicatas.remover(idx_existente)
+                        indice_duplicatas.adicionar(idx_existente, registro)
+                        combinados[idx_existente]['fontes_secundarias'] = combinados[idx_existente].get('fontes_secundarias', [])
+                        if fonte_principal_antiga not in combinados[idx_existente]['fontes_secundarias'] and \
+                           fonte_principal_antiga != combinados[idx_existente]['fonte']:
+                            combinados[idx_existente]['fontes_secundarias'].append(fonte_principal_antiga)
+                        for fs_antiga in fontes_sec_antigas:
+                            if fs_antiga not in combinados[idx_existente]['fontes_secundarias'] and \
+                               fs_antiga != combinados[idx_existente]['fonte']:
+                                combinados[idx_existente]['fontes_secundarias'].append(fs_antiga)
+                    else:
+                        imovel_ja_combinado['fontes_secundarias'] = imovel_ja_combinado.get('fontes_secundarias', [])
+                        if item_padronizado['fonte'] not in imovel_ja_combinado['fontes_secundarias'] and \
+                           item_padronizado['fonte'] != imovel_ja_combinado['fonte']:
+                            imovel_ja_combinado['fontes_secundarias'].append(item_padronizado['fonte'])
+                    break 
+            if not duplicado_encontrado_flag:
+                indice_duplicatas.adicionar(len(combinados), registro)
+                combinados.append(item_padronizado)
+                registros.append(registro)
+        print(f"WORKER '{categoria}': {entrada['itens']} itens de '{entrada['caminho']}' combinados (Fonte: {entrada['fonte']})", flush=True)
     nome_arquivo_saida = f"resultados_{categoria}.json"
     caminho_saida = os.path.join(output_dir_param, nome_arquivo_saida)
     msg_final = (f"WORKER '{categoria}': Processamento concluído. Salvando em '{caminho_saida}' ({len(combinados)} registros). "
@@ -459,52 +701,172 @@ def processar_categoria_worker(categoria, arquivos_lista_nomes_param, input_dirs
     try:
         with open(caminho_saida, 'w', encoding='utf-8') as f:
             json.dump(combinados, f, indent=2, ensure_ascii=False)
+        # O resultado só vale como atualizado se foi gravado inteiro
+        gravar_manifesto(os.path.join(diretorio, 'manifesto.json'), {
+            'versao': VERSAO_PADRONIZACAO, 'entradas': versao_das_entradas(entradas),
+            'saida': impressao_arquivo(caminho_saida)})
     except Exception as e:
         print(f"WORKER '{categoria}': ERRO AO SALVAR '{caminho_saida}': {e}", flush=True)
+    banco = BancoImoveis(ARQUIVO_BANCO_IMOVEIS)
+    try:
+        banco.substituir_categoria(categoria, combinados)
+    except Exception as e:
+        print(f"WORKER '{categoria}': ERRO AO GRAVAR NA BASE '{ARQUIVO_BANCO_IMOVEIS}': {e}", flush=True)
+    finally:
+        banco.fechar()
     return msg_final
 
-def combinar_jsons_paralelo():
+def geocodificar_enderecos_pendentes(enderecos_por_categoria, cache):
+    """
+    Etapa de geocodificação: junta os endereços de todas as categorias a processar, consulta o
+    Google Maps uma única vez por chave (pedidos repetidos entre categorias são coalescidos) só
+    para os que não estão no cache e grava os resultados.
+    Retorna ({chave: (lat, lon)}, acertos, faltas, EstatisticasGeocodificacao).
+    """
+    coordenadas, situacao_cache, pendentes = {}, {}, []
+    acertos, faltas = 0, 0
+    for enderecos in enderecos_por_categoria:
+        for chave, endereco_limpo in enderecos.items():
+            if chave not in situacao_cache:
+                situacao_cache[chave] = cache.obter(chave)
+                if situacao_cache[chave][0]: acertos += 1
+                else: faltas += 1
+            encontrado, coords = situacao_cache[chave]
+            if encontrado:
+                coordenadas[chave] = coords
+            else:
+                pendentes.append((chave, endereco_limpo))
+    print(f"GEO: {acertos} endereços já no cache, {faltas} a geocodificar.", flush=True)
+    if not pendentes:
+        return coordenadas, acertos, faltas, EstatisticasGeocodificacao()
+    pool_navegadores = PoolNavegadores(criar_driver_geocodificacao, tamanho=GEO_CONCORRENCIA)
+    try:
+        resultados, estatisticas = geocodificar_em_lote(
+            pendentes, lambda endereco: consultar_google_maps(endereco, pool_navegadores), cache,
+            concorrencia=GEO_CONCORRENCIA, requisicoes_por_segundo=GEO_REQUISICOES_POR_SEGUNDO,
+            tentativas=GEO_TENTATIVAS, alerta_requisicoes=GEO_ALERTA_REQUISICOES,
+            log=lambda msg: print(msg, flush=True)
+        )
+    finally:
+        pool_navegadores.encerrar()
+        print(f"GEO: Pool de navegadores encerrado: {pool_navegadores.sessoes_criadas} sessões criadas, "
+              f"{pool_navegadores.sessoes_recicladas} recicladas.", flush=True)
+    coordenadas.update(resultados)
+    return coordenadas, acertos, faltas, estatisticas
+
+def executar_tarefa(tarefa):
+    """Roda uma tarefa do pool e mede o tempo gasto nela: (índice, resultado, segundos, pid)."""
+    indice, funcao, argumentos = tarefa
+    inicio = time.perf_counter()
+    resultado = funcao(*argumentos)
+    return indice, resultado, time.perf_counter() - inicio, os.getpid()
+
+def mapear_no_pool(pool, num_workers, etapa, funcao, tarefas, descrever):
+    """
+    Distribui `tarefas` (tuplas de argumentos de `funcao`) pelo pool, cada uma para o primeiro
+    worker livre, e retorna os resultados na ordem das tarefas. Registra o tempo de cada tarefa e a
+    utilização dos workers na etapa (tempo somado das tarefas / (duração da etapa x workers)).
+    """
+    resultados = [None] * len(tarefas)
+    inicio, ocupado, processos = time.perf_counter(), 0.0, set()
+    for indice, resultado, segundos, pid in pool.imap_unordered(
+            executar_tarefa, [(indice, funcao, argumentos) for indice, argumentos in enumerate(tarefas)]):
+        resultados[indice] = resultado
+        ocupado += segundos
+        processos.add(pid)
+        print(f"POOL {etapa}: {descrever(tarefas[indice], resultado)} em {segundos:.2f}s (processo {pid}).", flush=True)
+    duracao = time.perf_counter() - inicio
+    utilizacao = ocupado / (duracao * num_workers) if duracao > 0 else 0.0
+    print(f"POOL {etapa}: {len(tarefas)} tarefas em {duracao:.2f}s, {ocupado:.2f}s de trabalho em "
+          f"{len(processos)} de {num_workers} workers (utilização {utilizacao:.0%}).", flush=True)
+    return resultados
+
+def combinar_jsons_paralelo(completo=False):
     print("Iniciando combinação de JSONs por categoria EM PARALELO...", flush=True)
-    manager = Manager()
-    shared_geocoding_cache = manager.dict()
-    shared_geocoding_request_counter = manager.Value('i', 0)
-    shared_counter_lock = manager.Lock()
-    max_geocoding_warning_threshold = 50
-
-    tasks_args = []
-    categories_to_process_count = 0
-    for cat, arquivos_nomes in CATEGORY_FILE_PATTERNS.items():
-        output_filename = f"resultados_{cat}.json"
-        output_filepath = os.path.join(OUTPUT_DIR, output_filename)
-        if os.path.exists(output_filepath):
-            print(f"Arquivo de resultado '{output_filepath}' já existe. Pulando categoria '{cat}'.", flush=True)
-            continue 
-        tasks_args.append((cat, arquivos_nomes, INPUT_DIRS, OUTPUT_DIR))
-        categories_to_process_count +=1
-
-    if categories_to_process_count == 0:
-        print("Todos os arquivos de resultado para as categorias configuradas já existem ou nenhuma categoria para processar.", flush=True)
-        print("\nProcesso de Combinação Concluído (nenhuma tarefa nova executada).", flush=True)
-        return
-
-    num_workers = min(len(tasks_args), os.cpu_count() or 1, 4) 
-    print(f"Utilizando {num_workers} workers em paralelo para {len(tasks_args)} categorias.", flush=True)
-
-    init_args_tuple = (shared_geocoding_cache, shared_geocoding_request_counter, shared_counter_lock, max_geocoding_warning_threshold)
-    with Pool(processes=num_workers, initializer=init_worker_globals, initargs=init_args_tuple) as pool:
-        results = pool.starmap(processar_categoria_worker, tasks_args)
+    cache_principal = CacheGeocodificacao(ARQUIVO_CACHE_GEO)
+    importadas_json = cache_principal.importar_cache_json(ARQUIVO_CACHE_JSON_LEGADO)
+    if importadas_json:
+        print(f"Migradas {importadas_json} entradas de '{ARQUIVO_CACHE_JSON_LEGADO}' para '{ARQUIVO_CACHE_GEO}'.", flush=True)
+
+    # Uma tarefa por categoria e arquivo de entrada, as maiores primeiro: as pequenas preenchem os
+    # workers que ficam livres enquanto as grandes terminam
+    tarefas_padronizacao = [
+        (cat, posicao, source, caminho, OUTPUT_DIR, completo)
+        for cat, arquivos_nomes in CATEGORY_FILE_PATTERNS.items()
+        for posicao, (source, caminho) in enumerate(arquivos_da_categoria(arquivos_nomes, INPUT_DIRS))
+    ]
+    tarefas_padronizacao.sort(key=lambda tarefa: impressao_arquivo(tarefa[3])['tamanho'] or 0, reverse=True)
+    num_workers = os.cpu_count() or 1
+    print(f"Utilizando {num_workers} workers em paralelo para {len(tarefas_padronizacao)} arquivos de "
+          f"{len(CATEGORY_FILE_PATTERNS)} categorias{' (processamento completo)' if completo else ''}.", flush=True)
+
+    with Pool(processes=num_workers) as pool:
+        padronizados = mapear_no_pool(
+            pool, num_workers, 'padronização', padronizar_arquivo, tarefas_padronizacao,
+            lambda tarefa, resultado: f"{tarefa[0]}/{tarefa[2]} ({resultado[0]}, {resultado[1]} itens novos)")
+        entradas_por_categoria = {cat: [] for cat in CATEGORY_FILE_PATTERNS}
+        for (cat, posicao, *_), (_, _, entrada) in sorted(zip(tarefas_padronizacao, padronizados), key=lambda par: par[0][:2]):
+            entradas_por_categoria[cat].append(entrada)
+        a_processar = {}
+        for cat, entradas in entradas_por_categoria.items():
+            if not completo and categoria_atualizada(cat, entradas, OUTPUT_DIR):
+                print(f"Categoria '{cat}': entradas e resultado sem alteração. Pulando categoria.", flush=True)
+            else:
+                a_processar[cat] = entradas
+        if not a_processar:
+            cache_principal.fechar()
+            print("Nenhuma categoria com entradas novas ou alteradas.", flush=True)
+            print("\nProcesso de Combinação Concluído (nenhuma tarefa nova executada).", flush=True)
+            return
+
+        tarefas_enderecos = [(cat, posicao, entrada['fonte'], OUTPUT_DIR)
+                             for cat, entradas in a_processar.items() for posicao, entrada in enumerate(entradas)]
+        enderecos_por_arquivo = mapear_no_pool(
+            pool, num_workers, 'endereços', enderecos_padronizados, tarefas_enderecos,
+            lambda tarefa, resultado: f"{tarefa[0]}/{tarefa[2]} ({len(resultado)} endereços)")
+        enderecos_por_categoria = {cat: {} for cat in a_processar}
+        for (cat, *_), enderecos in zip(tarefas_enderecos, enderecos_por_arquivo):
+            for chave, endereco_limpo in enderecos.items():
+                enderecos_por_categoria[cat].setdefault(chave, endereco_limpo)
+        total_itens = 0
+        for cat, entradas in a_processar.items():
+            total = sum(entrada['registros'] for entrada in entradas)
+            total_itens += total
+            print(f"Categoria '{cat}': {total} itens, {len(enderecos_por_categoria[cat])} endereços únicos.", flush=True)
+        try:
+            coordenadas, total_acertos_cache, total_faltas_cache, estatisticas_geo = geocodificar_enderecos_pendentes(
+                list(enderecos_por_categoria.values()), cache_principal)
+        finally:
+            cache_principal.fechar()
+        total_enderecos_unicos = total_acertos_cache + total_faltas_cache
+        # Redução: uma tarefa por categoria (as com mais itens primeiro), cada uma só com as
+        # coordenadas dos endereços da sua categoria
+        tarefas_combinacao = sorted((
+            (cat, entradas, OUTPUT_DIR,
+             {chave: coordenadas[chave] for chave in enderecos_por_categoria[cat] if chave in coordenadas})
+            for cat, entradas in a_processar.items()
+        ), key=lambda tarefa: sum(entrada['itens'] for entrada in tarefa[1]), reverse=True)
+        results = mapear_no_pool(pool, num_workers, 'combinação', processar_categoria_worker, tarefas_combinacao,
+                                 lambda tarefa, resultado: tarefa[0])
 
     for result_msg in results:
         print(f"MAIN: {result_msg}", flush=True)
-    total_geocoding_requests_made = shared_geocoding_request_counter.value
+    total_geocoding_requests_made = estatisticas_geo.requisicoes
     print(f"\nProcesso de Combinação Paralelo Concluído.", flush=True)
-    print(f"Total de {total_geocoding_requests_made} requisições de geocodificação (novas) feitas ao Google Maps nesta execução.", flush=True)
+    print(f"Total de {total_geocoding_requests_made} requisições de geocodificação (novas) feitas ao Google Maps nesta execução ({estatisticas_geo}).", flush=True)
+    print(f"Total de {total_itens} itens lidos, com {total_enderecos_unicos} endereços únicos para geocodificação.", flush=True)
+    print(f"Cache de geocodificação ('{ARQUIVO_CACHE_GEO}'): {total_acertos_cache} acertos, {total_faltas_cache} faltas.", flush=True)
     if total_geocoding_requests_made > 200:
         print("ATENÇÃO: Um número elevado de requisições de geocodificação foi feito.", flush=True)
 
 if __name__ == "__main__":
     start_time = time.time()
-    combinar_jsons_paralelo()
+    combinar_jsons_paralelo(completo='--completo' in sys.argv[1:])
+    try:
+        totais_exportados = exportar_colunar(OUTPUT_DIR)
+        print(f"Exportação colunar (Parquet/Arrow) em '{OUTPUT_DIR}': {sum(totais_exportados.values())} anúncios.", flush=True)
+    except ImportError:
+        print("AVISO: pyarrow não instalado; exportação Parquet/Arrow ignorada (pip install pyarrow).", flush=True)
     end_time = time.time()
     total_time = end_time - start_time
     print(f"\nTempo total de execução: {total_time:.2f} segundos.", flush=True)
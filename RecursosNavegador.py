@@ -0,0 +1,237 @@
+import re
+import sys
+import json
+import time
+
+# Bloqueio de recursos nas sessões do Chrome. Nenhuma sessão precisa do que a página desenha: a
+# raspagem lê o texto do DOM e a geocodificação só a URL final do Google Maps. Cada papel de driver
+# tem um perfil de bloqueio aplicado pelo DevTools (CDP Network.setBlockedURLs) assim que a sessão é
+# criada; o Chrome nem pede os recursos bloqueados. JavaScript e CSS nunca são bloqueados (os portais
+# renderizam os cards e resolvem os desafios anti-bot com eles); a verificação deste módulo confere
+# que nenhum padrão casa com os scripts de desafio.
+#   'listagem'       -> páginas de listagem dos portais (raspagem): perfil 'leve'
+#   'geocodificacao' -> Google Maps (Processamento e Mapa): perfil 'mapa', que tira também os blocos
+#                       do mapa, as fotos dos lugares e os pings de log
+# `python RecursosNavegador.py URL ...` mede tempo de carregamento e bytes transferidos de cada URL
+# sem bloqueio e com o perfil do papel.
+def _extensoes(*extensoes):
+    # Extensão no fim do caminho, com ou sem query string ('x.jpg', 'x.jpg?w=300'), mas não 'x.icons.js'
+    return [padrao for extensao in extensoes for padrao in (f'*.{extensao}', f'*.{extensao}?*')]
+
+
+CATEGORIAS = {
+    'imagens': _extensoes('jpg', 'jpeg', 'png', 'gif', 'webp', 'avif', 'svg', 'ico', 'bmp'),
+    'midia': _extensoes('mp4', 'webm', 'm3u8', 'ts', 'mp3', 'ogg', 'wav'),
+    'fontes': _extensoes('woff', 'woff2', 'ttf', 'otf', 'eot') + ['*fonts.gstatic.com*', '*fonts.googleapis.com*'],
+    'analytics': [
+        '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*', '*googlesyndication.com*',
+        '*googleadservices.com*', '*connect.facebook.net*', '*facebook.com/tr*', '*hotjar.com*', '*clarity.ms*',
+        '*analytics.tiktok.com*', '*bat.bing.com*', '*taboola.com*', '*criteo.com*', '*criteo.net*',
+        '*nr-data.net*', '*cdn.segment.com*', '*api.segment.io*', '*amplitude.com*', '*mixpanel.com*',
+        '*scorecardresearch.com*', '*outbrain.com*',
+    ],
+    'mapa': [
+        '*/maps/vt*', '*khms*.google.com*', '*streetviewpixels-pa.googleapis.com*', '*.googleusercontent.com*',
+        '*google.com/gen_204*', '*/maps/preview/log204*', '*play.google.com/log*',
+    ],
+}
+PERFIS = {
+    'completo': (),
+    'leve': ('imagens', 'midia', 'fontes', 'analytics'),
+    'mapa': ('imagens', 'midia', 'fontes', 'analytics', 'mapa'),
+}
+PERFIL_POR_PAPEL = {'listagem': 'leve', 'geocodificacao': 'mapa'}
+
+
+def definir_perfil(papel, perfil):
+    """Troca o perfil de um papel de driver ('completo' desliga o bloqueio)."""
+    if papel not in PERFIL_POR_PAPEL:
+        raise ValueError(f"Papel de driver desconhecido: {papel!r} (opções: {', '.join(PERFIL_POR_PAPEL)})")
+    if perfil not in PERFIS:
+        raise ValueError(f"Perfil desconhecido: {perfil!r} (opções: {', '.join(PERFIS)})")
+    PERFIL_POR_PAPEL[papel] = perfil
+
+
+def padroes_do_perfil(perfil):
+    """Padrões de URL (com '*') bloqueados por `perfil`."""
+    return [padrao for categoria in PERFIS[perfil] for padrao in CATEGORIAS[categoria]]
+
+
+def _regex_do_padrao(padrao):
+    return re.compile('^' + '.*'.join(re.escape(parte) for parte in padrao.split('*')) + '$')
+
+
+def bloqueada(url, perfil):
+    """Se o Chrome bloquearia `url` no `perfil` (mesma casação por '*' do Network.setBlockedURLs)."""
+    return any(_regex_do_padrao(padrao).match(url) for padrao in padroes_do_perfil(perfil))
+
+
+def aplicar_perfil(driver, papel):
+    """
+    Liga na sessão o bloqueio do perfil do `papel`. Retorna o nome do perfil aplicado; sem suporte
+    a CDP no driver a sessão segue sem bloqueio (com um aviso) e o retorno é 'completo'.
+    """
+    perfil = PERFIL_POR_PAPEL[papel]
+    padroes = padroes_do_perfil(perfil)
+    if not padroes:
+        return perfil
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': padroes})
+    except Exception as e:
+        print(f"AVISO: bloqueio de recursos '{perfil}' não aplicado ({type(e).__name__}: {e}). Seguindo sem bloqueio.")
+        return 'completo'
+    return perfil
+
+
+# --- Medição ---
+def criar_driver_medicao(headless=True):
+    """Chrome com o log de desempenho ligado, para contar requisições e bytes pelo DevTools."""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    options = Options()
+    if headless:
+        options.add_argument('--headless=new')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--window-size=1920,1080')
+    options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    driver = webdriver.Chrome(options=options)
+    driver.set_page_load_timeout(60)
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setCacheDisabled', {'cacheDisabled': True})
+    return driver
+
+
+def medir_carregamento(driver, url, perfil):
+    """
+    Carrega `url` com o bloqueio de `perfil` e retorna {'segundos', 'bytes', 'requisicoes',
+    'bloqueadas'}: tempo até o evento load e bytes recebidos pela rede (cabeçalhos e corpo
+    compactado), somados dos eventos Network.* do log de desempenho.
+    """
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': padroes_do_perfil(perfil)})
+    driver.get('about:blank')
+    driver.get_log('performance')  # descarta os eventos anteriores
+    inicio = time.perf_counter()
+    driver.get(url)
+    segundos = time.perf_counter() - inicio
+    carregamento = driver.execute_script(
+        "const n = performance.getEntriesByType('navigation')[0]; return n ? n.loadEventEnd / 1000 : null;"
+    )
+    medida = {'segundos': carregamento or segundos, 'bytes': 0, 'requisicoes': 0, 'bloqueadas': 0}
+    for entrada in driver.get_log('performance'):
+        mensagem = json.loads(entrada['message'])['message']
+        metodo, parametros = mensagem.get('method'), mensagem.get('params', {})
+        if metodo == 'Network.requestWillBeSent':
+            medida['requisicoes'] += 1
+        elif metodo == 'Network.loadingFinished':
+            medida['bytes'] += parametros.get('encodedDataLength', 0)
+        elif metodo == 'Network.loadingFailed' and parametros.get('blockedReason'):
+            medida['bloqueadas'] += 1
+    return medida
+
+
+def comparar(urls, papel, repeticoes=2, headless=True):
+    """Mede cada URL sem bloqueio e com o perfil do `papel`, alternando a ordem a cada repetição."""
+    perfil = PERFIL_POR_PAPEL[papel]
+    driver = criar_driver_medicao(headless)
+    try:
+        for url in urls:
+            medidas = {'completo': [], perfil: []}
+            for repeticao in range(repeticoes):
+                ordem = ('completo', perfil) if repeticao % 2 == 0 else (perfil, 'completo')
+                for nome in ordem:
+                    medidas[nome].append(medir_carregamento(driver, url, nome))
+            antes, depois = _media(medidas['completo']), _media(medidas[perfil])
+            print(f"{url[:80]}")
+            print(f"  completo: {antes['segundos']:5.2f}s, {antes['bytes'] / 1024:8.0f} KiB, {antes['requisicoes']:4.0f} requisições")
+            print(f"  {perfil:8s}: {depois['segundos']:5.2f}s, {depois['bytes'] / 1024:8.0f} KiB, {depois['requisicoes']:4.0f} requisições "
+                  f"({depois['bloqueadas']:.0f} bloqueadas); "
+                  f"{_reducao(antes['segundos'], depois['segundos'])} no tempo, {_reducao(antes['bytes'], depois['bytes'])} nos bytes")
+    finally:
+        driver.quit()
+
+
+def _media(medidas):
+    return {chave: sum(m[chave] for m in medidas) / len(medidas) for chave in medidas[0]}
+
+
+def _reducao(antes, depois):
+    return f"-{(1 - depois / antes) * 100:.0f}%" if antes else "n/d"
+
+
+if __name__ == '__main__':
+    # python RecursosNavegador.py [--papel=listagem|geocodificacao] [--repeticoes=N] URL ...
+    #   mede as URLs num Chrome local, sem bloqueio e com o perfil do papel.
+    # Sem URLs, verificação sem rede: recursos referenciados nas páginas do corpus de fixtures e
+    # URLs típicas do Google Maps que cada perfil bloqueia ou preserva.
+    argumentos = sys.argv[1:]
+    papel, repeticoes = 'listagem', 2
+    for argumento in argumentos:
+        if argumento.startswith('--papel='):
+            papel = argumento.split('=', 1)[1]
+        elif argumento.startswith('--repeticoes='):
+            repeticoes = int(argumento.split('=', 1)[1])
+    urls = [a for a in argumentos if not a.startswith('--')]
+    if urls:
+        comparar(urls, papel, repeticoes)
+        sys.exit(0)
+
+    import os
+    import gzip
+    from raspagem.corpus import DIRETORIO_CORPUS, SUFIXO_PAGINA
+    PADRAO_RECURSO = re.compile(r'<(img|script|link|source|video)\b[^>]*?\b(?:src|href)=["\']([^"\']+)["\']', re.I)
+    for nome in sorted(os.listdir(DIRETORIO_CORPUS)):
+        if not nome.endswith(SUFIXO_PAGINA):
+            continue
+        with gzip.open(os.path.join(DIRETORIO_CORPUS, nome), 'rt', encoding='utf-8') as f:
+            recursos = PADRAO_RECURSO.findall(f.read())
+        bloqueados = [(tag, url) for tag, url in recursos if bloqueada(url, 'leve')]
+        assert all(tag.lower() == 'img' for tag, _ in bloqueados), (nome, bloqueados)
+        assert all(bloqueada(url, 'leve') for tag, url in recursos if tag.lower() == 'img'), nome
+        print(f"{nome[:-len(SUFIXO_PAGINA)]:22s} {len(recursos):4d} recursos, {len(bloqueados):4d} bloqueados no perfil 'leve'")
+
+    esperados = [
+        ('https://www.zapimoveis.com.br/venda/imoveis/go+goiania/?pagina=2', 'leve', False),
+        ('https://www.zapimoveis.com.br/cdn-cgi/challenge-platform/scripts/jsd/main.js', 'leve', False),
+        ('https://www.zapimoveis.com.br/_next/static/chunks/pages/app-1a2b.js', 'leve', False),
+        ('https://www.olx.com.br/static/x.icons.js', 'leve', False),
+        ('https://client.perimeterx.net/PXabc/main.min.js', 'leve', False),
+        ('https://js.datadome.co/tags.js', 'leve', False),
+        ('https://challenges.cloudflare.com/turnstile/v0/api.js', 'leve', False),
+        ('https://www.zapimoveis.com.br/_next/static/css/5f1e.css', 'leve', False),
+        ('https://resizedimgs.zapimoveis.com.br/fit-in/870x653/x.jpg?dimension=870x653', 'leve', True),
+        ('https://www.googletagmanager.com/gtm.js?id=GTM-XXXX', 'leve', True),
+        ('https://fonts.gstatic.com/s/roboto/v30/KFOmCnqEu92Fr1Mu4mxK.woff2', 'leve', True),
+        ('https://www.google.com/maps/search/?api=1&query=Rua%2010%2C%20Goi%C3%A2nia', 'mapa', False),
+        ('https://www.google.com/maps/preview/place?authuser=0&hl=pt-BR&q=Rua%2010', 'mapa', False),
+        ('https://www.google.com/maps/_/js/k=maps.m.pt_BR.abc/m=sc2,per', 'mapa', False),
+        ('https://www.google.com/maps/vt/pb=!1m5!1m4!1i12!2i1520!3i2255', 'mapa', True),
+        ('https://khms1.google.com/kh/v=979?x=1520&y=2255&z=12', 'mapa', True),
+        ('https://lh5.googleusercontent.com/p/AF1QipN=w408-h306', 'mapa', True),
+        ('https://www.google.com/maps/vt/pb=!1m5!1m4!1i12', 'leve', False),
+    ]
+    for url, perfil, esperado in esperados:
+        assert bloqueada(url, perfil) == esperado, (url, perfil)
+    assert not padroes_do_perfil('completo')
+
+    class DriverFalso:
+        def __init__(self, falhar=False):
+            self.comandos, self.falhar = [], falhar
+
+        def execute_cdp_cmd(self, comando, parametros):
+            if self.falhar:
+                raise AttributeError("driver sem CDP")
+            self.comandos.append((comando, parametros))
+
+    driver = DriverFalso()
+    assert aplicar_perfil(driver, 'geocodificacao') == 'mapa'
+    assert driver.comandos == [('Network.enable', {}), ('Network.setBlockedURLs', {'urls': padroes_do_perfil('mapa')})]
+    import io
+    import contextlib
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert aplicar_perfil(DriverFalso(falhar=True), 'listagem') == 'completo'
+    definir_perfil('listagem', 'completo')
+    driver = DriverFalso()
+    assert aplicar_perfil(driver, 'listagem') == 'completo' and not driver.comandos
+    print("Verificação OK.")
@@ -0,0 +1,4 @@
+# Motor de raspagem: um adaptador por portal (adaptadores.py), um registro de categorias
+# (categorias.py) e um orquestrador (orquestrador.py) que executa qualquer subconjunto delas num
+# único processo, com sessões HTTP e do Chrome compartilhadas. Ponto de entrada: execucao.executar
+# ou `python -m raspagem [portal | portal/categoria ...]`.
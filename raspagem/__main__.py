@@ -0,0 +1,34 @@
+import sys
+from .categorias import CATEGORIAS
+from .execucao import executar, compactar
+from .extracao import definir_extrator
+from .corpus import definir_gravacao
+from RecursosNavegador import definir_perfil
+
+# python -m raspagem                       -> todas as categorias de todos os portais
+# python -m raspagem olx zapimoveis/casas_compra
+# python -m raspagem --completo ...        -> percorre todas as páginas, sem parar nos anúncios já conhecidos
+# python -m raspagem --compactar [...]     -> uma linha por anúncio nos JSON Lines das categorias
+# python -m raspagem --listar              -> mostra o registro de categorias
+# python -m raspagem --extrator=bs4 ...     -> lê os cards com o BeautifulSoup em vez do lxml
+# python -m raspagem --gravar-paginas=DIR   -> grava em DIR cada página baixada (corpus de fixtures)
+# python -m raspagem --recursos=completo    -> Chrome carrega imagens/fontes/analytics (padrão: 'leve')
+if __name__ == '__main__':
+    argumentos = sys.argv[1:]
+    completo = '--completo' in argumentos
+    for argumento in argumentos:
+        if argumento.startswith('--extrator='):
+            definir_extrator(argumento.split('=', 1)[1])
+        elif argumento.startswith('--gravar-paginas='):
+            definir_gravacao(argumento.split('=', 1)[1])
+        elif argumento.startswith('--recursos='):
+            definir_perfil('listagem', argumento.split('=', 1)[1])
+    argumentos = [a for a in argumentos if a != '--completo'
+                  and not a.startswith(('--extrator=', '--gravar-paginas=', '--recursos='))]
+    if argumentos == ['--listar']:
+        for categoria in CATEGORIAS:
+            print(f"{categoria.rotulo:40s} páginas {categoria.paginas[0]}-{categoria.paginas[1]}  {categoria.url_template}")
+    elif argumentos and argumentos[0] == '--compactar':
+        compactar(argumentos[1:])
+    else:
+        executar(argumentos, incremental=not completo)
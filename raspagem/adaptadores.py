@@ -0,0 +1,336 @@
+import re
+import time
+import random
+import threading
+from .extracao import Seletor, extrator_ativo
+from .corpus import gravar_pagina
+from .bloqueio import (PaginaBloqueada, classificar_pagina, esperar_cards, CLASSES_BLOQUEADAS, CLASSE_ANUNCIOS,
+                       CLASSE_VAZIA)
+from .parsers import parse_price, parse_area, parse_integer, parse_money, parse_area_decimal
+from .grupo_zap import ColetorGrupoZap, PORTAIS, MODO_COLETA_PADRAO, reiniciar_sessao_http
+
+# Adaptadores de portal: tudo o que muda de um portal para outro (domínio, limites de cortesia,
+# seletores, paginação, mapeamento dos cards para registros e política de gravação). O restante
+# (fila de páginas, pool de navegadores, gravação) fica no orquestrador e em `saida`.
+PADRAO_ID_NO_LINK = re.compile(r"(\d{6,})$")
+
+
+class AdaptadorPortal:
+    nome = None
+    dominio = None
+    diretorio_saida = None
+    concorrencia = 1  # páginas simultâneas no domínio
+    intervalo = (5, 15)  # faixa de cortesia (s) entre inícios de requisição; o ControleCortesia ajusta dentro dela
+    paginas = (1, 100)  # (primeira, última) página de cada categoria
+    seletor_espera = None  # CSS aguardado no Chrome antes de ler o HTML
+    espera = 20
+    espera_renderizacao = (2, 5)  # pausa depois do carregamento: início da faixa com o domínio saudável
+    pular_se_existir = False  # categoria não é raspada de novo se o JSON já existir
+
+    def url(self, url_template, pagina):
+        return url_template.format(pagina)
+
+    def identificador(self, registro):
+        """
+        Identidade estável do anúncio, usada para reconhecer anúncios já gravados: o número do
+        anúncio no fim do link (ZAP/VivaReal 'id-2805476836/', OLX '-1402963661') ou, sem ele, o
+        link sem a query string. None quando o registro não tem link.
+        """
+        link = registro.get("link")
+        if not link:
+            return None
+        link = link.split("?", 1)[0].split("#", 1)[0].rstrip("/")
+        m = PADRAO_ID_NO_LINK.search(link)
+        return m.group(1) if m else link
+
+    def extrair(self, html, extrator=None):
+        """Registros de uma página de listagem (HTML completo), lidos com `extrator` (o ativo se None)."""
+        raise NotImplementedError
+
+    def finalizar(self, registros, categoria):
+        """Ajusta os registros de uma página para a categoria (filtros, campos fixos)."""
+        return registros
+
+    def renderizar(self, driver, url, pagina, rotulo, controle=None):
+        """
+        Carrega `url` no Chrome e espera `seletor_espera`; None se a página não carregar a tempo.
+        Uma busca sem resultados volta na hora (a listagem acabou) e desafio, captcha ou bloqueio
+        levantam PaginaBloqueada. Com `controle` (ControleCortesia do domínio) a pausa depois do
+        carregamento segue a pressão do domínio em vez de ser sorteada na faixa inteira.
+        """
+        from selenium.common.exceptions import TimeoutException
+        print(f"[{rotulo} - Página {pagina}] Acessando {url}")
+        try:
+            driver.get(url)
+            classe = esperar_cards(driver, self.seletor_espera, self.espera)
+        except TimeoutException:
+            classe = CLASSE_VAZIA
+        if classe in CLASSES_BLOQUEADAS:
+            raise PaginaBloqueada(classe, url)
+        if classe == CLASSE_VAZIA:
+            print(f"  → Timeout na página {pagina} de {rotulo}, pulando.")
+            return None
+        if classe == CLASSE_ANUNCIOS:
+            time.sleep(controle.espera_renderizacao(self.espera_renderizacao) if controle else
+                       random.uniform(*self.espera_renderizacao))
+        return driver.page_source
+
+    def reiniciar_sessoes(self):
+        """
+        Chamado pelo orquestrador quando o disjuntor do domínio abre: descarta sessões próprias do
+        adaptador (HTTP, cookies). As sessões do Chrome que pegaram o bloqueio já foram descartadas.
+        """
+
+    def coletar_pagina(self, url_template, pagina, contexto, rotulo):
+        """
+        Retorna os registros da página, [] quando a listagem acabou ou None quando ela falhou.
+        `contexto` é o orquestrador, que empresta as sessões do Chrome do pool compartilhado.
+        """
+        pool = contexto.pool_navegadores()
+        controle = contexto.controle_cortesia(self.dominio)
+        driver = pool.emprestar()
+        erro = True  # inclusive PaginaBloqueada: a sessão marcada pelo portal não volta ao pool
+        try:
+            html = self.renderizar(driver, self.url(url_template, pagina), pagina, rotulo, controle)
+            erro = False
+        finally:
+            pool.devolver(driver, erro=erro)
+        if html is None:
+            return None
+        gravar_pagina(self.nome, html, pagina)
+        return self.extrair(html)
+
+
+class AdaptadorGrupoZap(AdaptadorPortal):
+    """ZapImóveis e VivaReal: HTTP + JSON embutido, com o Chrome do pool só como reserva."""
+    concorrencia = 2
+
+    def __init__(self, nome, diretorio_saida, modo=MODO_COLETA_PADRAO):
+        self.nome = nome
+        self.dominio = PORTAIS[nome]['dominio'].split('://', 1)[1]
+        self.diretorio_saida = diretorio_saida
+        self.modo = modo
+        self.seletor_espera = PORTAIS[nome]['seletor_localizacao']
+        self._coletores = {}
+        self._trava = threading.Lock()
+
+    def coletar_pagina(self, url_template, pagina, contexto, rotulo):
+        with self._trava:
+            coletor = self._coletores.get(url_template)
+            if coletor is None:
+                coletor = ColetorGrupoZap(self.nome, url_template, modo=self.modo, rotulo=rotulo,
+                                          pool_navegadores=contexto.pool_navegadores(),
+                                          controle=contexto.controle_cortesia(self.dominio))
+                self._coletores[url_template] = coletor
+        return coletor.coletar_pagina(pagina)
+
+    def reiniciar_sessoes(self):
+        """Nova sessão HTTP (cookies limpos) e os coletores de volta ao modo configurado."""
+        reiniciar_sessao_http()
+        with self._trava:
+            for coletor in self._coletores.values():
+                coletor.modo = coletor.modo_inicial
+
+    def finalizar(self, registros, categoria):
+        return [dict(rec, tipo_imovel=categoria.tipo_imovel, finalidade=categoria.finalidade) for rec in registros]
+
+
+class AdaptadorOlx(AdaptadorPortal):
+    """OLX: lista de imóveis em geral, separada em categorias pelo título do anúncio."""
+    nome = 'olx'
+    dominio = 'www.olx.com.br'
+    diretorio_saida = 'olx_data'
+    intervalo = (3, 8)
+    seletor_espera = "a[data-testid='adcard-link']"
+    espera = 20
+
+    CARDS = Seletor(seletor_espera)
+    PRECO = Seletor(".olx-adcard__price, [data-testid='price']")
+    LOCALIZACAO = Seletor(".olx-adcard__location, [data-testid='location']")
+    DATA = Seletor(".olx-adcard__date, [data-testid='date']")
+    DETALHES = Seletor(".olx-adcard__detail, [data-testid*='property-card__detail']")
+
+    def extrair(self, html, extrator=None):
+        ex = extrator or extrator_ativo()
+        results = []
+        for link_el in ex.todos(ex.documento(html), self.CARDS):
+            card = ex.ancestral(link_el, 'li', 'section')
+            if card is None:
+                card = link_el
+            titulo = ex.atributo(link_el, "title", "").strip()
+            link = ex.atributo(link_el, "href")
+            if link and not link.startswith("http"):
+                link = "https://www.olx.com.br" + link
+            price_el = ex.primeiro(card, self.PRECO)
+            loc_el = ex.primeiro(card, self.LOCALIZACAO)
+            date_el = ex.primeiro(card, self.DATA)
+            details = ex.todos(card, self.DETALHES)
+            quartos_str = ex.texto(details[0], strip=True) if len(details) > 0 else None
+            detalhe2_str = ex.texto(details[1], strip=True) if len(details) > 1 else None
+            results.append({
+                "titulo": titulo, "link": link,
+                "preco": parse_price(ex.texto(price_el)) if price_el is not None else None,
+                "localizacao": ex.texto(loc_el, strip=True) if loc_el is not None else None,
+                "data": ex.texto(date_el, strip=True) if date_el is not None else None,
+                "quartos": parse_integer(quartos_str), "area_m2": parse_area(detalhe2_str)
+            })
+        return results
+
+    def finalizar(self, registros, categoria):
+        return [rec for rec in registros if categoria.filtro_titulo.search(rec["titulo"])]
+
+
+class AdaptadorInvestt(AdaptadorPortal):
+    """Investt: página única que cresce clicando em "Ver mais"."""
+    nome = 'investt'
+    dominio = 'www.investt.com.br'
+    diretorio_saida = 'investt_data'
+    intervalo = (2, 5)
+    paginas = (1, 1)
+    seletor_espera = "button.btn-next"
+    espera = 15
+    max_cliques = 20
+    espera_cliques = (2, 4)
+    pular_se_existir = True
+
+    def identificador(self, registro):
+        return registro.get("codigo")
+
+    def renderizar(self, driver, url, pagina, rotulo, controle=None):
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import TimeoutException
+        print(f"[{rotulo}] Acessando {url}")
+        driver.get(url)
+        time.sleep(2)
+        classe = classificar_pagina(driver.page_source, driver.current_url)
+        if classe in CLASSES_BLOQUEADAS:
+            raise PaginaBloqueada(classe, url)
+        clicks = 0
+        while clicks < self.max_cliques:
+            try:
+                btn = WebDriverWait(driver, self.espera).until(
+                    EC.element_to_be_clickable((By.CSS_SELECTOR, self.seletor_espera))
+                )
+                driver.execute_script("arguments[0].scrollIntoView()", btn)
+                btn.click()
+                clicks += 1
+                print(f"  → Clicou em Ver mais ({clicks}/{self.max_cliques})")
+                time.sleep(controle.espera_renderizacao(self.espera_cliques) if controle else
+                           random.uniform(*self.espera_cliques))
+            except TimeoutException:
+                print("  → Botão 'Ver mais' não encontrado ou timeout, parando.")
+                break
+        return driver.page_source
+
+    CARDS = Seletor("a.card-with-buttons.borderHover")
+    CABECALHO = Seletor("div.card-with-buttons__header")
+    RODAPE = Seletor("div.card-with-buttons__container-footer")
+    CODIGO = Seletor("p.card-with-buttons__code")
+    TIPO = Seletor("p.card-with-buttons__title")
+    LOCAL = Seletor("h2.card-with-buttons__heading")
+    ITENS = Seletor("ul > li")
+    VALORES = Seletor("div.card-with-buttons__value-container")
+    TITULO_VALOR = Seletor("p.card-with-buttons__value-title")
+    VALOR = Seletor("p.card-with-buttons__value")
+
+    def extrair(self, html, extrator=None):
+        ex = extrator or extrator_ativo()
+        results = []
+        for card in ex.todos(ex.documento(html), self.CARDS):
+            header = ex.primeiro(card, self.CABECALHO)
+            container = ex.primeiro(card, self.RODAPE)
+            if header is None or container is None:
+                print("    • Estrutura inesperada, ignorando cartão.")
+                continue
+
+            codigo_el = ex.primeiro(header, self.CODIGO)
+            tipo_el = ex.primeiro(card, self.TIPO)
+            local_el = ex.primeiro(card, self.LOCAL)
+
+            itens = ex.todos(card, self.ITENS)
+            area = ex.texto(itens[0], strip=True) if len(itens) > 0 else None
+            quartos = ex.texto(itens[1], strip=True) if len(itens) > 1 else None
+
+            # suíte / banheiros / vagas
+            suite = None
+            if len(itens) >= 3 and "Suíte" in ex.texto(itens[2]):
+                suite = ex.texto(itens[2], strip=True)
+                banhs = ex.texto(itens[3], strip=True) if len(itens) > 3 else None
+                vagas = ex.texto(itens[4], strip=True) if len(itens) > 4 else None
+            else:
+                banhs = ex.texto(itens[2], strip=True) if len(itens) > 2 else None
+                vagas = ex.texto(itens[3], strip=True) if len(itens) > 3 else None
+
+            venda = locacao = None
+            for bloc in ex.todos(container, self.VALORES):
+                title = ex.primeiro(bloc, self.TITULO_VALOR)
+                val = ex.primeiro(bloc, self.VALOR)
+                if title is not None and val is not None:
+                    text = ex.texto(title, strip=True).lower()
+                    if "venda" in text:
+                        venda = parse_money(ex.texto(val, strip=True))
+                    elif "locação" in text or "aluguel" in text:
+                        locacao = parse_money(ex.texto(val, strip=True))
+
+            results.append({
+                "codigo": ex.texto(codigo_el, strip=True) if codigo_el is not None else None,
+                "tipo": ex.texto(tipo_el, strip=True) if tipo_el is not None else None,
+                "local": ex.texto(local_el, strip=True) if local_el is not None else None,
+                "area": area,
+                "quartos": quartos,
+                "suite": suite,
+                "banheiros": banhs,
+                "vagas": vagas,
+                "venda": venda,
+                "locacao": locacao,
+            })
+        print(f"  → Encontrados {len(results)} imóveis")
+        return results
+
+
+class AdaptadorFacilitaImoveis(AdaptadorPortal):
+    """FacilitaImóveis: página única, sem paginação."""
+    nome = 'facilitaimoveis'
+    dominio = 'www.facilitaimoveis.com'
+    diretorio_saida = 'facilitaimoveis_data'
+    intervalo = (2, 5)
+    paginas = (1, 1)
+    seletor_espera = "div.imovelcard__infocontainer"
+    espera = 10
+    pular_se_existir = True
+    PADRAO_REF_TIPO = re.compile(r"Ref:\s*\d+\s*-\s*(\w+)")
+
+    CARDS = Seletor(seletor_espera)
+    NEGOCIO = Seletor("h2.imovelcard__info__tag")
+    ENDERECO = Seletor("h2.imovelcard__info__local")
+    REFERENCIA = Seletor("p.imovelcard__info__ref")
+    CARACTERISTICAS = Seletor("div.imovelcard__info__feature p")
+    VALOR = Seletor("p.imovelcard__valor__valor")
+
+    def extrair(self, html, extrator=None):
+        ex = extrator or extrator_ativo()
+        results = []
+        for card in ex.todos(ex.documento(html), self.CARDS):
+            try:
+                negocio = ex.primeiro(card, self.NEGOCIO)
+                endereco = ex.primeiro(card, self.ENDERECO)
+                ref_tipo = ex.primeiro(card, self.REFERENCIA)
+                m = self.PADRAO_REF_TIPO.search(ex.texto(ref_tipo)) if ref_tipo is not None else None
+                feats = ex.todos(card, self.CARACTERISTICAS)
+                val_p = ex.primeiro(card, self.VALOR)
+                results.append({
+                    "negocio": ex.texto(negocio, strip=True) if negocio is not None else None,  # "Venda" ou "Locação"
+                    "tipo": m.group(1) if m else None,  # "Casa" ou "Apartamento"
+                    "endereco": ex.texto(endereco, strip=True) if endereco is not None else None,
+                    "dormitorios": parse_integer(ex.texto(feats[0])) if len(feats) > 0 else None,
+                    "banheiros": parse_integer(ex.texto(feats[1])) if len(feats) > 1 else None,
+                    "vagas": parse_integer(ex.texto(feats[2])) if len(feats) > 2 else None,
+                    "area_m2": parse_area_decimal(ex.texto(feats[3])) if len(feats) > 3 else None,
+                    "preco": parse_money(ex.texto(val_p)) if val_p is not None else None
+                })
+            except Exception as e:
+                print(f"  → Erro ao processar card: {e}")
+        print(f"  → Encontrados {len(results)} imóveis")
+        return results
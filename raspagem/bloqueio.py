@@ -0,0 +1,232 @@
+import re
+import time
+
+# Reconhecimento de páginas de bloqueio e disjuntor por domínio. `classificar_pagina` olha o HTML,
+# a URL final e o status de uma página sem anúncios e diz se é um desafio anti-bot, um captcha, um
+# bloqueio, uma busca sem resultados (fim legítimo da listagem) ou uma página vazia sem explicação.
+# No Chrome, `esperar_cards` usa a mesma classificação para não gastar o tempo inteiro de espera
+# numa página que nunca vai ter cards. Os adaptadores levantam PaginaBloqueada, e o
+# DisjuntorDominio do orquestrador segura o domínio depois de falhas seguidas, reinicia as sessões
+# e volta com uma página de teste, enquanto os outros domínios continuam.
+CLASSE_ANUNCIOS = 'anuncios'
+CLASSE_SEM_RESULTADOS = 'sem_resultados'
+CLASSE_DESAFIO = 'desafio'
+CLASSE_CAPTCHA = 'captcha'
+CLASSE_BLOQUEIO = 'bloqueio'
+CLASSE_VAZIA = 'vazia'
+CLASSES_BLOQUEADAS = (CLASSE_DESAFIO, CLASSE_CAPTCHA, CLASSE_BLOQUEIO)
+STATUS_BLOQUEIO = {403, 429, 503}
+
+# As marcas só valem para páginas sem anúncios: o Cloudflare injeta o script challenge-platform
+# até em páginas normais.
+PADRAO_CAPTCHA = re.compile(
+    r'g-recaptcha|recaptcha/api|h-captcha|hcaptcha\.com|px-captcha|captcha-delivery|cf-turnstile'
+    r'|challenges\.cloudflare\.com/turnstile',
+    re.I
+)
+PADRAO_DESAFIO = re.compile(
+    r'cf-chl|cf_chl_opt|challenge-platform|<title>\s*(just a moment|attention required|um momento)'
+    r'|checking (if the site connection is secure|your browser)|perimeterx|datadome|_incapsula_resource|awswaf',
+    re.I
+)
+PADRAO_BLOQUEIO = re.compile(
+    r'access denied|acesso negado|request unsuccessful|you have been blocked|error 1020|too many requests',
+    re.I
+)
+PADRAO_SEM_RESULTADOS = re.compile(
+    r'nenhum (anúncio|imóvel|imovel|resultado) encontrado|não encontramos (resultados|imóveis|anúncios)'
+    r'|sua busca não (retornou|encontrou)|\b0 (imóveis|resultados)\b',
+    re.I
+)
+PADRAO_URL_BLOQUEIO = re.compile(
+    r'/cdn-cgi/challenge-platform|captcha|validate\.perfdrive\.com|_incapsula_resource|/blocked\b',
+    re.I
+)
+
+# Espera no Chrome
+INTERVALO_VERIFICACAO = 0.5
+ESPERA_DESAFIO = 12  # segundos para um desafio JS se resolver sozinho antes de desistir da página
+
+# Disjuntor
+FALHAS_PARA_ABRIR = 3  # bloqueios/timeouts seguidos que abrem o disjuntor do domínio
+PAUSA_BLOQUEIO = 300  # primeira pausa do domínio; dobra a cada teste que falha
+PAUSA_MAXIMA = 3600
+ABERTURAS_ATE_DESISTIR = 4  # aberturas seguidas sem uma página limpa antes de abandonar o domínio
+FECHADO = 'fechado'
+ABERTO = 'aberto'
+MEIO_ABERTO = 'meio_aberto'
+DESISTIU = 'desistiu'
+
+
+class PaginaBloqueada(Exception):
+    """O portal respondeu com desafio, captcha ou bloqueio em vez da listagem."""
+
+    def __init__(self, classe, url=None):
+        super().__init__(f"{classe} em {url}" if url else classe)
+        self.classe = classe
+        self.url = url
+
+
+def classificar_pagina(html, url=None, status=200, anuncios=0):
+    """Classe (CLASSE_*) de uma página de listagem com `anuncios` cards lidos."""
+    if anuncios:
+        return CLASSE_ANUNCIOS
+    html = html or ''
+    if PADRAO_CAPTCHA.search(html):
+        return CLASSE_CAPTCHA
+    if PADRAO_DESAFIO.search(html) or (url and PADRAO_URL_BLOQUEIO.search(url)):
+        return CLASSE_DESAFIO
+    if status in STATUS_BLOQUEIO or PADRAO_BLOQUEIO.search(html):
+        return CLASSE_BLOQUEIO
+    if PADRAO_SEM_RESULTADOS.search(html):
+        return CLASSE_SEM_RESULTADOS
+    return CLASSE_VAZIA
+
+
+def esperar_cards(driver, seletor, espera, espera_desafio=ESPERA_DESAFIO):
+    """
+    Espera o `seletor` dos cards aparecer no Chrome e retorna a classe da página: CLASSE_ANUNCIOS
+    assim que aparecer; captcha, bloqueio ou busca sem resultados assim que reconhecidos; desafio
+    se não se resolver em `espera_desafio` segundos; vazia (ou a última classe vista) depois de
+    `espera` segundos. A busca é por JavaScript, que não passa pela espera implícita do driver.
+    """
+    inicio = time.monotonic()
+    desafio_desde = None
+    while True:
+        if driver.execute_script("return document.querySelector(arguments[0]) !== null", seletor):
+            return CLASSE_ANUNCIOS
+        classe = classificar_pagina(driver.page_source, driver.current_url)
+        agora = time.monotonic()
+        if classe in (CLASSE_CAPTCHA, CLASSE_BLOQUEIO, CLASSE_SEM_RESULTADOS):
+            return classe
+        if classe == CLASSE_DESAFIO:
+            desafio_desde = desafio_desde or agora
+            if agora - desafio_desde >= espera_desafio:
+                return classe
+        else:
+            desafio_desde = None
+        if agora - inicio >= espera:
+            return classe
+        time.sleep(INTERVALO_VERIFICACAO)
+
+
+class DisjuntorDominio:
+    """
+    Disjuntor de um domínio. Fechado, deixa tudo passar e conta falhas seguidas (bloqueios e
+    timeouts); na `limite`-ésima abre e segura o domínio por `pausa` segundos. Passada a pausa fica
+    meio aberto: uma única página de teste, sem outra em andamento. Se ela vier limpa o disjuntor
+    fecha; se falhar abre de novo com o dobro da pausa (até `pausa_maxima`). Depois de
+    `aberturas_ate_desistir` aberturas seguidas sem página limpa o domínio é abandonado.
+    """
+
+    def __init__(self, dominio, limite=FALHAS_PARA_ABRIR, pausa=PAUSA_BLOQUEIO, pausa_maxima=PAUSA_MAXIMA,
+                 aberturas_ate_desistir=ABERTURAS_ATE_DESISTIR, relogio=time.monotonic):
+        self.dominio = dominio
+        self.limite = limite
+        self.pausa_inicial = pausa
+        self.pausa = pausa
+        self.pausa_maxima = pausa_maxima
+        self.aberturas_ate_desistir = aberturas_ate_desistir
+        self.relogio = relogio
+        self.estado = FECHADO
+        self.falhas = 0
+        self.aberturas_seguidas = 0
+        self.aberturas = 0
+        self.reabre_em = None
+        self.teste_em_andamento = False
+
+    def pode_iniciar(self, ativos=0):
+        """(liberado, segundos até liberar ou None) para começar uma página do domínio agora."""
+        if self.estado == FECHADO:
+            return True, None
+        if self.estado == DESISTIU:
+            return False, None
+        if self.estado == ABERTO:
+            falta = self.reabre_em - self.relogio()
+            if falta > 0:
+                return False, falta
+            self.estado = MEIO_ABERTO
+            self.teste_em_andamento = False
+        return not self.teste_em_andamento and not ativos, None
+
+    def iniciou(self):
+        if self.estado == MEIO_ABERTO:
+            self.teste_em_andamento = True
+
+    def _abrir(self):
+        self.aberturas += 1
+        self.aberturas_seguidas += 1
+        if self.aberturas_seguidas > self.aberturas_ate_desistir:
+            self.estado = DESISTIU
+            return DESISTIU
+        self.estado = ABERTO
+        self.reabre_em = self.relogio() + self.pausa
+        return ABERTO
+
+    def registrar(self, sucesso):
+        """
+        Resultado de uma página do domínio. Retorna o novo estado quando ele muda (ABERTO, FECHADO
+        ou DESISTIU) e None caso contrário. Resultados que chegam com o disjuntor aberto (páginas
+        que já estavam em andamento) não mudam nada.
+        """
+        if self.estado in (ABERTO, DESISTIU):
+            return None
+        if self.estado == MEIO_ABERTO:
+            self.teste_em_andamento = False
+            if sucesso:
+                self.estado, self.falhas, self.aberturas_seguidas, self.pausa = FECHADO, 0, 0, self.pausa_inicial
+                return FECHADO
+            self.pausa = min(self.pausa * 2, self.pausa_maxima)
+            return self._abrir()
+        if sucesso:
+            self.falhas = 0
+            return None
+        self.falhas += 1
+        if self.falhas >= self.limite:
+            self.falhas = 0
+            return self._abrir()
+        return None
+
+    def resumo(self):
+        return f"disjuntor {self.estado}, aberto {self.aberturas} vez(es)"
+
+
+if __name__ == '__main__':
+    # Verificação sem rede (python -m raspagem.bloqueio): classificação das páginas do corpus e de
+    # marcas conhecidas, e a sequência de estados do disjuntor com um relógio falso.
+    from .corpus import casos, ler_pagina, ler_esperado
+    esperadas = {'zapimoveis_desafio': CLASSE_DESAFIO, 'olx_sem_resultados': CLASSE_SEM_RESULTADOS}
+    for caso, _ in casos():
+        classe = classificar_pagina(ler_pagina(caso), anuncios=len(ler_esperado(caso) or []))
+        assert classe == esperadas.get(caso, CLASSE_ANUNCIOS), (caso, classe)
+    assert classificar_pagina('<div class="g-recaptcha" data-sitekey="x"></div>') == CLASSE_CAPTCHA
+    assert classificar_pagina('<div id="px-captcha"></div><script src="//client.perimeterx.net"></script>') == CLASSE_CAPTCHA
+    assert classificar_pagina('<html><body></body></html>', 'https://www.vivareal.com.br/cdn-cgi/challenge-platform/x') == CLASSE_DESAFIO
+    assert classificar_pagina('<h1>Access Denied</h1>') == CLASSE_BLOQUEIO
+    assert classificar_pagina('', status=429) == CLASSE_BLOQUEIO
+    assert classificar_pagina('<main><p>Carregando...</p></main>') == CLASSE_VAZIA
+    assert classificar_pagina('<script src="/cdn-cgi/challenge-platform/main.js"></script>', anuncios=3) == CLASSE_ANUNCIOS
+
+    agora = [0.0]
+    disjuntor = DisjuntorDominio('portal.example', limite=3, pausa=60, pausa_maxima=200,
+                                 aberturas_ate_desistir=3, relogio=lambda: agora[0])
+    assert [disjuntor.registrar(False), disjuntor.registrar(True), disjuntor.registrar(False)] == [None, None, None]
+    assert disjuntor.registrar(False) is None and disjuntor.registrar(False) == ABERTO
+    assert disjuntor.pode_iniciar() == (False, 60) and disjuntor.registrar(False) is None  # página em andamento
+    agora[0] = 60
+    assert disjuntor.pode_iniciar(ativos=1) == (False, None) and disjuntor.pode_iniciar() == (True, None)
+    disjuntor.iniciou()
+    assert disjuntor.pode_iniciar() == (False, None)  # só uma página de teste
+    assert disjuntor.registrar(False) == ABERTO and disjuntor.pausa == 120
+    agora[0] = 180
+    disjuntor.pode_iniciar()
+    disjuntor.iniciou()
+    assert disjuntor.registrar(True) == FECHADO and disjuntor.pausa == 60 and disjuntor.pode_iniciar() == (True, None)
+    for tentativa in range(4):
+        for _ in range(3 if tentativa == 0 else 1):
+            estado = disjuntor.registrar(False)
+        agora[0] += disjuntor.pausa_maxima
+        disjuntor.pode_iniciar()
+        disjuntor.iniciou()
+    assert estado == DESISTIU and disjuntor.pode_iniciar() == (False, None), estado
+    print(f"Verificação OK: {disjuntor.resumo()}.")
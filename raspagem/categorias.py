@@ -0,0 +1,105 @@
+import re
+from .adaptadores import AdaptadorGrupoZap, AdaptadorOlx, AdaptadorInvestt, AdaptadorFacilitaImoveis
+
+# Registro das categorias de todos os portais. Cada categoria é só dado: o adaptador do portal,
+# o nome do arquivo de saída, o template da URL ('{}' recebe o número da página) e os campos
+# fixos ou filtros que a distinguem de outras categorias com a mesma listagem.
+
+
+class CategoriaRaspagem:
+    def __init__(self, adaptador, nome, url_template, tipo_imovel=None, finalidade=None,
+                 filtro_titulo=None, paginas=None):
+        self.adaptador = adaptador
+        self.nome = nome
+        self.url_template = url_template
+        self.tipo_imovel = tipo_imovel
+        self.finalidade = finalidade
+        self.filtro_titulo = re.compile(filtro_titulo, re.I) if filtro_titulo else None
+        self.paginas = paginas or adaptador.paginas
+
+    @property
+    def portal(self):
+        return self.adaptador.nome
+
+    @property
+    def dominio(self):
+        return self.adaptador.dominio
+
+    @property
+    def rotulo(self):
+        return f"{self.adaptador.nome}/{self.nome}"
+
+
+ZAP = AdaptadorGrupoZap('zapimoveis', 'zapimoveis_data')
+VIVAREAL = AdaptadorGrupoZap('vivareal', 'vivareal_data')
+OLX = AdaptadorOlx()
+INVESTT = AdaptadorInvestt()
+FACILITA = AdaptadorFacilitaImoveis()
+
+_FILTRO_GOIANIA = ("&onde=,Goi%C3%A1s,Goi%C3%A2nia,,,,,city,"
+                   "BR%3EGoias%3ENULL%3EGoiania,-16.686891,-49.264794,")
+OLX_VENDA = "https://www.olx.com.br/imoveis/venda/estado-go/grande-goiania-e-anapolis?o={}"
+OLX_ALUGUEL = "https://www.olx.com.br/imoveis/aluguel/estado-go/grande-goiania-e-anapolis?o={}"
+
+CATEGORIAS = [
+    CategoriaRaspagem(ZAP, 'apartamentos_compra',
+                      "https://www.zapimoveis.com.br/venda/apartamentos/go+goiania/?transacao=venda"
+                      + _FILTRO_GOIANIA + "&tipos=apartamento_residencial&pagina={}", 'Apartamento', 'Venda'),
+    CategoriaRaspagem(ZAP, 'apartamentos_aluguel',
+                      "https://www.zapimoveis.com.br/aluguel/apartamentos/go+goiania/?transacao=aluguel"
+                      + _FILTRO_GOIANIA + "&tipos=apartamento_residencial&pagina={}", 'Apartamento', 'Aluguel'),
+    CategoriaRaspagem(ZAP, 'casas_compra',
+                      "https://www.zapimoveis.com.br/venda/casas/go+goiania/?transacao=venda"
+                      + _FILTRO_GOIANIA + "&tipos=casa_residencial&pagina={}", 'Casa', 'Venda'),
+    CategoriaRaspagem(ZAP, 'casas_aluguel',
+                      "https://www.zapimoveis.com.br/aluguel/casas/go+goiania/?transacao=aluguel"
+                      + _FILTRO_GOIANIA + "&tipos=casa_residencial&pagina={}", 'Casa', 'Aluguel'),
+    CategoriaRaspagem(ZAP, 'lote_compra',
+                      "https://www.zapimoveis.com.br/venda/terrenos-lotes-condominios/go+goiania/?transacao=venda"
+                      + _FILTRO_GOIANIA + "&tipos=lote-terreno_residencial&pagina={}", 'Lote', 'Venda'),
+
+    CategoriaRaspagem(VIVAREAL, 'apartamentos_compra',
+                      "https://www.vivareal.com.br/venda/goias/goiania/apartamento_residencial/?transacao=venda"
+                      + _FILTRO_GOIANIA + "&tipos=apartamento_residencial&pagina={}", 'Apartamento', 'Venda'),
+    CategoriaRaspagem(VIVAREAL, 'apartamentos_aluguel',
+                      "https://www.vivareal.com.br/aluguel/goias/goiania/apartamento_residencial/?transacao=aluguel"
+                      + _FILTRO_GOIANIA + "&tipos=apartamento_residencial&pagina={}", 'Apartamento', 'Aluguel'),
+    CategoriaRaspagem(VIVAREAL, 'casas_compra',
+                      "https://www.vivareal.com.br/venda/goias/goiania/casa_residencial/?transacao=venda"
+                      + _FILTRO_GOIANIA + "&tipos=casa_residencial&pagina={}", 'Casa', 'Venda'),
+    CategoriaRaspagem(VIVAREAL, 'casas_aluguel',
+                      "https://www.vivareal.com.br/aluguel/goias/goiania/casa_residencial/?transacao=aluguel"
+                      + _FILTRO_GOIANIA + "&tipos=casa_residencial&pagina={}", 'Casa', 'Aluguel'),
+    CategoriaRaspagem(VIVAREAL, 'terreno_compra',
+                      "https://www.vivareal.com.br/venda/goias/goiania/lote-terreno_residencial/?transacao=venda"
+                      + _FILTRO_GOIANIA + "&tipos=lote-terreno_residencial&pagina={}", 'Terreno', 'Venda'),
+
+    # As categorias da OLX com a mesma listagem compartilham as páginas baixadas (ver orquestrador)
+    CategoriaRaspagem(OLX, 'apartamentos_compra', OLX_VENDA, filtro_titulo=r"\bapartamento\b"),
+    CategoriaRaspagem(OLX, 'casas_compra', OLX_VENDA, filtro_titulo=r"\bcasa\b", paginas=(1, 10)),
+    CategoriaRaspagem(OLX, 'apartamentos_aluguel', OLX_ALUGUEL, filtro_titulo=r"\bapartamento\b"),
+    CategoriaRaspagem(OLX, 'casas_aluguel', OLX_ALUGUEL, filtro_titulo=r"\bcasa\b"),
+
+    CategoriaRaspagem(INVESTT, 'casas_compra', "https://www.investt.com.br/imoveis/a-venda/casa?finalidade=residencial"),
+    CategoriaRaspagem(INVESTT, 'apartamentos_compra', "https://www.investt.com.br/imoveis/a-venda/apartamento?finalidade=residencial"),
+    CategoriaRaspagem(INVESTT, 'casas_aluguel', "https://www.investt.com.br/imoveis/para-alugar/casa?finalidade=residencial"),
+    CategoriaRaspagem(INVESTT, 'apartamentos_aluguel', "https://www.investt.com.br/imoveis/para-alugar/apartamento?finalidade=residencial"),
+    CategoriaRaspagem(INVESTT, 'terrenos_compra', "https://www.investt.com.br/imoveis/a-venda/terreno?finalidade=residencial"),
+
+    CategoriaRaspagem(FACILITA, 'casas_venda', "https://www.facilitaimoveis.com/imovel/venda/casa"),
+    CategoriaRaspagem(FACILITA, 'apartamentos_venda', "https://www.facilitaimoveis.com/imovel/venda/apartamento"),
+    CategoriaRaspagem(FACILITA, 'apartamentos_locacao', "https://www.facilitaimoveis.com/imovel/locacao/apartamento"),
+    CategoriaRaspagem(FACILITA, 'casas_locacao', "https://www.facilitaimoveis.com/imovel/locacao/casa"),
+    CategoriaRaspagem(FACILITA, 'terrenos_venda', "https://www.facilitaimoveis.com/imovel/venda/lote"),
+]
+
+
+def selecionar_categorias(selecao=None):
+    """Categorias pedidas como 'portal' ou 'portal/categoria'; todas quando `selecao` é vazia."""
+    if not selecao:
+        return list(CATEGORIAS)
+    escolhidas = [c for c in CATEGORIAS if c.portal in selecao or c.rotulo in selecao]
+    desconhecidas = set(selecao) - {c.portal for c in CATEGORIAS} - {c.rotulo for c in CATEGORIAS}
+    if desconhecidas:
+        raise ValueError(f"Categorias desconhecidas: {', '.join(sorted(desconhecidas))}")
+    return escolhidas
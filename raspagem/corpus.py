@@ -0,0 +1,174 @@
+import os
+import io
+import sys
+import gzip
+import json
+import time
+import threading
+import contextlib
+from datetime import datetime
+from .extracao import EXTRATORES, EXTRATOR_BS4
+
+# Corpus de páginas gravadas dos portais e a suíte de regressão/vazão dos leitores de cards, que roda
+# sem rede. Cada página fica em fixtures/paginas/<portal>[_<caso>].html.gz e, ao lado, os registros que
+# o leitor do portal deve produzir, em <portal>[_<caso>].esperado.json.gz.
+#   python -m raspagem.corpus                       -> confere todas as páginas com os dois extratores
+#                                                      e mostra cards/s por portal
+#   python -m raspagem.corpus --gravar-esperados    -> grava os esperados que faltam com a saída atual
+#                                                      do extrator de referência (revise antes de
+#                                                      publicar); com nomes de casos, regrava só eles
+#   python -m raspagem --gravar-paginas=DIR ...     -> na raspagem, grava em DIR cada página baixada,
+#                                                      para virar caso do corpus quando um seletor quebrar
+DIRETORIO_CORPUS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fixtures', 'paginas')
+SUFIXO_PAGINA = '.html.gz'
+SUFIXO_ESPERADO = '.esperado.json.gz'
+TEMPO_MINIMO_MEDICAO = 0.3  # segundos de repetição por caso e extrator
+
+_diretorio_gravacao = None
+_trava_gravacao = threading.Lock()
+_gravadas = 0
+
+
+def leitor_do_portal(portal):
+    """Função (html, extrator) -> registros com que a raspagem lê uma página do portal."""
+    from .adaptadores import AdaptadorOlx, AdaptadorInvestt, AdaptadorFacilitaImoveis
+    from .grupo_zap import PORTAIS, registros_do_payload, registros_dos_cards
+    if portal in PORTAIS:
+        # Ordem da coleta por HTTP: JSON embutido e, sem ele, os cards renderizados
+        return lambda html, extrator: registros_do_payload(html, portal) or registros_dos_cards(html, portal, extrator)
+    adaptadores = {'olx': AdaptadorOlx, 'investt': AdaptadorInvestt, 'facilitaimoveis': AdaptadorFacilitaImoveis}
+    if portal not in adaptadores:
+        raise ValueError(f"Portal sem leitor no corpus: {portal!r}")
+    return adaptadores[portal]().extrair
+
+
+def casos(diretorio=DIRETORIO_CORPUS):
+    """[(nome do caso, portal)] das páginas do corpus, em ordem alfabética."""
+    encontrados = []
+    for nome in sorted(os.listdir(diretorio)) if os.path.isdir(diretorio) else []:
+        if nome.endswith(SUFIXO_PAGINA):
+            caso = nome[:-len(SUFIXO_PAGINA)]
+            encontrados.append((caso, caso.split('_', 1)[0]))
+    return encontrados
+
+
+def ler_pagina(caso, diretorio=DIRETORIO_CORPUS):
+    with gzip.open(os.path.join(diretorio, caso + SUFIXO_PAGINA), 'rt', encoding='utf-8') as f:
+        return f.read()
+
+
+def ler_esperado(caso, diretorio=DIRETORIO_CORPUS):
+    """Registros esperados do caso, ou None se ainda não foram gravados."""
+    caminho = os.path.join(diretorio, caso + SUFIXO_ESPERADO)
+    if not os.path.exists(caminho):
+        return None
+    with gzip.open(caminho, 'rt', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _gravar_gzip(caminho, texto):
+    temporario = f'{caminho}.tmp-{os.getpid()}-{threading.get_ident()}'
+    # mtime=0: a mesma página compactada de novo dá o mesmo arquivo
+    with gzip.GzipFile(temporario, 'wb', mtime=0) as f:
+        f.write(texto.encode('utf-8'))
+    os.replace(temporario, caminho)
+
+
+def gravar_esperado(caso, registros, diretorio=DIRETORIO_CORPUS):
+    _gravar_gzip(os.path.join(diretorio, caso + SUFIXO_ESPERADO),
+                 json.dumps(registros, ensure_ascii=False, indent=1) + '\n')
+
+
+def extrair_calado(leitor, html, extrator):
+    """Registros da página sem as mensagens de progresso dos adaptadores."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return leitor(html, extrator)
+
+
+def _primeira_diferenca(esperado, obtido):
+    for indice, (a, b) in enumerate(zip(esperado, obtido)):
+        if json.dumps(a, ensure_ascii=False) != json.dumps(b, ensure_ascii=False):
+            return f"registro {indice}: esperado {a}, obtido {b}"
+    return f"{len(esperado)} registros esperados, {len(obtido)} obtidos"
+
+
+def medir(leitor, html, extrator):
+    """Segundos por leitura da página (média de repetições por pelo menos TEMPO_MINIMO_MEDICAO)."""
+    repeticoes, inicio = 0, time.perf_counter()
+    while repeticoes < 3 or time.perf_counter() - inicio < TEMPO_MINIMO_MEDICAO:
+        extrair_calado(leitor, html, extrator)
+        repeticoes += 1
+    return (time.perf_counter() - inicio) / repeticoes
+
+
+def conferir(diretorio=DIRETORIO_CORPUS, extratores=EXTRATORES):
+    """
+    Lê cada página do corpus com cada extrator e compara com os registros esperados (mesmo JSON).
+    Retorna (falhas, vazao), com as falhas como textos e a vazão como
+    {portal: {'casos', 'cards', extrator: cards/s}}.
+    """
+    falhas, vazao, leitores = [], {}, {}
+    for caso, portal in casos(diretorio):
+        leitor = leitores.setdefault(portal, leitor_do_portal(portal))
+        html, esperado = ler_pagina(caso, diretorio), ler_esperado(caso, diretorio)
+        if esperado is None:
+            falhas.append(f"{caso}: sem registros esperados (python -m raspagem.corpus --gravar-esperados {caso})")
+            continue
+        portal_vazao = vazao.setdefault(portal, {'casos': 0, 'cards': 0, 'segundos': dict.fromkeys(extratores, 0.0)})
+        portal_vazao['casos'] += 1
+        portal_vazao['cards'] += len(esperado)
+        referencia = json.dumps(esperado, ensure_ascii=False)
+        for nome, extrator in extratores.items():
+            obtido = extrair_calado(leitor, html, extrator)
+            if json.dumps(obtido, ensure_ascii=False) != referencia:
+                falhas.append(f"{caso} ({nome}): {_primeira_diferenca(esperado, obtido)}")
+                continue
+            portal_vazao['segundos'][nome] += medir(leitor, html, extrator)
+    for portal_vazao in vazao.values():
+        segundos = portal_vazao.pop('segundos')
+        for nome, total in segundos.items():
+            portal_vazao[nome] = portal_vazao['cards'] / total if total else None
+    return falhas, vazao
+
+
+# --- Gravação de páginas durante a raspagem ---
+def definir_gravacao(diretorio):
+    """Passa a gravar em `diretorio` cada página de listagem baixada (None desliga)."""
+    global _diretorio_gravacao
+    if diretorio:
+        os.makedirs(diretorio, exist_ok=True)
+    _diretorio_gravacao = diretorio or None
+
+
+def gravar_pagina(portal, html, pagina):
+    """Grava a página no diretório de gravação como <portal>_<instante>_p<página>.html.gz, se ligado."""
+    global _gravadas
+    if _diretorio_gravacao is None or not html:
+        return None
+    with _trava_gravacao:
+        _gravadas += 1
+        sequencia = _gravadas
+    caso = f"{portal}_{datetime.now().strftime('%Y%m%d-%H%M%S')}-{sequencia:04d}_p{pagina}"
+    _gravar_gzip(os.path.join(_diretorio_gravacao, caso + SUFIXO_PAGINA), html)
+    return caso
+
+
+if __name__ == '__main__':
+    argumentos = sys.argv[1:]
+    if argumentos and argumentos[0] == '--gravar-esperados':
+        selecionados = set(argumentos[1:])
+        for caso, portal in casos():
+            if (caso in selecionados) if selecionados else ler_esperado(caso) is None:
+                registros = extrair_calado(leitor_do_portal(portal), ler_pagina(caso), EXTRATORES[EXTRATOR_BS4])
+                gravar_esperado(caso, registros)
+                print(f"{caso}: {len(registros)} registros esperados gravados.")
+        sys.exit(0)
+    falhas, vazao = conferir()
+    for portal, medida in sorted(vazao.items()):
+        taxas = ', '.join(f"{nome} {medida[nome]:8.0f} cards/s" for nome in EXTRATORES if medida[nome] is not None)
+        print(f"{portal:16s} {medida['casos']} páginas, {medida['cards']:4d} cards: {taxas}")
+    for falha in falhas:
+        print(f"FALHOU {falha}")
+    if falhas:
+        sys.exit(1)
+    print(f"Corpus OK: {sum(m['casos'] for m in vazao.values())} páginas de {len(vazao)} portais.")
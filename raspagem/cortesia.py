@@ -0,0 +1,145 @@
+import random
+import threading
+
+# Cortesia adaptativa por domínio (AIMD, como o controle de congestionamento do TCP). Em vez de
+# sortear sempre o mesmo intervalo fixo entre duas requisições, cada domínio tem um intervalo
+# atual que começa no meio da faixa configurada no adaptador e:
+#   - encolhe aos poucos (aumento aditivo da taxa em páginas/min) a cada página rápida e com anúncios;
+#   - cresce de uma vez (corte multiplicativo da taxa) em timeout/falha, página sem cards, resposta
+#     bem mais lenta que a média do domínio e, mais forte ainda, em página de desafio anti-bot.
+# O intervalo fica entre um piso (FRACAO_PISO do limite inferior configurado) e um teto (FATOR_TETO
+# vezes o limite superior). A espera depois do carregamento no Chrome acompanha a mesma pressão: no
+# início da faixa do adaptador enquanto o domínio responde bem, subindo até o fim dela depois de
+# bloqueios. Taxa atual e eventos de bloqueio saem no log da execução.
+EVENTO_OK = 'ok'
+EVENTO_VAZIA = 'vazia'  # página sem cards (fim da listagem ou bloqueio disfarçado)
+EVENTO_FALHA = 'falha'  # timeout, erro HTTP/Chrome
+EVENTO_DESAFIO = 'desafio'  # captcha/desafio anti-bot
+EVENTO_LENTA = 'lenta'  # resposta com anúncios, mas bem mais lenta que a média do domínio
+CORTE_DA_TAXA = {EVENTO_VAZIA: 0.5, EVENTO_FALHA: 0.5, EVENTO_DESAFIO: 0.25, EVENTO_LENTA: 0.8}
+FRACAO_PISO = 0.2
+FATOR_TETO = 8
+PAGINAS_ATE_O_PISO = 20  # páginas limpas seguidas para ir do intervalo inicial ao piso
+FATOR_LENTA = 2.0
+SUAVIZACAO_DURACAO = 0.2  # peso da última página na média móvel da duração
+VARIACAO = 0.25  # cada intervalo sorteado em ±25% do atual, para não virar um relógio
+LOG_A_CADA = 10  # páginas limpas entre duas linhas de taxa no log
+
+
+class ControleCortesia:
+    """
+    Intervalo entre inícios de requisição de um domínio, ajustado por AIMD. `intervalo` é a faixa
+    (mínimo, máximo) em segundos configurada no adaptador; (0, 0) desliga a espera.
+    """
+
+    def __init__(self, dominio, intervalo):
+        self.dominio = dominio
+        minimo, maximo = intervalo
+        self.piso = FRACAO_PISO * (minimo or maximo)
+        self.teto = FATOR_TETO * maximo
+        self.intervalo = (minimo + maximo) / 2
+        self.aumento = ((1 / self.piso - 1 / self.intervalo) / PAGINAS_ATE_O_PISO) if self.piso else 0.0
+        self.duracao_media = None
+        self.paginas = 0
+        self.limpas = 0
+        self.eventos = {}
+        self.menor_intervalo = self.maior_intervalo = self.intervalo
+        self._trava = threading.Lock()
+
+    @property
+    def taxa(self):
+        """Páginas por minuto no intervalo atual (None sem espera)."""
+        return 60 / self.intervalo if self.intervalo else None
+
+    def proximo_intervalo(self):
+        """Segundos até a próxima requisição ao domínio."""
+        with self._trava:
+            return self.intervalo * random.uniform(1 - VARIACAO, 1 + VARIACAO)
+
+    def espera_renderizacao(self, faixa):
+        """Pausa depois de a página carregar no Chrome, dentro de `faixa`, proporcional à pressão atual."""
+        inicio, fim = faixa
+        with self._trava:
+            pressao = (self.intervalo - self.piso) / (self.teto - self.piso) if self.teto > self.piso else 0.0
+        return random.uniform(inicio, inicio + (fim - inicio) * min(max(pressao, 0.0), 1.0))
+
+    def registrar(self, evento, duracao=None, referencia=None):
+        """
+        Ajusta o intervalo pelo resultado de uma página: `evento` (EVENTO_*), `duracao` da coleta em
+        segundos e `referencia` para o log ('[rotulo - Página n]').
+        """
+        with self._trava:
+            self.paginas += 1
+            if evento == EVENTO_OK and duracao is not None:
+                lenta = self.duracao_media is not None and self.limpas >= 3 and duracao > FATOR_LENTA * self.duracao_media
+                media = self.duracao_media
+                self.duracao_media = duracao if media is None else media + SUAVIZACAO_DURACAO * (duracao - media)
+                if lenta:
+                    evento = EVENTO_LENTA
+            anterior = self.intervalo
+            if evento == EVENTO_OK:
+                self.limpas += 1
+                if self.intervalo and self.aumento:
+                    self.intervalo = max(self.piso, 1 / (1 / self.intervalo + self.aumento))
+            else:
+                self.eventos[evento] = self.eventos.get(evento, 0) + 1
+                self.intervalo = min(self.teto, self.intervalo / CORTE_DA_TAXA[evento])
+            self.menor_intervalo = min(self.menor_intervalo, self.intervalo)
+            self.maior_intervalo = max(self.maior_intervalo, self.intervalo)
+            atual, limpas = self.intervalo, self.limpas
+        if not atual:
+            return
+        if evento != EVENTO_OK:
+            print(f"  → [cortesia] {self.dominio}: {evento}{' em ' + referencia if referencia else ''}; "
+                  f"{60 / anterior:.1f} → {60 / atual:.1f} pág/min (intervalo {atual:.1f}s).")
+        elif limpas % LOG_A_CADA == 0:
+            print(f"  → [cortesia] {self.dominio}: {60 / atual:.1f} pág/min (intervalo {atual:.1f}s) "
+                  f"após {limpas} páginas limpas.")
+
+    def resumo(self):
+        eventos = ', '.join(f"{evento} {total}" for evento, total in sorted(self.eventos.items())) or 'nenhum'
+        if not self.intervalo and not self.teto:
+            return f"{self.dominio}: sem intervalo de cortesia; eventos: {eventos}"
+        return (f"{self.dominio}: {self.taxa:.1f} pág/min ao final (intervalo {self.intervalo:.1f}s, "
+                f"variou de {self.menor_intervalo:.1f}s a {self.maior_intervalo:.1f}s); eventos: {eventos}")
+
+
+if __name__ == '__main__':
+    # Simulação sem rede nem espera real (python -m raspagem.cortesia): um domínio que passa a servir
+    # desafios acima de 20 páginas/min e fica lento acima de 15. Compara o tempo ocioso de 100 páginas
+    # com o intervalo fixo (5, 15) e com o controle adaptativo na mesma faixa.
+    import io
+    import contextlib
+    random.seed(7)
+    PAGINAS, LIMITE_DESAFIO, LIMITE_LENTO = 100, 20.0, 15.0
+    fixo = sum(random.uniform(5, 15) for _ in range(PAGINAS - 1))
+    controle = ControleCortesia('portal.example', (5, 15))
+    ocioso, desafios, saida = 0.0, 0, io.StringIO()
+    with contextlib.redirect_stdout(saida):
+        for pagina in range(1, PAGINAS + 1):
+            taxa = controle.taxa
+            if taxa > LIMITE_DESAFIO:
+                desafios += 1
+                controle.registrar(EVENTO_DESAFIO, 1.0, f'[simulação - Página {pagina}]')
+            else:
+                controle.registrar(EVENTO_OK, 3.0 if taxa > LIMITE_LENTO else 1.0)
+            if pagina < PAGINAS:
+                ocioso += controle.proximo_intervalo()
+    assert controle.piso == 1.0 and controle.teto == 120 and controle.eventos.get(EVENTO_DESAFIO) == desafios
+    assert controle.taxa <= LIMITE_DESAFIO * 1.2
+    assert ocioso < 0.6 * fixo, (ocioso, fixo)
+    print(saida.getvalue().splitlines()[-1])
+    print(controle.resumo())
+    print(f"Ocioso em {PAGINAS} páginas: intervalo fixo (5, 15) {fixo / 60:.1f} min, adaptativo {ocioso / 60:.1f} min "
+          f"({desafios} desafios provocados).")
+
+    # Falhas seguidas levam ao teto e a espera de renderização ao fim da faixa
+    controle = ControleCortesia('lento.example', (5, 15))
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(10):
+            controle.registrar(EVENTO_FALHA)
+    assert controle.intervalo == controle.teto and controle.espera_renderizacao((2, 5)) >= 2
+    semespera = ControleCortesia('teste.example', (0, 0))
+    semespera.registrar(EVENTO_VAZIA)
+    assert semespera.proximo_intervalo() == 0 and semespera.espera_renderizacao((0, 0)) == 0
+    print("Verificação OK.")
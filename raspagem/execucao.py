@@ -0,0 +1,55 @@
+from .categorias import selecionar_categorias
+from .orquestrador import OrquestradorRaspagem, CONTEXTOS
+from .saida import (arquivo_categoria, existe_categoria, identificadores_conhecidos, compactar_categoria,
+                    carregar_checkpoint, remover_checkpoint, GravacaoCategorias, agora_iso)
+
+
+def executar(selecao=None, contextos=CONTEXTOS, incremental=True):
+    """
+    Raspa as categorias de `selecao` ('portal' ou 'portal/categoria'; todas se vazia), acrescentando
+    cada página ao JSON Lines da categoria assim que ela é lida. No modo `incremental` os anúncios
+    já gravados de cada categoria são carregados e a paginação para quando as páginas deixam de
+    trazer anúncios novos. Categorias com checkpoint de uma execução interrompida retomam nas
+    páginas que faltaram.
+    """
+    categorias, retomadas = [], {}
+    for categoria in selecionar_categorias(selecao):
+        estado = carregar_checkpoint(categoria)
+        if estado is not None:
+            retomadas[categoria.rotulo] = estado
+            print(f"  {categoria.rotulo}: retomando execução de {estado['visto_em']} "
+                  f"({len(estado['paginas'])} páginas já gravadas).")
+        elif categoria.adaptador.pular_se_existir and existe_categoria(categoria):
+            print(f"Arquivo {arquivo_categoria(categoria)} já existe. Pulando...")
+            continue
+        categorias.append(categoria)
+    if not categorias:
+        print("Nenhuma categoria para raspar.")
+        return {}
+    primeiras_vistas = {c.rotulo: identificadores_conhecidos(c) for c in categorias}
+    conhecidos = None
+    if incremental:
+        conhecidos = {rotulo: set(ids) for rotulo, ids in primeiras_vistas.items()}
+        for categoria in categorias:
+            print(f"  {categoria.rotulo}: {len(conhecidos[categoria.rotulo])} anúncios já conhecidos.")
+    destino = GravacaoCategorias(agora_iso(), primeiras_vistas, retomadas)
+    concluida = False
+    try:
+        resultado = OrquestradorRaspagem(
+            categorias, contextos=contextos, conhecidos=conhecidos, destino=destino,
+            paginas_concluidas={rotulo: set(estado['paginas']) for rotulo, estado in retomadas.items()}
+        ).executar()
+        concluida = True
+    finally:
+        destino.fechar(concluida)
+    for categoria in categorias:
+        remover_checkpoint(categoria)
+    return resultado
+
+
+def compactar(selecao=None):
+    """Deixa uma linha por anúncio no JSON Lines de cada categoria de `selecao`."""
+    for categoria in selecionar_categorias(selecao):
+        lidos, gravados = compactar_categoria(categoria)
+        if lidos:
+            print(f"  → {categoria.rotulo}: {lidos} linhas -> {gravados} anúncios em '{arquivo_categoria(categoria)}'.")
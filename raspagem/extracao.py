@@ -0,0 +1,225 @@
+import re
+import threading
+from lxml import etree
+
+# Leitura dos cards das páginas de listagem. Cada portal declara os seus seletores CSS uma vez
+# (`Seletor`) e escreve o mapeamento card -> registro sobre a interface de um extrator; o extrator
+# decide como a página é lida:
+#   'lxml' -> árvore do lxml, com cada seletor traduzido para XPath e compilado uma única vez por
+#             processo (padrão)
+#   'bs4'  -> BeautifulSoup(html, "lxml") + select/select_one do soupsieve, a implementação de referência
+# Os dois produzem registros idênticos: a tradução segue a semântica do soupsieve (os ancestrais de
+# um seletor descendente podem estar fora do card) e o texto segue o get_text() do BeautifulSoup
+# (sem comentários nem o conteúdo de script/style/template/rt/rp).
+# `python -m raspagem.extracao` confere os dois extratores nas páginas salvas e compara os tempos.
+EXTRATOR_LXML = 'lxml'
+EXTRATOR_BS4 = 'bs4'
+EXTRATOR_PADRAO = EXTRATOR_LXML
+ELEMENTOS_SEM_TEXTO = ('script', 'style', 'template', 'rt', 'rp')
+
+PADRAO_TOKEN_CSS = re.compile(r"""
+      (?P<virgula>\s*,\s*)
+    | (?P<combinador>\s*>\s*|\s+)
+    | (?P<tipo>[a-zA-Z][\w-]*|\*)
+    | \.(?P<classe>[\w-]+)
+    | \[\s*(?P<atributo>[\w-]+)\s*(?:(?P<operador>[*^]?=)\s*(?:'(?P<valor>[^']*)'|"(?P<valor_aspas>[^"]*)")\s*)?\]
+""", re.X)
+
+
+def _literal_xpath(valor):
+    return f"'{valor}'" if "'" not in valor else f'"{valor}"'
+
+
+def _condicao(token):
+    if token.group('classe'):
+        return f"contains(concat(' ', normalize-space(@class), ' '), ' {token.group('classe')} ')"
+    atributo, operador = token.group('atributo'), token.group('operador')
+    if operador is None:
+        return f"@{atributo}"
+    valor = token.group('valor') if token.group('valor') is not None else token.group('valor_aspas')
+    if operador == '=':
+        return f"@{atributo}={_literal_xpath(valor)}"
+    if not valor:
+        return 'false()'  # [a*=''] e [a^=''] não casam com nada no CSS
+    funcao = 'contains' if operador == '*=' else 'starts-with'
+    return f"{funcao}(@{atributo}, {_literal_xpath(valor)})"
+
+
+def css_para_xpath(css):
+    """
+    XPath relativo equivalente a `no.select(css)` do BeautifulSoup. Aceita o subconjunto usado
+    pelos portais: tipo, .classe, [atributo], [atributo='v'], [atributo*='v'], [atributo^='v'],
+    descendente (' '), filho ('>') e listas com ','. Outros seletores levantam ValueError.
+    """
+    alternativas, passos, combinador = [], [], None
+    tipo, condicoes = None, []
+
+    def fechar_passo():
+        nonlocal tipo, condicoes
+        if tipo is None and not condicoes:
+            raise ValueError(f"Seletor CSS não suportado: {css!r}")
+        passos.append((combinador, (tipo or '*') + ''.join(f'[{c}]' for c in condicoes)))
+        tipo, condicoes = None, []
+
+    def fechar_alternativa():
+        expressao = None
+        for combinador_passo, passo in passos:
+            if expressao is not None:
+                eixo = 'parent' if combinador_passo == '>' else 'ancestor'
+                passo = f"{passo}[{eixo}::{expressao}]"
+            expressao = passo
+        alternativas.append('.//' + expressao)
+        passos.clear()
+
+    texto, posicao = css.strip(), 0
+    while posicao < len(texto):
+        token = PADRAO_TOKEN_CSS.match(texto, posicao)
+        if token is None or (token.group('tipo') and (tipo is not None or condicoes)):
+            raise ValueError(f"Seletor CSS não suportado: {css!r}")
+        posicao = token.end()
+        if token.group('virgula') is not None:
+            fechar_passo()
+            fechar_alternativa()
+            combinador = None
+        elif token.group('combinador') is not None:
+            fechar_passo()
+            combinador = token.group('combinador').strip() or ' '
+        elif token.group('tipo'):
+            tipo = token.group('tipo').lower()
+        else:
+            condicoes.append(_condicao(token))
+    fechar_passo()
+    fechar_alternativa()
+    return ' | '.join(alternativas)
+
+
+class Seletor:
+    """Seletor CSS de um portal, já compilado para o extrator lxml."""
+    __slots__ = ('css', 'xpath', '_todos', '_primeiro')
+
+    def __init__(self, css):
+        self.css = css
+        self.xpath = css_para_xpath(css)
+        self._todos = etree.XPath(self.xpath, smart_strings=False)
+        self._primeiro = etree.XPath(f'({self.xpath})[1]', smart_strings=False)
+
+    def __repr__(self):
+        return f"Seletor({self.css!r})"
+
+
+class ExtratorLxml:
+    """Árvore do lxml e XPath compilado. Os elementos são etree._Element."""
+    nome = EXTRATOR_LXML
+    _texto = etree.XPath(
+        './/text()[not(' + ' or '.join(f'ancestor::{e}' for e in ELEMENTOS_SEM_TEXTO) + ')]', smart_strings=False
+    )
+
+    def __init__(self):
+        self._local = threading.local()  # um parser por thread do orquestrador
+
+    def _parser(self):
+        parser = getattr(self._local, 'parser', None)
+        if parser is None:
+            parser = self._local.parser = etree.HTMLParser(encoding='utf-8')
+        return parser
+
+    def documento(self, html):
+        raiz = None
+        if html and html.strip():
+            try:
+                raiz = etree.fromstring(html.encode('utf-8', 'replace'), self._parser())
+            except etree.XMLSyntaxError:
+                raiz = None
+        return raiz if raiz is not None else etree.Element('html')
+
+    def todos(self, no, seletor):
+        return seletor._todos(no)
+
+    def primeiro(self, no, seletor):
+        encontrados = seletor._primeiro(no)
+        return encontrados[0] if encontrados else None
+
+    def texto(self, no, strip=False):
+        if strip:
+            return ''.join(parte.strip() for parte in self._texto(no))
+        return ''.join(self._texto(no))
+
+    def atributo(self, no, nome, padrao=None):
+        return no.get(nome, padrao)
+
+    def ancestral(self, no, *tipos):
+        return next(no.iterancestors(*tipos), None)
+
+
+class ExtratorBs4:
+    """BeautifulSoup com o parser lxml, como os scrapers sempre leram as páginas."""
+    nome = EXTRATOR_BS4
+
+    def documento(self, html):
+        from bs4 import BeautifulSoup
+        return BeautifulSoup(html, "lxml")
+
+    def todos(self, no, seletor):
+        return no.select(seletor.css)
+
+    def primeiro(self, no, seletor):
+        return no.select_one(seletor.css)
+
+    def texto(self, no, strip=False):
+        return no.get_text(strip=strip)
+
+    def atributo(self, no, nome, padrao=None):
+        return no.get(nome, padrao)
+
+    def ancestral(self, no, *tipos):
+        return no.find_parent(list(tipos))
+
+
+EXTRATORES = {EXTRATOR_LXML: ExtratorLxml(), EXTRATOR_BS4: ExtratorBs4()}
+_extrator_ativo = EXTRATORES[EXTRATOR_PADRAO]
+
+
+def definir_extrator(nome):
+    """Escolhe o extrator usado pelos adaptadores ('lxml' ou 'bs4')."""
+    global _extrator_ativo
+    if nome not in EXTRATORES:
+        raise ValueError(f"Extrator desconhecido: {nome!r} (opções: {', '.join(EXTRATORES)})")
+    _extrator_ativo = EXTRATORES[nome]
+
+
+def extrator_ativo():
+    return _extrator_ativo
+
+
+if __name__ == '__main__':
+    # python -m raspagem.extracao [portal=pagina.html[.gz] ...]
+    # Lê páginas salvas (por padrão a página principal de cada portal em fixtures/paginas) com os dois
+    # extratores, confere que os registros saem idênticos (mesmo JSON) e compara o tempo por página.
+    # A suíte completa, com os registros esperados de cada página, é `python -m raspagem.corpus`.
+    import os
+    import sys
+    import gzip
+    import json
+    from raspagem.extracao import EXTRATORES as extratores, css_para_xpath as traduzir
+    from raspagem.corpus import DIRETORIO_CORPUS, SUFIXO_PAGINA, leitor_do_portal, extrair_calado, medir
+
+    assert traduzir("ul > li") == ".//li[parent::ul]"
+    assert traduzir("div.a p, [x*='y']") == (".//p[ancestor::div[contains(concat(' ', normalize-space(@class), ' '), ' a ')]]"
+                                             " | .//*[contains(@x, 'y')]")
+
+    paginas = [argumento.split('=', 1) for argumento in sys.argv[1:]] or [
+        (portal, os.path.join(DIRETORIO_CORPUS, portal + SUFIXO_PAGINA))
+        for portal in ('olx', 'zapimoveis', 'vivareal', 'investt', 'facilitaimoveis')
+    ]
+    for portal, caminho in paginas:
+        abrir = gzip.open if caminho.endswith('.gz') else open
+        with abrir(caminho, 'rt', encoding='utf-8') as f:
+            html = f.read()
+        leitor = leitor_do_portal(portal)
+        resultados = {nome: extrair_calado(leitor, html, extrator) for nome, extrator in extratores.items()}
+        tempos = {nome: medir(leitor, html, extrator) for nome, extrator in extratores.items()}
+        assert resultados[EXTRATOR_BS4], f"{portal}: nenhum card em {caminho}"
+        assert json.dumps(resultados[EXTRATOR_LXML], ensure_ascii=False) == json.dumps(resultados[EXTRATOR_BS4], ensure_ascii=False), portal
+        print(f"{portal:16s} {len(resultados[EXTRATOR_BS4]):4d} cards, registros idênticos; "
+              f"bs4 {tempos[EXTRATOR_BS4] * 1000:7.2f} ms/página, lxml {tempos[EXTRATOR_LXML] * 1000:6.2f} ms/página "
+              f"({tempos[EXTRATOR_BS4] / tempos[EXTRATOR_LXML]:.1f}x)")
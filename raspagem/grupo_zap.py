@@ -0,0 +1,541 @@
+import os
+import re
+import json
+import time
+import random
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from .extracao import Seletor, extrator_ativo
+from .corpus import gravar_pagina
+from .cortesia import ControleCortesia, EVENTO_OK, EVENTO_VAZIA, EVENTO_FALHA, EVENTO_DESAFIO
+from .bloqueio import (PaginaBloqueada, DisjuntorDominio, classificar_pagina, esperar_cards, CLASSES_BLOQUEADAS,
+                       CLASSE_ANUNCIOS, CLASSE_SEM_RESULTADOS, CLASSE_VAZIA, ABERTO, DESISTIU)
+from .parsers import parse_price, parse_area, parse_integer
+from RecursosNavegador import aplicar_perfil
+
+# Coleta das páginas de listagem do ZapImóveis e do VivaReal (mesma plataforma, mesmo HTML). No modo
+# HTTP a página é baixada por uma sessão com pool de conexões e os anúncios saem do JSON que o
+# servidor já embute no HTML (__NEXT_DATA__ do Next.js ou JSON-LD), sem abrir navegador. O Chrome
+# (undetected_chromedriver) só é usado quando o portal responde com uma página de desafio
+# anti-bot ou quando o HTML não traz anúncios; a partir daí o resto da execução segue no Chrome.
+MODO_HTTP = 'http'
+MODO_CHROME = 'chrome'
+MODO_COLETA_PADRAO = MODO_HTTP
+PAGE_DELAY_PADRAO = (5, 15)  # faixa de cortesia entre páginas; o ControleCortesia ajusta dentro dela
+ESPERA_RENDERIZACAO = (2, 5)
+TEMPO_LIMITE_HTTP = (10, 30)  # (conexão, leitura) em segundos
+TAMANHO_POOL_HTTP = 8
+ESPERA_CHROME = 35  # segundos aguardando os cards renderizarem no Chrome
+
+PORTAIS = {
+    'zapimoveis': {
+        'dominio': 'https://www.zapimoveis.com.br',
+        'seletor_localizacao': "[data-cy='rp-cardProperty-location-txt'] span",
+        'coleta_comodos': True,
+    },
+    'vivareal': {
+        'dominio': 'https://www.vivareal.com.br',
+        'seletor_localizacao': "[data-cy='rp-cardProperty-location-txt']",
+        'coleta_comodos': False,
+    },
+}
+
+SELETOR_CARDS = "div.flex.flex-col.grow.min-w-0.content-stretch.border-neutral-90"
+CARDS = Seletor(SELETOR_CARDS)
+LINK_CARD = Seletor("a[data-cy='card-link']")
+LOCALIZACAO = {portal: Seletor(config['seletor_localizacao']) for portal, config in PORTAIS.items()}
+RUA = Seletor("[data-cy='rp-cardProperty-street-txt']")
+PRECO = Seletor("div[data-cy='rp-cardProperty-price-txt'] p.font-semibold")
+AREA = Seletor("li[data-cy='rp-cardProperty-propertyArea-txt'] h3")
+QUARTOS = Seletor("li[data-cy='rp-cardProperty-bedroomQuantity-txt'] h3")
+BANHEIROS = Seletor("li[data-cy='rp-cardProperty-bathroomQuantity-txt'] h3")
+VAGAS = Seletor("li[data-cy='rp-cardProperty-parkingSpacesQuantity-txt'] h3")
+
+USER_AGENTS = [
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) Gecko/20100101 Firefox/120.0',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:109.0) Gecko/20100101 Firefox/120.0',
+]
+
+PADRAO_NEXT_DATA = re.compile(r'<script[^>]*\bid=["\']__NEXT_DATA__["\'][^>]*>(.*?)</script>', re.S | re.I)
+PADRAO_JSON_LD = re.compile(r'<script[^>]*\btype=["\']application/ld\+json["\'][^>]*>(.*?)</script>', re.S | re.I)
+_sessao_http = None
+
+
+def _numero(valor):
+    """Números do JSON embutido vêm como número, texto ('350000') ou lista com um valor só."""
+    if isinstance(valor, list):
+        valor = valor[0] if valor else None
+    if isinstance(valor, dict):
+        valor = valor.get('value')
+    if valor is None or isinstance(valor, bool):
+        return None
+    if isinstance(valor, (int, float)):
+        return float(valor)
+    try:
+        return float(str(valor).strip())
+    except ValueError:
+        return parse_price(str(valor))
+
+
+def _inteiro(valor):
+    numero = _numero(valor)
+    return int(numero) if numero is not None else None
+
+
+def montar_endereco(rua, localizacao):
+    if rua and localizacao:
+        return f"{rua}, {localizacao}, Goiânia, Brasil"
+    if localizacao:
+        return f"{localizacao}, Goiânia, Brasil"
+    return None
+
+
+def _registro(portal, endereco, preco, area, quartos, banheiros, vagas, link):
+    config = PORTAIS[portal]
+    if link and not link.startswith("http"):
+        link = config['dominio'] + link
+    return {
+        "tipo_imovel": None,
+        "finalidade": None,
+        "endereco": endereco,
+        "preco": preco,
+        "area_m2": area,
+        "quartos": quartos if config['coleta_comodos'] else None,
+        "banheiros": banheiros if config['coleta_comodos'] else None,
+        "vagas": vagas if config['coleta_comodos'] else None,
+        "link": link,
+        "geolocalizacao": None,
+        "fonte": portal
+    }
+
+
+# --- Extração dos anúncios ---
+def registros_dos_cards(html, portal, extrator=None):
+    """Caminho antigo: lê os cards renderizados (HTML do Chrome ou servidor que já entrega os cards)."""
+    ex = extrator or extrator_ativo()
+    registros = []
+    for c in ex.todos(ex.documento(html), CARDS):
+        a = ex.ancestral(c, "a")
+        if a is None:
+            a = ex.primeiro(c, LINK_CARD)
+        link = ex.atributo(a, "href") if a is not None else None
+
+        loc_elem = ex.primeiro(c, LOCALIZACAO[portal])
+        street_elem = ex.primeiro(c, RUA)
+        location = ex.texto(loc_elem, strip=True) if loc_elem is not None else None
+        street_txt = ex.texto(street_elem, strip=True) if street_elem is not None else None
+
+        price_elem = ex.primeiro(c, PRECO)
+        area_elem = ex.primeiro(c, AREA)
+        bed_elem = ex.primeiro(c, QUARTOS)
+        bath_elem = ex.primeiro(c, BANHEIROS)
+        park_elem = ex.primeiro(c, VAGAS)
+
+        registros.append(_registro(
+            portal,
+            montar_endereco(street_txt, location),
+            parse_price(ex.texto(price_elem)) if price_elem is not None else None,
+            parse_area(ex.texto(area_elem)) if area_elem is not None else None,
+            parse_integer(ex.texto(bed_elem)) if bed_elem is not None else None,
+            parse_integer(ex.texto(bath_elem)) if bath_elem is not None else None,
+            parse_integer(ex.texto(park_elem)) if park_elem is not None else None,
+            link,
+        ))
+    return registros
+
+
+def _anuncios_next_data(no):
+    """Percorre o __NEXT_DATA__ atrás dos objetos {"listing": {...}, "link": {...}} da busca."""
+    if isinstance(no, dict):
+        anuncio = no.get('listing')
+        if isinstance(anuncio, dict) and ('address' in anuncio or 'pricingInfos' in anuncio):
+            yield no
+            return
+        for valor in no.values():
+            yield from _anuncios_next_data(valor)
+    elif isinstance(no, list):
+        for valor in no:
+            yield from _anuncios_next_data(valor)
+
+
+def _registro_next_data(item, portal, transacao):
+    anuncio = item['listing']
+    endereco = anuncio.get('address') or {}
+    rua = endereco.get('street')
+    if rua and endereco.get('streetNumber'):
+        rua = f"{rua}, {endereco['streetNumber']}"
+    localizacao = ", ".join(p for p in (endereco.get('neighborhood'), endereco.get('city')) if p) or None
+
+    precos = anuncio.get('pricingInfos') or []
+    preco_info = next((p for p in precos if p.get('businessType') == transacao), precos[0] if precos else {})
+    area = _inteiro(anuncio.get('usableAreas')) or _inteiro(anuncio.get('totalAreas'))
+
+    link = item.get('link')
+    if isinstance(link, dict):
+        link = link.get('href')
+    return _registro(
+        portal, montar_endereco(rua, localizacao), _numero(preco_info.get('price')), area,
+        _inteiro(anuncio.get('bedrooms')), _inteiro(anuncio.get('bathrooms')),
+        _inteiro(anuncio.get('parkingSpaces')), link,
+    )
+
+
+def _anuncios_json_ld(no):
+    """Itens de um ItemList do schema.org (ListItem com 'item' dentro ou o próprio imóvel)."""
+    if isinstance(no, list):
+        for valor in no:
+            yield from _anuncios_json_ld(valor)
+    elif isinstance(no, dict):
+        if '@graph' in no:
+            yield from _anuncios_json_ld(no['@graph'])
+        elif no.get('@type') == 'ItemList':
+            for elemento in no.get('itemListElement') or []:
+                item = elemento.get('item', elemento) if isinstance(elemento, dict) else None
+                if isinstance(item, dict) and ('address' in item or 'offers' in item):
+                    yield item
+
+
+def _registro_json_ld(item, portal):
+    endereco = item.get('address') or {}
+    if isinstance(endereco, str):
+        rua, localizacao = None, endereco
+    else:
+        rua = endereco.get('streetAddress')
+        localizacao = ", ".join(p for p in (endereco.get('addressLocality'), endereco.get('addressRegion')) if p) or None
+    ofertas = item.get('offers') or {}
+    if isinstance(ofertas, list):
+        ofertas = ofertas[0] if ofertas else {}
+    return _registro(
+        portal, montar_endereco(rua, localizacao), _numero(ofertas.get('price')), _inteiro(item.get('floorSize')),
+        _inteiro(item.get('numberOfBedrooms') or item.get('numberOfRooms')),
+        _inteiro(item.get('numberOfBathroomsTotal')), None, item.get('url'),
+    )
+
+
+def registros_do_payload(html, portal, transacao='SALE'):
+    """
+    Anúncios do JSON embutido no HTML do servidor: primeiro o __NEXT_DATA__ e, se ele não trouxer
+    nada, os blocos JSON-LD. `transacao` ('SALE' ou 'RENTAL') escolhe o preço quando o anúncio
+    tem venda e aluguel. Retorna a lista de registros (vazia se não houver payload reconhecível).
+    """
+    m = PADRAO_NEXT_DATA.search(html)
+    if m:
+        try:
+            dados = json.loads(m.group(1))
+        except ValueError:
+            dados = None
+        registros = [_registro_next_data(item, portal, transacao) for item in _anuncios_next_data(dados)]
+        if registros:
+            return registros
+    registros = []
+    for bloco in PADRAO_JSON_LD.findall(html):
+        try:
+            dados = json.loads(bloco)
+        except ValueError:
+            continue
+        registros.extend(_registro_json_ld(item, portal) for item in _anuncios_json_ld(dados))
+    return registros
+
+
+def e_pagina_de_desafio(html, status=200):
+    """Página de desafio anti-bot (captcha/JS challenge) ou bloqueio. Use só em páginas sem anúncios."""
+    return classificar_pagina(html, status=status) in CLASSES_BLOQUEADAS
+
+
+# --- Sessões ---
+def obter_sessao_http():
+    """Sessão HTTP do processo, com pool de conexões keep-alive e cabeçalhos de navegador."""
+    global _sessao_http
+    if _sessao_http is None:
+        sessao = requests.Session()
+        adaptador = HTTPAdapter(
+            pool_connections=TAMANHO_POOL_HTTP, pool_maxsize=TAMANHO_POOL_HTTP,
+            max_retries=Retry(total=2, backoff_factor=1, status_forcelist=(500, 502, 504), allowed_methods=('GET',)),
+        )
+        sessao.mount('https://', adaptador)
+        sessao.mount('http://', adaptador)
+        sessao.headers.update({
+            'User-Agent': random.choice(USER_AGENTS),
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'pt-BR,pt;q=0.9,en-US;q=0.7,en;q=0.6',
+        })
+        _sessao_http = sessao
+    return _sessao_http
+
+
+def reiniciar_sessao_http():
+    """Descarta a sessão HTTP (cookies e conexões marcados pelo portal); a próxima página abre outra."""
+    global _sessao_http
+    sessao, _sessao_http = _sessao_http, None
+    if sessao is not None:
+        sessao.close()
+
+
+def criar_driver_chrome(headless=False):
+    # Importado aqui: no modo HTTP o Chrome só é necessário se aparecer um desafio
+    import undetected_chromedriver as uc
+    opts = uc.ChromeOptions()
+    if headless:
+        opts.add_argument("--headless=new")
+    opts.add_argument("--no-sandbox")
+    opts.add_argument("--disable-dev-shm-usage")
+    opts.add_argument("--disable-blink-features=AutomationControlled")
+    opts.add_argument(f"--user-agent={random.choice(USER_AGENTS)}")
+    opts.add_argument("--disable-gpu")
+    opts.add_argument("--window-size=1920,1080")
+    opts.add_argument("--disable-extensions")
+    opts.add_argument("--disable-infobars")
+    driver = uc.Chrome(options=opts)
+    driver.implicitly_wait(15)
+    aplicar_perfil(driver, 'listagem')  # só o DOM importa: sem imagens, mídia, fontes e analytics
+    return driver
+
+
+class ColetorGrupoZap:
+    """Raspa as páginas `start`..`end` de `url_template` ('...&pagina={}') de um portal do Grupo ZAP."""
+
+    def __init__(self, portal, url_template, modo=MODO_COLETA_PADRAO, headless=False,
+                 page_delay=PAGE_DELAY_PADRAO, rotulo=None, pool_navegadores=None, controle=None):
+        self.portal = portal
+        self.url_template = url_template
+        self.modo = modo
+        self.modo_inicial = modo
+        self.headless = headless
+        self.page_delay = page_delay
+        self.rotulo = rotulo or portal
+        self.transacao = 'RENTAL' if '/aluguel/' in url_template else 'SALE'
+        self.driver = None
+        self.pool_navegadores = pool_navegadores  # com pool, o Chrome é emprestado a cada página
+        # No orquestrador o controle é o do domínio, compartilhado com as outras listagens do portal
+        self.controle = controle or ControleCortesia(PORTAIS[portal]['dominio'].split('://', 1)[1], page_delay)
+        self.falha_driver = False
+        self.paginas_http = 0
+        self.paginas_chrome = 0
+        self.desafios = 0
+        if modo == MODO_CHROME:
+            self._init_driver()
+
+    def _init_driver(self):
+        print("Inicializando driver com undetected_chromedriver...")
+        try:
+            self.driver = criar_driver_chrome(self.headless)
+            print("Driver inicializado com sucesso.")
+        except Exception as e:
+            print(f"ERRO: Falha ao inicializar o driver: {e}")
+            print("Verifique se o Google Chrome está instalado, se a versão é compatível com o undetected_chromedriver, e se não há processos de Chrome/WebDriver pendurados.")
+            self.driver = None
+            self.falha_driver = True
+        return self.driver
+
+    def disponivel(self):
+        return self.modo == MODO_HTTP or self.driver is not None or self.pool_navegadores is not None
+
+    def _pagina_http(self, url, page):
+        """Retorna os registros da página ou None quando é preciso recorrer ao Chrome."""
+        try:
+            resposta = obter_sessao_http().get(url, timeout=TEMPO_LIMITE_HTTP)
+        except requests.RequestException as e:
+            print(f"  → Falha HTTP ({type(e).__name__}). Usando o Chrome nesta página.")
+            return None
+        gravar_pagina(self.portal, resposta.text, page)
+        registros = registros_do_payload(resposta.text, self.portal, self.transacao)
+        if not registros and resposta.status_code == 200:
+            registros = registros_dos_cards(resposta.text, self.portal)
+        if registros:
+            self.paginas_http += 1
+            return registros
+        classe = classificar_pagina(resposta.text, resposta.url, resposta.status_code)
+        if classe == CLASSE_SEM_RESULTADOS and resposta.status_code == 200:
+            self.paginas_http += 1
+            return []  # a busca acabou: não vale abrir o Chrome para confirmar
+        if classe in CLASSES_BLOQUEADAS:
+            self.desafios += 1
+            print(f"  → Página de {classe} (HTTP {resposta.status_code}). Mudando para o Chrome.")
+            self.controle.registrar(EVENTO_DESAFIO, referencia=f"[{self.rotulo} - Página {page}]")
+            self.modo = MODO_CHROME
+        else:
+            print(f"  → HTTP {resposta.status_code} sem anúncios no HTML. Usando o Chrome nesta página.")
+        return None
+
+    def _renderizar(self, driver, url, page):
+        """
+        Carrega a página no Chrome; None se os cards não aparecerem a tempo e PaginaBloqueada se o
+        portal responder com desafio, captcha ou bloqueio.
+        """
+        from selenium.common.exceptions import TimeoutException
+        try:
+            driver.get(url)
+            print("  → Página carregada. Aguardando elementos...")
+            classe = esperar_cards(driver, PORTAIS[self.portal]['seletor_localizacao'], ESPERA_CHROME)
+        except TimeoutException:
+            classe = CLASSE_VAZIA
+        if classe in CLASSES_BLOQUEADAS:
+            self.desafios += 1
+            raise PaginaBloqueada(classe, url)
+        if classe == CLASSE_VAZIA:
+            print(f"  → Timeout ao carregar a página {page}. Pulando.")
+            return None
+        if classe == CLASSE_ANUNCIOS:
+            time.sleep(self.controle.espera_renderizacao(ESPERA_RENDERIZACAO))
+        html = driver.page_source
+        gravar_pagina(self.portal, html, page)
+        self.paginas_chrome += 1
+        return registros_dos_cards(html, self.portal) or registros_do_payload(html, self.portal, self.transacao)
+
+    def _pagina_chrome(self, url, page):
+        if self.pool_navegadores is not None:
+            try:
+                driver = self.pool_navegadores.emprestar()
+            except Exception as e:
+                print(f"ERRO: Falha ao inicializar o driver: {e}")
+                self.falha_driver = True
+                return None
+            erro = True  # inclusive PaginaBloqueada: a sessão marcada pelo portal não volta ao pool
+            try:
+                registros = self._renderizar(driver, url, page)
+                erro = False
+            finally:
+                self.pool_navegadores.devolver(driver, erro=erro)
+            return registros
+        if self.driver is None and (self.falha_driver or self._init_driver() is None):
+            return None
+        return self._renderizar(self.driver, url, page)
+
+    def coletar_pagina(self, page):
+        url = self.url_template.format(page)
+        print(f"\n[{self.rotulo} - Página {page}] Acessando {url} ({self.modo})")
+        registros = self._pagina_http(url, page) if self.modo == MODO_HTTP else None
+        if registros is None:
+            registros = self._pagina_chrome(url, page)
+        return registros
+
+    def _pausar_bloqueio(self, disjuntor):
+        """Disjuntor aberto: espera a pausa do domínio e recomeça com sessões novas."""
+        print(f"  → [disjuntor] {disjuntor.dominio}: falhas seguidas; pausando {disjuntor.pausa:.0f}s "
+              f"e reiniciando as sessões.")
+        self.fechar()
+        reiniciar_sessao_http()
+        self.modo = self.modo_inicial
+        time.sleep(disjuntor.pausa)
+        disjuntor.pode_iniciar()
+
+    def scrape(self, start, end):
+        records = []
+        disjuntor = DisjuntorDominio(self.controle.dominio)
+        for page in range(start, end + 1):
+            inicio = time.monotonic()
+            disjuntor.iniciou()
+            try:
+                registros = self.coletar_pagina(page)
+                evento = EVENTO_FALHA if registros is None else (EVENTO_OK if registros else EVENTO_VAZIA)
+            except PaginaBloqueada as e:
+                print(f"  → Página {page} bloqueada pelo portal ({e.classe}).")
+                registros, evento = None, EVENTO_DESAFIO
+            except Exception as page_e:
+                print(f"  → Erro inesperado ao processar a página {page}: {page_e}")
+                registros, evento = None, EVENTO_FALHA
+            self.controle.registrar(evento, time.monotonic() - inicio, f"[{self.rotulo} - Página {page}]")
+            estado = disjuntor.registrar(registros is not None)
+            if estado == DESISTIU:
+                print(f"  → [disjuntor] {disjuntor.dominio}: bloqueio persistente. Encerrando.")
+                break
+            if estado == ABERTO:
+                self._pausar_bloqueio(disjuntor)
+            if registros is None:
+                if self.falha_driver:
+                    print("  → Sem Chrome disponível para a página bloqueada. Encerrando.")
+                    break
+            else:
+                print(f"  → {len(registros)} anúncios encontrados.")
+                if not registros and page == start:
+                    print("  → Sem resultados na primeira página. Verifique seletores, URL ou bloqueio.")
+                    break
+                records.extend(registros)
+            if page < end:
+                delay = self.controle.proximo_intervalo()
+                print(f"  → Aguardando {delay:.1f}s...")
+                time.sleep(delay)
+        print(f"  → Páginas por HTTP: {self.paginas_http}, pelo Chrome: {self.paginas_chrome}, desafios: {self.desafios}.")
+        print(f"  → Cortesia: {self.controle.resumo()}; {disjuntor.resumo()}.")
+        self.fechar()
+        return records
+
+    def fechar(self):
+        if self.driver:
+            print("Fechando driver...")
+            try:
+                self.driver.quit()
+                print("Driver fechado.")
+            except Exception as e:
+                print(f"Erro ao fechar driver: {e}")
+            self.driver = None
+
+
+if __name__ == '__main__':
+    import sys
+    DIRETORIO_FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fixtures', 'grupo_zap')
+
+    def ler_fixture(nome):
+        with open(os.path.join(DIRETORIO_FIXTURES, nome), 'r', encoding='utf-8') as f:
+            return f.read()
+
+    # Verificação com as páginas salvas em fixtures/grupo_zap
+    zap = registros_do_payload(ler_fixture('zap_next_data.html'), 'zapimoveis')
+    assert len(zap) == 3, len(zap)
+    assert zap[0] == {
+        "tipo_imovel": None, "finalidade": None,
+        "endereco": "Rua T 41, 120, Setor Bueno, Goiânia, Goiânia, Brasil",
+        "preco": 650000.0, "area_m2": 92, "quartos": 3, "banheiros": 2, "vagas": 2,
+        "link": "https://www.zapimoveis.com.br/imovel/venda-apartamento-3-quartos-setor-bueno-goiania-go-92m2-id-2700000001/",
+        "geolocalizacao": None, "fonte": "zapimoveis",
+    }, zap[0]
+    assert zap[1]['preco'] == 410000.0 and zap[1]['endereco'] == "Jardim Goiás, Goiânia, Goiânia, Brasil"
+    aluguel = registros_do_payload(ler_fixture('zap_next_data.html'), 'zapimoveis', 'RENTAL')
+    assert aluguel[1]['preco'] == 2500.0, aluguel[1]
+
+    viva = registros_do_payload(ler_fixture('vivareal_json_ld.html'), 'vivareal')
+    assert len(viva) == 2 and viva[0]['quartos'] is None, viva
+    assert viva[0]['endereco'] == "Avenida T 9, Setor Bueno, Goiânia, Goiânia, Brasil", viva[0]
+    assert viva[1]['preco'] == 1050000.0 and viva[1]['area_m2'] == 555, viva[1]
+
+    cards_html = ler_fixture('zap_cards.html')
+    assert registros_do_payload(cards_html, 'zapimoveis') == []
+    cards = registros_dos_cards(cards_html, 'zapimoveis')
+    assert [(r['endereco'], r['preco'], r['area_m2'], r['quartos']) for r in cards] == [
+        ("Rua 10, Setor Oeste, Goiânia, Goiânia, Brasil", 480000.0, 75, 2),
+        ("Jardim América, Goiânia, Goiânia, Brasil", 1200.0, 50, 1),
+    ], cards
+
+    desafio = ler_fixture('desafio_cloudflare.html')
+    assert registros_do_payload(desafio, 'zapimoveis') == [] and registros_dos_cards(desafio, 'zapimoveis') == []
+    assert e_pagina_de_desafio(desafio, 403) and e_pagina_de_desafio(desafio, 200)
+    assert not e_pagina_de_desafio(cards_html, 200)
+    print("Fixtures do Grupo ZAP: OK")
+
+    # Custo só de extração (sem rede) de cada caminho
+    for nome, funcao, html in (('payload', registros_do_payload, ler_fixture('zap_next_data.html')),
+                               ('cards', registros_dos_cards, cards_html)):
+        inicio = time.perf_counter()
+        for _ in range(200):
+            funcao(html, 'zapimoveis')
+        print(f"Extração via {nome}: {(time.perf_counter() - inicio) / 200 * 1000:.2f} ms por página")
+
+    # Benchmark com rede: python -m raspagem.grupo_zap benchmark [paginas]
+    # Mede páginas por minuto de cada modo sem o intervalo de cortesia entre páginas.
+    if len(sys.argv) > 1 and sys.argv[1] == 'benchmark':
+        paginas = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+        template = ("https://www.zapimoveis.com.br/venda/apartamentos/go+goiania/"
+                    "?transacao=venda&onde=,Goi%C3%A1s,Goi%C3%A2nia,,,,,city,"
+                    "BR%3EGoias%3ENULL%3EGoiania,-16.686891,-49.264794,"
+                    "&tipos=apartamento_residencial&pagina={}")
+        for modo in (MODO_HTTP, MODO_CHROME):
+            coletor = ColetorGrupoZap('zapimoveis', template, modo=modo, headless=True, page_delay=(0, 0))
+            inicio = time.perf_counter()
+            registros = coletor.scrape(1, paginas)
+            minutos = (time.perf_counter() - inicio) / 60
+            print(f"Modo {modo}: {paginas / minutos:.1f} páginas/min, {len(registros)} anúncios "
+                  f"({coletor.paginas_http} por HTTP, {coletor.paginas_chrome} pelo Chrome).")
@@ -0,0 +1,394 @@
+import time
+import threading
+from PoolNavegadores import PoolNavegadores
+from .grupo_zap import criar_driver_chrome
+from .cortesia import ControleCortesia, EVENTO_OK, EVENTO_VAZIA, EVENTO_FALHA, EVENTO_DESAFIO
+from .bloqueio import (DisjuntorDominio, PaginaBloqueada, FALHAS_PARA_ABRIR, PAUSA_BLOQUEIO, ABERTO, FECHADO,
+                       DESISTIU)
+
+# Orquestrador da raspagem: em vez de um processo (e um Chrome) por script rodando as páginas em
+# sequência, todas as categorias viram uma fila de tarefas (listagem, página) atendida por
+# CONTEXTOS threads. Cada domínio tem o seu limite de páginas simultâneas e o seu intervalo de
+# cortesia entre o início de duas requisições (a faixa vem do adaptador do portal e o intervalo
+# dentro dela é ajustado pelo ControleCortesia conforme o domínio responde), então domínios
+# diferentes avançam em paralelo e uma atualização completa leva o tempo do domínio mais lento,
+# não a soma de todas as categorias. Categorias que usam a mesma listagem (as da OLX, separadas
+# pelo título) compartilham as páginas baixadas. As sessões do Chrome vêm de um PoolNavegadores
+# compartilhado por todos os portais. Cada domínio tem ainda um DisjuntorDominio: depois de falhas
+# seguidas (bloqueios, timeouts) o domínio pausa, as suas sessões são reiniciadas e ele volta com uma
+# página de teste, enquanto os outros domínios seguem; páginas bloqueadas voltam para a fila.
+CONTEXTOS = 6
+PAGINAS_SEM_NOVOS = 3  # modo incremental: para a listagem após K páginas seguidas sem anúncio inédito
+
+
+class LimiteDominio:
+    """Estado de um domínio: páginas em andamento, fila de tarefas e próximo início permitido."""
+
+    def __init__(self, dominio, concorrencia, intervalo, disjuntor=None):
+        self.dominio = dominio
+        self.concorrencia = concorrencia
+        self.intervalo = intervalo
+        self.controle = ControleCortesia(dominio, intervalo)
+        self.disjuntor = disjuntor or DisjuntorDominio(dominio)
+        self.fila = []
+        self.ativos = 0
+        self.proximo_inicio = 0.0
+        self.paginas = 0
+        self.inicio = None
+        self.fim = None
+
+
+class Listagem:
+    """Uma URL paginada de um portal e as categorias que saem dela."""
+
+    def __init__(self, adaptador, url_template):
+        self.adaptador = adaptador
+        self.url_template = url_template
+        self.categorias = []
+
+    @property
+    def rotulo(self):
+        return "+".join(c.rotulo for c in self.categorias)
+
+
+class OrquestradorRaspagem:
+    """
+    Executa as páginas de `categorias` (CategoriaRaspagem) com `contextos` threads. A coleta de cada
+    página é do adaptador do portal: registros, [] quando a listagem acabou ou None quando a página
+    falhou. `limites` ({domínio: (simultâneas, intervalo)}) substitui os limites dos adaptadores.
+    Com `conhecidos` ({rotulo: identificadores já gravados}) a execução é incremental: a listagem
+    para depois de `paginas_sem_novos` páginas seguidas sem nenhum anúncio inédito. Com `destino`
+    (objeto com `gravar_pagina(categoria, pagina, registros)`) cada página é entregue assim que é lida.
+    `paginas_concluidas` ({rotulo: páginas}) são as páginas de uma execução interrompida que já
+    estão gravadas: uma listagem só baixa a página se alguma das suas categorias ainda precisar dela.
+    `falhas_para_abrir` e `pausa_bloqueio` configuram o disjuntor de cada domínio.
+    `executar()` retorna {rotulo da categoria: [registros]}.
+    """
+
+    def __init__(self, categorias, contextos=CONTEXTOS, limites=None, fabrica_driver=None,
+                 conhecidos=None, paginas_sem_novos=PAGINAS_SEM_NOVOS, destino=None,
+                 paginas_concluidas=None, falhas_para_abrir=FALHAS_PARA_ABRIR, pausa_bloqueio=PAUSA_BLOQUEIO):
+        self.categorias = categorias
+        self.contextos = contextos
+        self.conhecidos = conhecidos
+        self.paginas_sem_novos = paginas_sem_novos
+        self.destino = destino
+        self.sem_novos = {}  # listagem -> páginas concluídas sem anúncio inédito
+        # Uma página bloqueada volta para a fila; a que abre o disjuntor ainda é a página de teste
+        self.tentativas_bloqueada = falhas_para_abrir + 1
+        self.bloqueios = {}  # (listagem, página) -> vezes que veio bloqueada
+        self.fabrica_driver = fabrica_driver or (lambda: criar_driver_chrome(headless=True))
+        self.registros = {c.rotulo: {} for c in categorias}  # rotulo -> {página: registros}
+        self.ultima_pagina = {}  # listagem -> última página com anúncios, quando acabou antes do fim
+        self.listagens = {}
+        for categoria in categorias:
+            chave = (id(categoria.adaptador), categoria.url_template)
+            self.listagens.setdefault(chave, Listagem(categoria.adaptador, categoria.url_template)).categorias.append(categoria)
+        self.dominios = {}
+        for listagem in self.listagens.values():
+            adaptador = listagem.adaptador
+            if adaptador.dominio not in self.dominios:
+                concorrencia, intervalo = (limites or {}).get(adaptador.dominio, (adaptador.concorrencia, adaptador.intervalo))
+                disjuntor = DisjuntorDominio(adaptador.dominio, limite=falhas_para_abrir, pausa=pausa_bloqueio)
+                self.dominios[adaptador.dominio] = LimiteDominio(adaptador.dominio, concorrencia, intervalo, disjuntor)
+        # Fila de cada domínio intercalando as listagens, para todas avançarem juntas
+        inicio = min(c.paginas[0] for c in categorias) if categorias else 1
+        fim = max(c.paginas[1] for c in categorias) if categorias else 0
+        concluidas = paginas_concluidas or {}
+        for pagina in range(inicio, fim + 1):
+            for listagem in self.listagens.values():
+                if any(c.paginas[0] <= pagina <= c.paginas[1] and pagina not in concluidas.get(c.rotulo, ())
+                       for c in listagem.categorias):
+                    self.dominios[listagem.adaptador.dominio].fila.append((listagem, pagina))
+        self._condicao = threading.Condition()
+        self._pool_navegadores = None
+
+    def controle_cortesia(self, dominio):
+        """ControleCortesia do domínio, para o adaptador sinalizar desafios e dosar a espera no Chrome."""
+        return self.dominios[dominio].controle
+
+    def pool_navegadores(self):
+        """Pool de sessões do Chrome, criado na primeira página que precisar de navegador."""
+        with self._condicao:
+            if self._pool_navegadores is None:
+                self._pool_navegadores = PoolNavegadores(self.fabrica_driver, tamanho=self.contextos)
+            return self._pool_navegadores
+
+    def _descartada(self, listagem, pagina):
+        ultima = self.ultima_pagina.get(id(listagem))
+        return ultima is not None and pagina > ultima
+
+    def _proxima_tarefa(self):
+        """Bloqueia até haver uma tarefa liberada; None quando todas as filas acabaram."""
+        with self._condicao:
+            while True:
+                agora = time.monotonic()
+                espera = None
+                pendentes = False
+                for limite in self.dominios.values():
+                    limite.fila = [(l, p) for l, p in limite.fila if not self._descartada(l, p)]
+                    if not limite.fila:
+                        continue
+                    pendentes = True
+                    if limite.ativos >= limite.concorrencia:
+                        continue
+                    liberado, falta = limite.disjuntor.pode_iniciar(limite.ativos)
+                    if not liberado:
+                        if falta is not None:
+                            espera = falta if espera is None else min(espera, falta)
+                        continue
+                    if limite.proximo_inicio <= agora:
+                        listagem, pagina = limite.fila.pop(0)
+                        limite.ativos += 1
+                        limite.disjuntor.iniciou()
+                        limite.proximo_inicio = agora + limite.controle.proximo_intervalo()
+                        if limite.inicio is None:
+                            limite.inicio = agora
+                        return limite, listagem, pagina
+                    falta = limite.proximo_inicio - agora
+                    espera = falta if espera is None else min(espera, falta)
+                if not pendentes:
+                    return None
+                self._condicao.wait(espera)
+
+    def _trabalhador(self):
+        while True:
+            tarefa = self._proxima_tarefa()
+            if tarefa is None:
+                return
+            limite, listagem, pagina = tarefa
+            inicio = time.monotonic()
+            bloqueio = None
+            try:
+                registros = listagem.adaptador.coletar_pagina(listagem.url_template, pagina, self, listagem.rotulo)
+            except PaginaBloqueada as e:
+                print(f"  → [{listagem.rotulo} - Página {pagina}] Bloqueada pelo portal ({e.classe}).")
+                registros, bloqueio = None, e.classe
+            except Exception as e:
+                print(f"  → [{listagem.rotulo} - Página {pagina}] Erro inesperado: {e}")
+                registros = None
+            duracao = time.monotonic() - inicio
+            por_categoria = []
+            reiniciar = False
+            with self._condicao:
+                if bloqueio is not None:
+                    evento = EVENTO_DESAFIO
+                else:
+                    evento = EVENTO_FALHA if registros is None else (EVENTO_OK if registros else EVENTO_VAZIA)
+                limite.controle.registrar(evento, duracao, f"[{listagem.rotulo} - Página {pagina}]")
+                if bloqueio is not None:
+                    self._repetir_bloqueada(limite, listagem, pagina)
+                reiniciar = self._registrar_no_disjuntor(limite, registros is not None)
+                limite.ativos -= 1
+                limite.paginas += 1
+                limite.fim = time.monotonic()
+                if registros is not None:
+                    print(f"  → [{listagem.rotulo} - Página {pagina}] {len(registros)} anúncios.")
+                    if not registros and not self._descartada(listagem, pagina):
+                        # Página vazia: a listagem acabou, as páginas seguintes saem da fila
+                        self.ultima_pagina[id(listagem)] = pagina - 1
+                        print(f"  → [{listagem.rotulo}] Fim da listagem na página {pagina}.")
+                    ineditos = 0
+                    for categoria in listagem.categorias:
+                        if registros and categoria.paginas[0] <= pagina <= categoria.paginas[1]:
+                            da_categoria = listagem.adaptador.finalizar(registros, categoria)
+                            self.registros[categoria.rotulo][pagina] = da_categoria
+                            por_categoria.append((categoria, da_categoria))
+                            ineditos += self._contar_ineditos(categoria, da_categoria)
+                    if registros and self.conhecidos is not None and not ineditos:
+                        self._registrar_pagina_sem_novos(listagem, pagina)
+                self._condicao.notify_all()
+            if reiniciar:
+                self._reiniciar_sessoes(limite.dominio)
+            if self.destino is not None:
+                for categoria, da_categoria in por_categoria:
+                    try:
+                        self.destino.gravar_pagina(categoria, pagina, da_categoria)
+                    except Exception as e:
+                        print(f"  → [{categoria.rotulo} - Página {pagina}] Erro ao gravar: {e}")
+
+    def _repetir_bloqueada(self, limite, listagem, pagina):
+        chave = (id(listagem), pagina)
+        self.bloqueios[chave] = self.bloqueios.get(chave, 0) + 1
+        if self.bloqueios[chave] < self.tentativas_bloqueada:
+            limite.fila.insert(0, (listagem, pagina))
+        else:
+            print(f"  → [{listagem.rotulo} - Página {pagina}] Bloqueada {self.bloqueios[chave]} vezes, pulando.")
+
+    def _registrar_no_disjuntor(self, limite, sucesso):
+        """Atualiza o disjuntor do domínio; True quando ele abriu e as sessões devem ser reiniciadas."""
+        disjuntor = limite.disjuntor
+        estado = disjuntor.registrar(sucesso)
+        if estado == ABERTO:
+            print(f"  → [disjuntor] {limite.dominio}: falhas seguidas; domínio pausado por {disjuntor.pausa:.0f}s, "
+                  f"reiniciando as sessões. Os outros domínios continuam.")
+            return True
+        if estado == FECHADO:
+            print(f"  → [disjuntor] {limite.dominio}: página de teste ok, domínio liberado.")
+        elif estado == DESISTIU:
+            print(f"  → [disjuntor] {limite.dominio}: bloqueio persistente depois de {disjuntor.aberturas} pausas; "
+                  f"abandonando as {len(limite.fila)} páginas restantes.")
+            limite.fila.clear()
+        return False
+
+    def _reiniciar_sessoes(self, dominio):
+        adaptadores = {id(l.adaptador): l.adaptador for l in self.listagens.values() if l.adaptador.dominio == dominio}
+        for adaptador in adaptadores.values():
+            try:
+                adaptador.reiniciar_sessoes()
+            except Exception as e:
+                print(f"  → [disjuntor] {dominio}: erro ao reiniciar as sessões: {e}")
+        if self._pool_navegadores is not None:
+            self._pool_navegadores.reciclar_livres()
+
+    def _contar_ineditos(self, categoria, registros):
+        if self.conhecidos is None:
+            return len(registros)
+        conhecidos = self.conhecidos.setdefault(categoria.rotulo, set())
+        ineditos = 0
+        for registro in registros:
+            chave = categoria.adaptador.identificador(registro)
+            if chave is None:
+                ineditos += 1
+            elif chave not in conhecidos:
+                conhecidos.add(chave)  # repetido em outra página desta execução não conta de novo
+                ineditos += 1
+        return ineditos
+
+    def _registrar_pagina_sem_novos(self, listagem, pagina):
+        # As páginas terminam fora de ordem; vale qualquer sequência de K páginas seguidas
+        paginas = self.sem_novos.setdefault(id(listagem), set())
+        paginas.add(pagina)
+        k = self.paginas_sem_novos
+        for fim in range(pagina, pagina + k):
+            if all(p in paginas for p in range(fim - k + 1, fim + 1)):
+                ultima = self.ultima_pagina.get(id(listagem))
+                if ultima is None or fim < ultima:
+                    self.ultima_pagina[id(listagem)] = fim
+                    print(f"  → [{listagem.rotulo}] {k} páginas seguidas sem anúncios novos "
+                          f"(até a página {fim}). Parando a listagem.")
+                return
+
+    def executar(self):
+        inicio = time.monotonic()
+        total = sum(len(limite.fila) for limite in self.dominios.values())
+        print(f"=== Orquestrador: {len(self.categorias)} categorias, {total} páginas, "
+              f"{len(self.dominios)} domínios, {self.contextos} contextos ===")
+        threads = [threading.Thread(target=self._trabalhador, daemon=True) for _ in range(self.contextos)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if self._pool_navegadores is not None:
+            self._pool_navegadores.encerrar()
+        for limite in self.dominios.values():
+            duracao = (limite.fim - limite.inicio) if limite.inicio is not None else 0.0
+            print(f"  {limite.dominio}: {limite.paginas} páginas em {duracao:.1f}s "
+                  f"(até {limite.concorrencia} simultâneas).")
+            print(f"    cortesia: {limite.controle.resumo()}")
+            print(f"    {limite.disjuntor.resumo()}")
+        print(f"=== Orquestrador concluído em {time.monotonic() - inicio:.1f}s ===")
+        return {rotulo: [r for _, pagina in sorted(paginas.items()) for r in pagina]
+                for rotulo, paginas in self.registros.items()}
+
+
+if __name__ == '__main__':
+    # Verificação sintética (python -m raspagem.orquestrador): páginas falsas de custo fixo em dois
+    # domínios. Com as filas por domínio o tempo total fica perto do domínio mais lento, não da soma.
+    from .adaptadores import AdaptadorPortal
+    from .categorias import CategoriaRaspagem
+    CUSTO_PAGINA = 0.05
+    ativos_por_dominio, maximo_por_dominio, trava = {}, {}, threading.Lock()
+
+    class AdaptadorFalso(AdaptadorPortal):
+        def __init__(self, nome, concorrencia, intervalo):
+            self.nome, self.dominio = nome, f'{nome}.example'
+            self.concorrencia, self.intervalo = concorrencia, intervalo
+            self.baixadas = 0
+
+        def coletar_pagina(self, url_template, pagina, contexto, rotulo):
+            with trava:
+                self.baixadas += 1
+                ativos_por_dominio[self.dominio] = ativos_por_dominio.get(self.dominio, 0) + 1
+                maximo_por_dominio[self.dominio] = max(maximo_por_dominio.get(self.dominio, 0),
+                                                       ativos_por_dominio[self.dominio])
+            time.sleep(CUSTO_PAGINA)
+            with trava:
+                ativos_por_dominio[self.dominio] -= 1
+            if url_template == 'b/0?p={}' and pagina > 4:
+                return []  # listagem acaba na página 4
+            return [{'titulo': f'casa {pagina}'}, {'titulo': f'apartamento {pagina}'}]
+
+        def finalizar(self, registros, categoria):
+            if categoria.filtro_titulo is None:
+                return registros
+            return [r for r in registros if categoria.filtro_titulo.search(r['titulo'])]
+
+    a, b = AdaptadorFalso('a', 2, (0, 0)), AdaptadorFalso('b', 1, (0.02, 0.02))
+    categorias = [CategoriaRaspagem(a, f'cat{i}', f'a/{i}?p={{}}', paginas=(1, 10)) for i in range(3)]
+    categorias += [CategoriaRaspagem(b, 'cat0', 'b/0?p={}', paginas=(1, 10)),
+                   CategoriaRaspagem(b, 'casas', 'b/1?p={}', filtro_titulo=r'\bcasa\b', paginas=(1, 10)),
+                   CategoriaRaspagem(b, 'aptos', 'b/1?p={}', filtro_titulo=r'\bapartamento\b', paginas=(1, 5))]
+    inicio = time.perf_counter()
+    resultado = OrquestradorRaspagem(categorias, contextos=4).executar()
+    duracao = time.perf_counter() - inicio
+    assert maximo_por_dominio == {'a.example': 2, 'b.example': 1}, maximo_por_dominio
+    assert [r['titulo'] for r in resultado['a/cat1']][:3] == ['casa 1', 'apartamento 1', 'casa 2']
+    assert len(resultado['b/cat0']) == 8 and len(resultado['b/casas']) == 10 and len(resultado['b/aptos']) == 5
+    assert a.baixadas == 30 and b.baixadas == 15, (a.baixadas, b.baixadas)  # b/1 baixada uma vez para duas categorias
+    sequencial = (30 + 5 + 20) * CUSTO_PAGINA
+    print(f"Verificação OK: {duracao:.2f}s com o orquestrador, ~{sequencial:.2f}s com um script por categoria.")
+
+    # Modo incremental: a listagem b/1 só traz anúncios conhecidos ('casa 1'..'casa 10' já gravados),
+    # então para depois de PAGINAS_SEM_NOVOS páginas; em a/0 só a página 2 traz anúncios inéditos.
+    class AdaptadorComLinks(AdaptadorFalso):
+        def coletar_pagina(self, url_template, pagina, contexto, rotulo):
+            registros = super().coletar_pagina(url_template, pagina, contexto, rotulo)
+            caminho = url_template.split('?')[0]
+            return [dict(r, link=f"https://{self.dominio}/{caminho}/{r['titulo'].replace(' ', '-')}-{1000000 + pagina}")
+                    for r in registros]
+
+    a, b = AdaptadorComLinks('a', 1, (0, 0)), AdaptadorComLinks('b', 1, (0, 0))
+    categorias = [CategoriaRaspagem(a, 'cat0', 'a/0?p={}', paginas=(1, 10)),
+                  CategoriaRaspagem(b, 'casas', 'b/1?p={}', filtro_titulo=r'\bcasa\b', paginas=(1, 10))]
+    conhecidos = {'a/cat0': {str(1000000 + p) for p in range(1, 11) if p != 2}, 'b/casas': {str(1000000 + p) for p in range(1, 11)}}
+    resultado = OrquestradorRaspagem(categorias, contextos=2, conhecidos=conhecidos).executar()
+    assert b.baixadas == PAGINAS_SEM_NOVOS, b.baixadas
+    assert a.baixadas == 2 + PAGINAS_SEM_NOVOS, a.baixadas  # 1 conhecida, 2 inédita, 3-5 conhecidas
+    assert len(resultado['a/cat0']) == 2 * a.baixadas
+    print(f"Incremental OK: {b.baixadas} e {a.baixadas} páginas baixadas em vez de 10.")
+
+    # Disjuntor: o domínio c passa a responder com captcha a partir da página 3. Depois de
+    # FALHAS_PARA_ABRIR bloqueios seguidos c pausa e reinicia as sessões enquanto a continua; a
+    # página de teste passa e c termina, sem perder a página bloqueada.
+    inicios = {}
+
+    class AdaptadorBloqueado(AdaptadorFalso):
+        def __init__(self, *args):
+            super().__init__(*args)
+            self.bloqueios_restantes, self.reinicios = FALHAS_PARA_ABRIR, 0
+
+        def coletar_pagina(self, url_template, pagina, contexto, rotulo):
+            inicios.setdefault(self.dominio, []).append(time.monotonic())
+            if pagina >= 3 and self.bloqueios_restantes:
+                self.bloqueios_restantes -= 1
+                raise PaginaBloqueada('captcha', url_template.format(pagina))
+            return super().coletar_pagina(url_template, pagina, contexto, rotulo)
+
+        def reiniciar_sessoes(self):
+            self.reinicios += 1
+
+    a, c = AdaptadorBloqueado('a', 1, (0, 0)), AdaptadorBloqueado('c', 1, (0, 0))
+    a.bloqueios_restantes = 0
+    categorias = [CategoriaRaspagem(a, 'cat0', 'a/0?p={}', paginas=(1, 10)),
+                  CategoriaRaspagem(c, 'cat0', 'c/0?p={}', paginas=(1, 6))]
+    orquestrador = OrquestradorRaspagem(categorias, contextos=2, pausa_bloqueio=0.3)
+    resultado = orquestrador.executar()
+    disjuntor = orquestrador.dominios['c.example'].disjuntor
+    assert len(resultado['c/cat0']) == 12 and len(resultado['a/cat0']) == 20
+    assert c.reinicios == 1 and a.reinicios == 0 and disjuntor.aberturas == 1 and disjuntor.estado == FECHADO
+    abriu = inicios['c.example'][2 + FALHAS_PARA_ABRIR - 1]
+    reabriu = inicios['c.example'][2 + FALHAS_PARA_ABRIR]
+    durante_a_pausa = sum(abriu < t < reabriu for t in inicios['a.example'])
+    assert reabriu - abriu >= 0.3 and durante_a_pausa >= 3, (reabriu - abriu, durante_a_pausa)
+    print(f"Disjuntor OK: c pausado {reabriu - abriu:.2f}s enquanto a baixou {durante_a_pausa} páginas.")
@@ -0,0 +1,66 @@
+import re
+
+# Conversores de texto dos cards compartilhados por todos os portais, com as expressões regulares
+# compiladas uma única vez por processo.
+PADRAO_NUMERO_DECIMAL = re.compile(r"(\d+(\.\d+)?)")
+PADRAO_AREA_INTEIRA = re.compile(r"(\d+)\s*m")
+PADRAO_AREA_DECIMAL = re.compile(r"([\d,]+)\s*m")
+PADRAO_INTEIRO = re.compile(r"(\d+)")
+
+
+def parse_price(text):
+    """Parses price string into a float."""
+    if not text:
+        return None
+    cleaned = text.replace("R$", "").replace(".", "").replace(",", ".").strip()
+    m = PADRAO_NUMERO_DECIMAL.search(cleaned)
+    try:
+        return float(m.group(1)) if m else None
+    except (ValueError, AttributeError):
+        return None
+
+
+def parse_area(text):
+    """Parses area string (e.g., '120 m²') into an integer."""
+    if not text:
+        return None
+    m = PADRAO_AREA_INTEIRA.search(text)
+    try:
+        return int(m.group(1)) if m else None
+    except (ValueError, AttributeError):
+        return None
+
+
+def parse_integer(text):
+    """Parses integer string (e.g., '3') into an integer."""
+    if not text:
+        return None
+    m = PADRAO_INTEIRO.search(text)
+    try:
+        return int(m.group(1)) if m else None
+    except (ValueError, AttributeError):
+        return None
+
+
+def parse_money(text):
+    """Converte 'R$ 2.200', 'R$ 440.000' ou 'R$ 1.500/mês' em float; None se não for um valor."""
+    if not text:
+        return None
+    n = text.replace("R$", "").replace(".", "").replace("/mês", "").strip()
+    try:
+        return float(n.replace(",", "."))
+    except ValueError:
+        return None
+
+
+def parse_area_decimal(text):
+    """Converte '248,96 m²' em float (248.96)."""
+    if not text:
+        return None
+    m = PADRAO_AREA_DECIMAL.search(text)
+    if m:
+        try:
+            return float(m.group(1).replace(",", "."))
+        except ValueError:
+            return None
+    return None
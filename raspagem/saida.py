@@ -0,0 +1,237 @@
+import os
+import threading
+from datetime import datetime
+import json
+from ArmazenamentoNdjson import GravadorNdjson, iterar_registros, compactar, caminho_ndjson, gravar_json_atomicamente
+
+# Gravação dos anúncios de cada categoria em <diretorio_saida do portal>/<categoria>.jsonl (JSON
+# Lines), página a página, com `first_seen` e `last_seen` em cada anúncio. O arquivo só cresce:
+# um anúncio visto de novo ganha outra linha com o `last_seen` atualizado, e `compactar_categoria`
+# (python -m raspagem --compactar) deixa uma linha por anúncio. O <categoria>.json dos scripts
+# antigos é convertido para JSON Lines na primeira gravação ou compactação da categoria.
+#
+# Enquanto a categoria está sendo raspada, <categoria>.checkpoint.json (gravado com troca atômica a
+# cada fsync do JSON Lines) guarda as páginas concluídas, o tamanho do JSON Lines que elas ocupam e
+# o `visto_em` da execução. Se a execução cair, a próxima corta as linhas gravadas depois do último
+# checkpoint e retoma só as páginas que faltam; o checkpoint é apagado quando a execução termina.
+
+
+def arquivo_legado(categoria):
+    return os.path.join(categoria.adaptador.diretorio_saida, f"{categoria.nome}.json")
+
+
+def arquivo_categoria(categoria):
+    return caminho_ndjson(arquivo_legado(categoria))
+
+
+def arquivo_checkpoint(categoria):
+    return os.path.join(categoria.adaptador.diretorio_saida, f"{categoria.nome}.checkpoint.json")
+
+
+def existe_categoria(categoria):
+    return os.path.exists(arquivo_categoria(categoria)) or os.path.exists(arquivo_legado(categoria))
+
+
+def carregar_categoria(categoria):
+    """Itera os anúncios gravados da categoria (JSON Lines ou o JSON antigo)."""
+    for caminho in (arquivo_legado(categoria), arquivo_categoria(categoria)):
+        if not os.path.exists(caminho):
+            continue
+        try:
+            yield from iterar_registros(caminho)
+        except (ValueError, IOError) as e:
+            print(f"  → AVISO: Não foi possível ler '{caminho}' ({e}); ignorado.")
+
+
+def identificadores_conhecidos(categoria):
+    """{identificador: first_seen} dos anúncios já gravados da categoria (first_seen pode ser None)."""
+    adaptador = categoria.adaptador
+    conhecidos = {}
+    for registro in carregar_categoria(categoria):
+        chave = adaptador.identificador(registro)
+        if chave is not None and conhecidos.get(chave) is None:
+            conhecidos[chave] = registro.get('first_seen')
+    return conhecidos
+
+
+def agora_iso():
+    return datetime.now().isoformat(timespec='seconds')
+
+
+def carregar_checkpoint(categoria):
+    """
+    Estado de uma execução interrompida da categoria ({'visto_em', 'paginas', 'bytes'}), com o
+    JSON Lines já cortado no tamanho do checkpoint; None se não houver o que retomar.
+    """
+    caminho = arquivo_checkpoint(categoria)
+    if not os.path.exists(caminho):
+        return None
+    try:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            estado = json.load(f)
+    except (ValueError, IOError) as e:
+        print(f"  → AVISO: Checkpoint '{caminho}' ilegível ({e}); a categoria começa do zero.")
+        return None
+    ndjson = arquivo_categoria(categoria)
+    tamanho = os.path.getsize(ndjson) if os.path.exists(ndjson) else 0
+    if estado.get('url_template') != categoria.url_template or tamanho < estado.get('bytes', 0):
+        print(f"  → AVISO: Checkpoint '{caminho}' não corresponde à categoria; a categoria começa do zero.")
+        return None
+    if tamanho > estado['bytes']:
+        # Linhas de páginas gravadas depois do último checkpoint: serão baixadas de novo
+        with open(ndjson, 'r+b') as f:
+            f.truncate(estado['bytes'])
+    return estado
+
+
+def compactar_categoria(categoria):
+    """Regrava o JSON Lines da categoria com uma linha por anúncio, absorvendo o JSON antigo."""
+    legado, caminho = arquivo_legado(categoria), arquivo_categoria(categoria)
+    if not existe_categoria(categoria):
+        return 0, 0
+    if os.path.exists(arquivo_checkpoint(categoria)):
+        # A compactação muda o tamanho do arquivo: a execução interrompida não pode mais ser retomada
+        print(f"  → AVISO: {categoria.rotulo} tinha uma execução interrompida; ela recomeçará do zero.")
+        remover_checkpoint(categoria)
+    lidos, gravados = compactar(caminho, categoria.adaptador.identificador, origens=[legado, caminho])
+    if os.path.exists(legado):
+        os.remove(legado)
+    return lidos, gravados
+
+
+class GravacaoCategorias:
+    """
+    Destino das páginas do orquestrador: acrescenta os registros de cada página ao JSON Lines da
+    categoria assim que ela é lida e mantém o checkpoint da categoria. `primeiras_vistas`
+    ({rotulo: {identificador: first_seen}}) dá o `first_seen` dos anúncios já conhecidos; os inéditos
+    recebem `visto_em`. `retomadas` ({rotulo: estado de `carregar_checkpoint`}) traz as páginas já
+    concluídas e o `visto_em` de execuções interrompidas.
+    """
+
+    def __init__(self, visto_em=None, primeiras_vistas=None, retomadas=None):
+        self.visto_em = visto_em or agora_iso()
+        self.primeiras_vistas = primeiras_vistas if primeiras_vistas is not None else {}
+        self.retomadas = retomadas or {}
+        self.gravadores = {}
+        self.categorias = {}
+        self.concluidas = {}  # rotulo -> páginas já garantidas em disco
+        self.pendentes = {}  # rotulo -> páginas gravadas desde o último fsync
+        self.novos = {}
+        self.vistos = {}
+        self._trava = threading.Lock()  # páginas chegam de várias threads do orquestrador
+
+    def visto_em_da(self, categoria):
+        return self.retomadas.get(categoria.rotulo, {}).get('visto_em') or self.visto_em
+
+    def _gravador(self, categoria):
+        gravador = self.gravadores.get(categoria.rotulo)
+        if gravador is None:
+            if os.path.exists(arquivo_legado(categoria)) and not os.path.exists(arquivo_categoria(categoria)):
+                lidos, gravados = compactar_categoria(categoria)
+                print(f"  → {categoria.rotulo}: JSON antigo convertido para JSON Lines ({gravados} de {lidos} anúncios).")
+            gravador = self.gravadores[categoria.rotulo] = GravadorNdjson(arquivo_categoria(categoria))
+            self.categorias[categoria.rotulo] = categoria
+            self.concluidas[categoria.rotulo] = set(self.retomadas.get(categoria.rotulo, {}).get('paginas', []))
+            self.pendentes[categoria.rotulo] = set()
+            self.novos[categoria.rotulo] = self.vistos[categoria.rotulo] = 0
+        return gravador
+
+    def gravar_pagina(self, categoria, pagina, registros):
+        with self._trava:
+            gravador = self._gravador(categoria)
+            if pagina in self.concluidas[categoria.rotulo]:
+                return  # página de outra categoria da mesma listagem, já gravada antes da queda
+            self._marcar(categoria, registros)
+            self.pendentes[categoria.rotulo].add(pagina)
+            if gravador.acrescentar(registros):
+                self._salvar_checkpoint(categoria.rotulo, gravador.tamanho_sincronizado)
+
+    def _marcar(self, categoria, registros):
+        adaptador = categoria.adaptador
+        visto_em = self.visto_em_da(categoria)
+        primeiras = self.primeiras_vistas.setdefault(categoria.rotulo, {})
+        for registro in registros:
+            chave = adaptador.identificador(registro)
+            primeira = primeiras.get(chave) if chave is not None else None
+            if chave is None or chave not in primeiras:
+                self.novos[categoria.rotulo] += 1
+                if chave is not None:
+                    primeiras[chave] = visto_em
+            registro['first_seen'] = primeira or visto_em
+            registro['last_seen'] = visto_em
+        self.vistos[categoria.rotulo] += len(registros)
+
+    def _salvar_checkpoint(self, rotulo, tamanho):
+        categoria = self.categorias[rotulo]
+        self.concluidas[rotulo] |= self.pendentes[rotulo]
+        self.pendentes[rotulo] = set()
+        gravar_json_atomicamente(arquivo_checkpoint(categoria), {
+            'url_template': categoria.url_template,
+            'visto_em': self.visto_em_da(categoria),
+            'paginas': sorted(self.concluidas[rotulo]),
+            'bytes': tamanho,
+        })
+
+    def fechar(self, concluida=True):
+        """
+        Sincroniza e fecha os arquivos. Sem `concluida` os checkpoints ficam com todas as páginas
+        gravadas, para a próxima execução retomar de onde esta parou.
+        """
+        with self._trava:
+            for rotulo, gravador in self.gravadores.items():
+                tamanho = gravador.sincronizar()
+                gravador.fechar()
+                if not concluida:
+                    self._salvar_checkpoint(rotulo, tamanho)
+                print(f"  → {rotulo}: {self.novos[rotulo]} anúncios novos, {self.vistos[rotulo]} gravados em "
+                      f"'{gravador.caminho}'.")
+
+
+def remover_checkpoint(categoria):
+    caminho = arquivo_checkpoint(categoria)
+    if os.path.exists(caminho):
+        os.remove(caminho)
+
+
+if __name__ == '__main__':
+    # Verificação de queda e retomada: 7 páginas gravadas, checkpoint no fsync da 5ª, "queda" sem
+    # fechar; a retomada corta as páginas 6-7 e o orquestrador só baixa o que falta.
+    import tempfile
+    from .adaptadores import AdaptadorPortal
+    from .categorias import CategoriaRaspagem
+    from .orquestrador import OrquestradorRaspagem
+
+    class AdaptadorFalso(AdaptadorPortal):
+        nome, dominio, intervalo = 'falso', 'falso.example', (0, 0)
+
+        def __init__(self, diretorio_saida):
+            self.diretorio_saida = diretorio_saida
+            self.baixadas = []
+
+        def coletar_pagina(self, url_template, pagina, contexto, rotulo):
+            self.baixadas.append(pagina)
+            return [{'link': f'https://falso.example/anuncio-{1000000 + 2 * pagina + i}'} for i in range(2)]
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        adaptador = AdaptadorFalso(diretorio)
+        categoria = CategoriaRaspagem(adaptador, 'casas', 'falso/{}', paginas=(1, 10))
+        interrompida = GravacaoCategorias('2026-01-01T00:00:00')
+        for pagina in range(1, 8):
+            interrompida.gravar_pagina(categoria, pagina, adaptador.coletar_pagina(None, pagina, None, None))
+        estado = carregar_checkpoint(categoria)
+        assert estado['paginas'] == [1, 2, 3, 4, 5], estado
+        assert sum(1 for _ in iterar_registros(arquivo_categoria(categoria))) == 10
+
+        adaptador.baixadas = []
+        destino = GravacaoCategorias('2026-01-02T00:00:00', {categoria.rotulo: identificadores_conhecidos(categoria)},
+                                     {categoria.rotulo: estado})
+        OrquestradorRaspagem([categoria], contextos=2, destino=destino,
+                             paginas_concluidas={categoria.rotulo: set(estado['paginas'])}).executar()
+        destino.fechar()
+        remover_checkpoint(categoria)
+        assert sorted(adaptador.baixadas) == [6, 7, 8, 9, 10], adaptador.baixadas
+        registros = list(iterar_registros(arquivo_categoria(categoria)))
+        assert len(registros) == 20 and len({r['link'] for r in registros}) == 20
+        assert {r['first_seen'] for r in registros} == {'2026-01-01T00:00:00'}  # visto_em da execução retomada
+        assert not os.path.exists(arquivo_checkpoint(categoria))
+    print("Verificação OK.")